@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, aclosing
+
+from app.helpers.crawl_pipeline import CrawlPipeline
+from app.helpers.custom_session import CustomSession
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_parser import ResumeParser
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.worker_pool import ResumeWorkerPool
+from app.settings import Settings
+
+
+class BatchSearch:
+    """Runs several filters as one crawl that fetches every resume once.
+
+    Filters of a day often differ only in the main skills, the city or the
+    salary, and separate crawls download the same candidates again and
+    again. Here the listing pages of every filter and site are enumerated
+    first, and each resume URL found by any filter is fetched once by a
+    pipeline shared by all filters of the site, on one worker pool and rate
+    limiter like ``CrawlOrchestrator``. Every resume is yielded with the
+    filters whose listings contained it.
+
+    ``listed`` counts the resume links of all filters, which separate
+    crawls would each fetch, and ``fetched`` the unique ones requested, so
+    ``requests_saved`` is the difference.
+    """
+
+    def __init__(
+        self,
+        filters: Iterable[ResumeFilter],
+        settings: Settings,
+        session: CustomSession,
+        parser_classes: Iterable[type[ResumeParser]],
+    ):
+        self.filters = list(filters)
+        self.settings = settings
+        self.metrics = session.metrics
+        self.limiter = RateLimiter(settings)
+        # one parser per site and filter, with the filter's listing URL
+        self.parsers = [
+            [
+                parser_class(filter_obj, settings, session, self.limiter)
+                for filter_obj in self.filters
+            ]
+            for parser_class in parser_classes
+        ]
+        # resume URL -> indexes into filters of the filters listing it
+        self.matches: dict[str, set[int]] = defaultdict(set)
+        self.listed = 0
+        self.fetched = 0
+        self.failed: list[str] = []
+
+    @property
+    def requests_saved(self) -> int:
+        return self.listed - self.fetched
+
+    async def iter_resumes(
+        self,
+    ) -> AsyncIterator[tuple[BaseResumeModel, list[int]]]:
+        """Yield every resume found by any filter as soon as it is parsed.
+
+        Yields
+        ------
+        tuple
+            The resume and the indexes into ``filters`` of the filters that
+            found it.
+        """
+        self.matches.clear()
+        self.listed = self.fetched = 0
+        self.failed = []
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.settings.processes_count * 2)
+        pool_settings = self.settings.model_copy(
+            update={
+                "processes_count": self.settings.processes_count * len(self.parsers)
+            }
+        )
+        async with AsyncExitStack() as stack:
+            if self.metrics is not None:
+                await stack.enter_async_context(self.metrics.reporting(self.settings))
+            pool = stack.enter_context(
+                ResumeWorkerPool(pool_settings, self.limiter, self.metrics)
+            )
+            tasks = [
+                asyncio.create_task(self._crawl(parsers, pool, queue))
+                for parsers in self.parsers
+            ]
+            try:
+                running = len(tasks)
+                while running:
+                    item = await queue.get()
+                    if item is None:
+                        running -= 1
+                        continue
+                    url, resume = item
+                    yield resume, sorted(self.matches[url])
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        self.limiter.report()
+        logging.info(
+            f"{len(self.filters)} filters listed {self.listed} resumes, "
+            f"fetched {self.fetched} once, saved {self.requests_saved} requests"
+        )
+
+    async def _list(self, parsers: list[ResumeParser]) -> list[tuple[str, str]]:
+        """Links of all listing pages of all filters of a site, each once."""
+        pages = []
+        page_nums = await asyncio.gather(
+            *(parser.get_page_nums() for parser in parsers), return_exceptions=True
+        )
+        for n, nums in enumerate(page_nums):
+            if isinstance(nums, Exception):
+                # a filter without resumes on the site or a failed request
+                logging.warning(f"{parsers[n].SOURCE} filter {n}: {nums}")
+                continue
+            pages += [(n, page_num) for page_num in nums]
+        page_iter = iter(pages)
+        links: dict[str, str] = {}
+
+        async def fetch_pages() -> None:
+            # page_iter is shared by all tasks, each takes the next free page
+            for n, page_num in page_iter:
+                try:
+                    page_links = await parsers[n].get_page_links(page_num)
+                except Exception as e:  # noqa: BLE001 - skips only this page
+                    logging.error(
+                        f"Skipped {parsers[n].SOURCE} page {page_num} of filter "
+                        f"{n}: {type(e).__name__}: {e}"
+                    )
+                    continue
+                self.listed += len(page_links)
+                for url, fingerprint in page_links:
+                    self.matches[url].add(n)
+                    links.setdefault(url, fingerprint)
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(parsers[0].listing_concurrency):
+                tg.create_task(fetch_pages())
+        return list(links.items())
+
+    async def _crawl(
+        self,
+        parsers: list[ResumeParser],
+        pool: ResumeWorkerPool,
+        queue: asyncio.Queue,
+    ) -> None:
+        site = parsers[0]
+        try:
+            links = await self._list(parsers)
+            self.fetched += len(links)
+            logging.info(f"{site.SOURCE}: fetching {len(links)} unique resumes")
+
+            async def get_page_links(page_num: int) -> list[tuple[str, str]]:
+                return links
+
+            pipeline = CrawlPipeline(
+                self.settings,
+                pool,
+                type(site).fetch_func,
+                get_page_links,
+                listing_concurrency=1,
+            )
+            results = pipeline.iter_results([0], with_urls=True)
+            async with aclosing(results):
+                async for item in results:
+                    await queue.put(item)
+        except Exception as e:  # noqa: BLE001 - kept in self.failed
+            logging.error(f"{site.SOURCE} batch crawl failed: {e}")
+            self.failed.append(site.SOURCE)
+        await queue.put(None)
@@ -0,0 +1,127 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from app.helpers.seen_index import SeenIndex
+from app.settings import Settings
+
+
+class CrawlCheckpoint:
+    """Progress of a crawl saved in a SQLite file to continue it later.
+
+    It keeps the crawl arguments, the listing pages already enumerated and
+    every resume URL found on them as pending or done. Changes are made in
+    one open transaction that is committed when the output file is flushed,
+    so the saved state never claims resumes that are not on disk yet.
+    The ``SeenIndex`` of an incremental crawl is opened once by
+    ``seen_index`` for all sites and committed and closed together with it.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS crawl (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "source TEXT NOT NULL, page_num INTEGER NOT NULL, "
+            "PRIMARY KEY (source, page_num));"
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "source TEXT NOT NULL, url TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "done INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (source, url));"
+        )
+        # one connection for all sites: two connections each holding an open
+        # write transaction until the next flush would lock each other out
+        self.seen: SeenIndex | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "CrawlCheckpoint":
+        return cls(settings.checkpoint_path)
+
+    def start(self, args: dict[str, Any]) -> None:
+        """Forget the previous crawl and save the arguments of a new one."""
+        with self.conn:
+            self.conn.execute("DELETE FROM crawl")
+            self.conn.execute("DELETE FROM pages")
+            self.conn.execute("DELETE FROM urls")
+            self.conn.execute(
+                "INSERT INTO crawl VALUES ('args', ?)", (json.dumps(args),)
+            )
+
+    def load(self) -> dict[str, Any] | None:
+        """Arguments of an unfinished crawl or None if there is none."""
+        rows = dict(self.conn.execute("SELECT key, value FROM crawl"))
+        if "args" not in rows or "finished" in rows:
+            return None
+        return json.loads(rows["args"])
+
+    def finish(self) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO crawl VALUES ('finished', '1')")
+        self.commit()
+
+    def seen_index(self, settings: Settings) -> SeenIndex | None:
+        """The ``SeenIndex`` shared by every site of the crawl, committed with
+        the checkpoint, or None if incremental mode is off."""
+        if self.seen is None:
+            self.seen = SeenIndex.from_settings(settings)
+        return self.seen
+
+    def commit(self) -> None:
+        self.conn.commit()
+        # after the checkpoint: a crash in between only fetches resumes again
+        if self.seen is not None:
+            self.seen.commit()
+
+    def for_source(self, source: str) -> "SourceCheckpoint":
+        return SourceCheckpoint(self, source)
+
+    def close(self) -> None:
+        if self.seen is not None:
+            self.seen.close()
+            self.seen = None
+        self.conn.close()
+
+
+class SourceCheckpoint:
+    """The part of a ``CrawlCheckpoint`` that belongs to one site."""
+
+    def __init__(self, checkpoint: CrawlCheckpoint, source: str):
+        self.conn = checkpoint.conn
+        self.source = source
+
+    def done_pages(self) -> set[int]:
+        rows = self.conn.execute(
+            "SELECT page_num FROM pages WHERE source = ?", (self.source,)
+        )
+        return {page_num for (page_num,) in rows}
+
+    def done_urls(self) -> set[str]:
+        rows = self.conn.execute(
+            "SELECT url FROM urls WHERE source = ? AND done = 1", (self.source,)
+        )
+        return {url for (url,) in rows}
+
+    def pending(self) -> list[tuple[str, str]]:
+        """``(url, fingerprint)`` of enumerated resumes not written yet."""
+        return self.conn.execute(
+            "SELECT url, fingerprint FROM urls WHERE source = ? AND done = 0",
+            (self.source,),
+        ).fetchall()
+
+    def add_page(self, page_num: int, links: list[tuple[str, str]]) -> None:
+        """Record an enumerated listing page and its resumes as pending."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO pages VALUES (?, ?)", (self.source, page_num)
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO urls (source, url, fingerprint) VALUES (?, ?, ?)",
+            [(self.source, url, fingerprint) for url, fingerprint in links],
+        )
+
+    def done(self, urls: list[str]) -> None:
+        self.conn.executemany(
+            "INSERT INTO urls VALUES (?, ?, '', 1) "
+            "ON CONFLICT (source, url) DO UPDATE SET done = 1",
+            [(self.source, url) for url in urls],
+        )
@@ -0,0 +1,267 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import suppress
+from typing import Any
+
+from app.helpers.checkpoint import SourceCheckpoint
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.retry_queue import FailedUrl, RetryQueue
+from app.helpers.seen_index import SeenIndex, content_hash
+from app.helpers.worker_pool import FetchFunc, ResumeWorkerPool
+from app.settings import Settings
+
+
+class CrawlPipeline:
+    """Producer/consumer crawl of listing pages and resume pages.
+
+    Listing pages are fetched ahead by ``listing_concurrency`` producers
+    (``settings.listing_concurrency`` by default) and the discovered resume
+    URLs go into a bounded queue. The consumers take chunks of URLs from the
+    queue and hand them to the worker pool, so listing requests keep going
+    while the workers fetch and parse resumes, and the parsed chunks are
+    handed to the caller as they arrive.
+
+    With a ``seen`` index the crawl is incremental: listing entries that are
+    known and unchanged are not fetched, traversal stops at the first page
+    that has nothing new, and only new or changed resumes are yielded.
+    Their hashes are committed to the index at once, or with a
+    ``checkpoint`` when it is committed after the output is flushed.
+
+    Failures are isolated: a listing page that still fails after the
+    session retries is logged and skipped, and a resume that fails is logged
+    and stored in the ``retry`` queue, whose URLs are fetched again first
+    by the next crawl of the same search.
+
+    With a ``checkpoint`` every enumerated page and its resume URLs are
+    recorded, and a resume is marked done once the caller took it. A
+    resumed crawl skips done pages and URLs and starts with the pending
+    ones.
+
+    If the pool has ``metrics``, listing pages, parsed and failed resumes and
+    the depth of both queues are recorded in them.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        pool: ResumeWorkerPool,
+        fetch_func: FetchFunc,
+        get_page_links: Callable[[int], Awaitable[list[tuple[str, str]]]],
+        seen: SeenIndex | None = None,
+        retry: RetryQueue | None = None,
+        checkpoint: SourceCheckpoint | None = None,
+        listing_concurrency: int | None = None,
+    ):
+        self.settings = settings
+        self.pool = pool
+        self.fetch_func = fetch_func
+        # Returns (resume URL, listing fingerprint) pairs of a page
+        self.get_page_links = get_page_links
+        self.seen = seen
+        self.retry = retry
+        self.checkpoint = checkpoint
+        self.consumers_count = settings.processes_count * 2
+        self.listing_concurrency = listing_concurrency or settings.listing_concurrency
+        self.fingerprints: dict[str, str] = {}
+        # URLs queued in this crawl, a resume can show up on two pages
+        self.queued: set[str] = set()
+        self.failed: list[FailedUrl] = []
+        self.failed_pages: list[int] = []
+        self.done_pages: set[int] = set()
+        self.stopped = False
+        self.metrics = pool.metrics
+
+    async def iter_results(
+        self, page_nums: Iterable[int], raw: bool = False, with_urls: bool = False
+    ) -> AsyncIterator[Any]:
+        """Crawl the given listing pages and yield resumes as they are parsed.
+
+        The output queue is bounded, so a slow consumer stops the workers
+        and, through the URL queue, the listing producers. The workers send
+        resumes as JSON bytes, a model is built from them only when it is
+        yielded.
+
+        With a checkpoint, a resume is marked done when the caller asks for
+        the next one, in the checkpoint's open transaction. A caller that
+        writes every resume before that, and commits the checkpoint only
+        after the output is flushed, never loses a resume. Delivery is at
+        least once, though: after a crash between a flush and the commit, a
+        resumed crawl yields the resumes of that flush again.
+
+        Parameters
+        ----------
+        page_nums : iterable of int
+            Numbers of the listing pages to crawl.
+        raw : bool, default False
+            Yield the JSON bytes of the resumes instead of models.
+        with_urls : bool, default False
+            Yield ``(url, resume)`` pairs with the URL each resume was
+            fetched from.
+
+        Yields
+        ------
+        BaseResumeModel or bytes
+            Parsed resumes, in completion order.
+        """
+        urls: asyncio.Queue = asyncio.Queue(maxsize=self.settings.url_queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.consumers_count)
+        self.fingerprints, self.queued, self.stopped = {}, set(), False
+        self.failed, self.failed_pages = [], []
+        if self.checkpoint is not None:
+            self.done_pages = self.checkpoint.done_pages()
+            self.queued = self.checkpoint.done_urls()
+        runner = asyncio.create_task(self._run(iter(page_nums), urls, results))
+        try:
+            while True:
+                item = await results.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                chunk_urls, chunk = self._split_failures(*item)
+                if self.seen is None:
+                    changed = [True] * len(chunk)
+                else:
+                    hashes = [content_hash(result) for result in chunk]
+                    changed = self.seen.changed(list(zip(chunk_urls, hashes)))
+                for url, result, is_changed in zip(chunk_urls, chunk, changed):
+                    if is_changed:
+                        if isinstance(result, bytes) and not raw:
+                            result = BaseResumeModel.model_validate_json(result)
+                        yield (url, result) if with_urls else result
+                    if self.checkpoint is not None:
+                        self.checkpoint.done([url])
+                if self.seen is not None:
+                    self.seen.record(
+                        [
+                            (url, self.fingerprints.pop(url, ""), hash_)
+                            for url, hash_ in zip(chunk_urls, hashes)
+                        ]
+                    )
+                    # a checkpoint commits them once the output is flushed
+                    if self.checkpoint is None:
+                        self.seen.commit()
+        finally:
+            runner.cancel()
+            with suppress(asyncio.CancelledError):
+                await runner
+
+    def _split_failures(
+        self, chunk_urls: list[str], chunk: list[Any]
+    ) -> tuple[list[str], list[Any]]:
+        """Record failed URLs of a chunk and return the parsed ones."""
+        failures = [result for result in chunk if isinstance(result, FailedUrl)]
+        for failure in failures:
+            logging.error(f"Failed {failure.url}: {failure.error}")
+            self.fingerprints.pop(failure.url, None)
+        self.failed.extend(failures)
+        if self.metrics is not None:
+            self.metrics.inc("resumes_failed_total", len(failures))
+            self.metrics.inc("resumes_parsed_total", len(chunk) - len(failures))
+        parsed = [
+            (url, result)
+            for url, result in zip(chunk_urls, chunk)
+            if not isinstance(result, FailedUrl)
+        ]
+        if self.retry is not None:
+            if failures:
+                self.retry.add(failures)
+            self.retry.remove([url for url, _ in parsed])
+        if self.checkpoint is not None:
+            # the retry queue takes care of them from now on
+            self.checkpoint.done([failure.url for failure in failures])
+        return [url for url, _ in parsed], [result for _, result in parsed]
+
+    async def _run(
+        self, page_iter, urls: asyncio.Queue, results: asyncio.Queue
+    ) -> None:
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._produce(page_iter, urls))
+                for _ in range(self.consumers_count):
+                    tg.create_task(self._consume(urls, results))
+        except Exception as e:  # noqa: BLE001 - re-raised by iter_results
+            # Report the first failure itself rather than the task group
+            while isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
+            await results.put(e)
+            return
+        await results.put(None)
+
+    async def _produce(self, page_iter, queue: asyncio.Queue) -> None:
+        if self.checkpoint is not None and (pending := self.checkpoint.pending()):
+            logging.info(f"Resuming {len(pending)} pending resumes")
+            await self._put_links(queue, pending)
+        if self.retry is not None and (pending := self.retry.pending()):
+            logging.info(f"Retrying {len(pending)} failed resumes")
+            await self._put_links(queue, [(url, "") for url in pending])
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(self.listing_concurrency):
+                tg.create_task(self._fetch_pages(page_iter, queue))
+        for _ in range(self.consumers_count):
+            await queue.put(None)
+
+    async def _fetch_pages(self, page_iter, queue: asyncio.Queue) -> None:
+        # page_iter is shared by all producers, each takes the next free page
+        for page_num in page_iter:
+            if self.stopped:
+                return
+            if page_num in self.done_pages:
+                continue
+            logging.info(f"Parsing {page_num} page...")
+            try:
+                links = await self.get_page_links(page_num)
+            except Exception as e:  # noqa: BLE001 - kept in failed_pages
+                logging.error(f"Skipped page {page_num}: {type(e).__name__}: {e}")
+                self.failed_pages.append(page_num)
+                continue
+            if self.metrics is not None:
+                self.metrics.inc("listing_pages_total")
+            if self.seen is not None:
+                fresh = [
+                    (url, fingerprint)
+                    for url, fingerprint in links
+                    if not self.seen.is_unchanged(url, fingerprint)
+                ]
+                if links and not fresh:
+                    # Listings are sorted by freshness, the rest is known too
+                    logging.info(f"Page {page_num} has no new resumes, stopping")
+                    self.stopped = True
+                    return
+                links = fresh
+            if self.checkpoint is not None:
+                self.checkpoint.add_page(page_num, links)
+            await self._put_links(queue, links)
+
+    async def _put_links(
+        self, queue: asyncio.Queue, links: list[tuple[str, str]]
+    ) -> None:
+        for url, fingerprint in links:
+            if url in self.queued:
+                continue
+            self.queued.add(url)
+            self.fingerprints[url] = fingerprint
+            await queue.put(url)
+            if self.metrics is not None:
+                self.metrics.observe("url_queue_depth", queue.qsize())
+
+    async def _consume(self, queue: asyncio.Queue, results: asyncio.Queue) -> None:
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+            chunk = [url]
+            while len(chunk) < self.settings.worker_chunk_size:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if url is None:
+                    # Put the sentinel back so this consumer stops after the chunk
+                    queue.put_nowait(None)
+                    break
+                chunk.append(url)
+            await results.put((chunk, await self.pool.submit(self.fetch_func, chunk)))
+            if self.metrics is not None:
+                self.metrics.observe("result_queue_depth", results.qsize())
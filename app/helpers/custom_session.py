@@ -1,9 +1,56 @@
+import asyncio
+import json
+import logging
+import random
+import time
 import aiohttp
+from aiohttp import ClientError
 from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from app.helpers.metrics import CrawlMetrics
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.response_cache import ResponseCache
+from app.settings import Settings
+
+
+# Statuses worth another try, the server may answer later
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+# Failures of the connection itself rather than of the request
+RETRY_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, TimeoutError)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delay or HTTP date)."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
 
 
 class CustomSession(aiohttp.ClientSession):
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        limiter: RateLimiter | None = None,
+        max_connections: int = 0,
+        cache: ResponseCache | None = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        metrics: CrawlMetrics | None = None,
+        **kwargs,
+    ):
+        if metrics is not None:
+            kwargs["trace_configs"] = [
+                *kwargs.get("trace_configs", ()),
+                metrics.trace_config(),
+            ]
         super().__init__(
             headers={
                 "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
@@ -14,10 +61,182 @@ class CustomSession(aiohttp.ClientSession):
             *args,
             **kwargs,
         )
+        self.limiter = limiter
+        self.cache = cache
+        # retries of a request after a transient failure, 0 disables them
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Request phases are timed only if metrics are given at creation
+        self.metrics = metrics
+        # Requests in flight from this session, across all hosts
+        self.connections = (
+            asyncio.Semaphore(max_connections) if max_connections else None
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **kwargs) -> "CustomSession":
+        """Session with the retry policy and connection pool of ``settings``,
+        call it in a running loop.
+
+        The connector keeps idle connections for ``keepalive_timeout``
+        seconds, instead of aiohttp's 15, and DNS answers for
+        ``dns_cache_ttl`` seconds, instead of 10, so a session that lives
+        for a whole crawl keeps its connections between rate limited
+        requests and seldom opens or resolves them again.
+        """
+        kwargs.setdefault(
+            "connector",
+            aiohttp.TCPConnector(
+                limit_per_host=settings.connection_limit_per_host,
+                keepalive_timeout=settings.keepalive_timeout,
+                ttl_dns_cache=settings.dns_cache_ttl,
+            ),
+        )
+        return cls(
+            retries=settings.fetch_retries,
+            backoff=settings.retry_backoff,
+            max_backoff=settings.retry_max_backoff,
+            **kwargs,
+        )
 
     async def close(self):
         await super().close()
 
+    @asynccontextmanager
+    async def _limit(self, url: str):
+        if self.connections is not None:
+            await self.connections.acquire()
+        try:
+            if self.limiter is not None:
+                async with self.limiter.acquire(url):
+                    yield
+            else:
+                yield
+        finally:
+            if self.connections is not None:
+                self.connections.release()
+
+    def _count(self, name: str, value: float = 1) -> None:
+        if self.metrics is not None:
+            self.metrics.inc(name, value)
+
+    def _record(
+        self,
+        url: str,
+        started: float,
+        status: int | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Report a response status or connection error to the limiter."""
+        if self.limiter is not None:
+            self.limiter.record(
+                url,
+                time.perf_counter() - started,
+                failed=status is None or status >= 500,
+                overloaded=status in (429, 503) or isinstance(error, TimeoutError),
+            )
+
+    def _retry_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Full-jitter exponential backoff, or the delay the server asked for."""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    async def fetch(self, url: str, use_cache: bool = True) -> tuple[bytes, str]:
+        """GET ``url`` within the session limits.
+
+        When the session has a response cache and ``use_cache`` is set, a
+        fresh stored response is returned without a request and a stale one
+        is revalidated with a conditional request. Connection errors,
+        timeouts and 429/5xx responses are retried up to ``retries`` times
+        with jittered exponential backoff; a Retry-After header overrides
+        the backoff. The host slot is released while waiting. The latency
+        and outcome of every attempt are reported to the rate limiter,
+        which adapts the connections of the host to them.
+
+        Returns
+        -------
+        tuple of bytes and str
+            Response body and its encoding.
+        """
+        cache = self.cache if use_cache else None
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None and cache.is_fresh(cached):
+            cache.hit(url)
+            return cached.body, cached.encoding
+
+        headers = cached.validators() if cached is not None else None
+        attempt = 0
+        while True:
+            started = None
+            try:
+                async with self._limit(url):
+                    started = time.perf_counter()
+                    async with self.get(url, headers=headers) as response:
+                        self._record(url, started, response.status)
+                        started = None
+                        self._count("http_requests_total")
+                        if response.status == 304 and cached is not None:
+                            cache.revalidate(url)
+                            return cached.body, cached.encoding
+                        retry = (
+                            response.status in RETRY_STATUSES and attempt < self.retries
+                        )
+                        if not response.ok and not retry:
+                            self._count("http_errors_total")
+                            raise ClientError(
+                                f"{url}: {response.status}: {response.reason}"
+                            )
+                        if response.ok:
+                            started = time.perf_counter()
+                            body = await response.read()
+                            if self.metrics is not None:
+                                self.metrics.observe(
+                                    "http_download_seconds",
+                                    time.perf_counter() - started,
+                                )
+                            self._count("http_received_bytes_total", len(body))
+                            encoding = response.get_encoding()
+                            etag = response.headers.get("ETag")
+                            last_modified = response.headers.get("Last-Modified")
+                            break
+                        reason = f"{response.status}: {response.reason}"
+                        retry_after = (
+                            parse_retry_after(response.headers.get("Retry-After"))
+                            if response.status in (429, 503)
+                            else None
+                        )
+            except RETRY_ERRORS as e:
+                if started is not None:
+                    self._record(url, started, error=e)
+                if attempt >= self.retries:
+                    self._count("http_errors_total")
+                    raise
+                reason, retry_after = f"{type(e).__name__}: {e}", None
+            delay = self._retry_delay(attempt, retry_after)
+            attempt += 1
+            self._count("http_retries_total")
+            logging.warning(
+                f"{url}: {reason}, retry {attempt}/{self.retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+        if cache is not None:
+            if cached is not None:
+                cache.miss()
+            cache.put(url, body, encoding, etag, last_modified)
+        return body, encoding
+
+    async def fetch_text(self, url: str, use_cache: bool = True) -> str:
+        """GET ``url`` and return the body as text."""
+        body, encoding = await self.fetch(url, use_cache)
+        return body.decode(encoding)
+
+    async def fetch_json(self, url: str, use_cache: bool = True) -> Any:
+        """GET ``url`` and return the decoded JSON."""
+        body, encoding = await self.fetch(url, use_cache)
+        return json.loads(body.decode(encoding))
+
     @asynccontextmanager
     async def customSession(*args, **kwargs):
         session = CustomSession(*args, **kwargs)
@@ -0,0 +1,301 @@
+import hashlib
+import re
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from urllib.parse import urlsplit
+
+from app.helpers.enums import CityType
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.resume_store import ResumeStore
+from app.settings import Settings
+
+# work.ua shows cities in Ukrainian, robota.ua ones come from CityType
+UA_CITY_NAMES = {
+    "київ": CityType.KYIV,
+    "львів": CityType.LVIV,
+    "одеса": CityType.ODESA,
+    "дніпро": CityType.DNIPRO,
+    "вінниця": CityType.VINNYTSIA,
+    "запоріжжя": CityType.ZAPORIZHIA,
+    "івано-франківськ": CityType.IVANO_FRANKIVSK,
+    "кропивницький": CityType.KROPYVNYTSKYI,
+    "луцьк": CityType.LUTSK,
+    "миколаїв": CityType.MYKOLAIV,
+    "полтава": CityType.POLTAVA,
+    "рівне": CityType.RIVNE,
+    "суми": CityType.SUMY,
+    "тернопіль": CityType.TERNOPIL,
+    "харків": CityType.KHARKIV,
+    "херсон": CityType.KHERSON,
+    "хмельницький": CityType.KHMELNYTSKYI,
+    "черкаси": CityType.CHERKASY,
+    "чернігів": CityType.CHERNIHIV,
+    "чернівці": CityType.CHERNIVTSI,
+    "ужгород": CityType.UZHHOROD,
+}
+# Empty MinHash bin, larger than any 64-bit token hash
+EMPTY_BIN = 1 << 64
+WORD = re.compile(r"\w+")
+
+
+def normalize_city(city: str) -> str:
+    """Site-independent city key, the CityType name when the city is known."""
+    city = city.strip().lower()
+    member = UA_CITY_NAMES.get(city) or CityType.get_by_name(city.replace(" ", "_"))
+    return member.name if member is not None else city
+
+
+def blocking_key(resume: BaseResumeModel) -> tuple[str, str]:
+    """Normalized first name and city, duplicates always share them."""
+    first_name = "".join(WORD.findall(resume.first_name.lower()))
+    return first_name, normalize_city(resume.city)
+
+
+def resume_tokens(resume: BaseResumeModel) -> set[str]:
+    """Words of the speciality, skills and experience of a resume."""
+    return words(resume.speciality, resume.skills, resume.experiences)
+
+
+def words(speciality: str, skills: str, experiences: list[dict]) -> set[str]:
+    """Lowercase words of the fields ``resume_tokens`` looks at."""
+    parts = [speciality, skills]
+    for ex in experiences:
+        parts.append(str(ex.get("position", "")))
+        parts.append(str(ex.get("company", "")))
+        parts.append(str(ex.get("description", "")))
+    return set(WORD.findall(" ".join(parts).lower()))
+
+
+class DedupIndex:
+    """Collapses records of the same candidate found on different sites.
+
+    Resumes are first grouped into blocks by normalized first name and city
+    and, inside a block, by ``age_bucket``-year age buckets; only resumes of
+    the same or neighbouring buckets (or with an unknown age) are compared.
+    Within a block, MinHash signatures of the speciality/skills/experience
+    words are split into LSH bands, and pairs sharing a band whose estimated
+    Jaccard similarity reaches ``threshold`` are duplicates. Signatures are
+    only computed for resumes that have someone of a near age in their
+    block, so most resumes cost one dict insert. The resumes themselves are
+    kept in a compact ``ResumeStore`` until ``unique`` yields them.
+
+    A site lists a candidate once, so two records of the same site, told
+    apart by the host of ``cv_link``, are never collapsed, not even through
+    a record of another site similar to both. Resumes without any of the
+    compared words are never collapsed either.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        num_perm: int = 64,
+        bands: int = 16,
+        age_bucket: int = 5,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.age_bucket = age_bucket
+        self.resumes = ResumeStore()
+        self.age_buckets: list[int | None] = []
+        # host of the cv_link of every resume
+        self.sites: list[str] = []
+        # (first name, city) -> age bucket (None if unknown) -> resume ids
+        self.blocks: dict[tuple[str, str], dict[int | None, list[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        # word -> (bin, value) of its hash
+        self.token_slots: dict[str, tuple[int, int]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DedupIndex":
+        return cls(threshold=settings.dedup_threshold)
+
+    def add(self, resume: BaseResumeModel) -> None:
+        bucket = resume.age // self.age_bucket if resume.age else None
+        self.blocks[blocking_key(resume)][bucket].append(len(self.resumes))
+        self.age_buckets.append(bucket)
+        self.sites.append(sys.intern(urlsplit(resume.cv_link).hostname or ""))
+        self.resumes.append(resume)
+
+    def extend(self, resumes: Iterable[BaseResumeModel]) -> None:
+        for resume in resumes:
+            self.add(resume)
+
+    def signature(self, resume: BaseResumeModel) -> tuple[int, ...]:
+        """MinHash signature of the resume words."""
+        return self.tokens_signature(resume_tokens(resume))
+
+    def tokens_signature(self, tokens: set[str]) -> tuple[int, ...]:
+        """MinHash signature of a set of words.
+
+        One permutation hashing: every word is hashed once, the hash picks one
+        of ``num_perm`` bins and each bin keeps its minimum. Empty bins borrow
+        the value of the next non-empty bin (rotation densification), so the
+        bins agree with the probability of the Jaccard similarity like
+        ``num_perm`` independent MinHashes at a fraction of the cost.
+        """
+        bins = [EMPTY_BIN] * self.num_perm
+        for token in tokens:
+            if (slot := self.token_slots.get(token)) is None:
+                digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+                value, index = divmod(int.from_bytes(digest), self.num_perm)
+                slot = self.token_slots[token] = (index, value)
+            index, value = slot
+            # cheaper than min() in the loop over every token
+            if value < bins[index]:  # noqa: PLR1730
+                bins[index] = value
+        if EMPTY_BIN not in bins or min(bins) == EMPTY_BIN:
+            return tuple(bins)
+        # walk the ring right to left from a filled bin, negative indices wrap
+        start = next(i for i in range(self.num_perm - 1, -1, -1) if bins[i] < EMPTY_BIN)
+        carry, distance = bins[start], 0
+        for i in range(start - 1, start - self.num_perm, -1):
+            if bins[i] < EMPTY_BIN:
+                carry, distance = bins[i], 0
+            else:
+                distance += 1
+                # tell borrowed values apart from the ones of the bin itself
+                bins[i] = carry + distance * EMPTY_BIN
+        return tuple(bins)
+
+    def _stored_tokens(self, i: int) -> set[str]:
+        """``resume_tokens`` of a stored resume without rebuilding it."""
+        return words(
+            self.resumes.value(i, "speciality"),
+            self.resumes.value(i, "skills"),
+            self.resumes.value(i, "experiences"),
+        )
+
+    def similarity(self, first: tuple[int, ...], second: tuple[int, ...]) -> float:
+        """Jaccard similarity estimated from two signatures."""
+        return sum(x == y for x, y in zip(first, second)) / self.num_perm
+
+    def _near_ages(self, first: int, second: int) -> bool:
+        """Whether two resumes of a block fall in the same or adjacent age
+        buckets, an unknown age matches any."""
+        first_bucket, second_bucket = self.age_buckets[first], self.age_buckets[second]
+        return (
+            first_bucket is None
+            or second_bucket is None
+            or abs(first_bucket - second_bucket) <= 1
+        )
+
+    def _comparable(self, buckets: dict[int | None, list[int]]) -> list[int]:
+        """Resumes of a block that have someone of a near age to compare to."""
+        block_size = sum(map(len, buckets.values()))
+        unknown = len(buckets.get(None, ()))
+        ids = []
+        for bucket, members in buckets.items():
+            near = (
+                block_size
+                if bucket is None
+                else len(members)
+                + unknown
+                + len(buckets.get(bucket - 1, ()))
+                + len(buckets.get(bucket + 1, ()))
+            )
+            if near > 1:
+                ids.extend(members)
+        return ids
+
+    def clusters(self) -> list[list[BaseResumeModel]]:
+        """Groups of resumes of the same candidate, singletons included."""
+        return [[self.resumes[i] for i in group] for group in self.cluster_ids()]
+
+    def cluster_ids(self) -> list[list[int]]:
+        """Groups of indexes into ``resumes`` of the same candidate."""
+        parent = list(range(len(self.resumes)))
+        # root of a group with more than one resume -> sites of its resumes
+        group_sites: dict[int, set[str]] = {}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(first: int, second: int) -> None:
+            first, second = find(first), find(second)
+            if first == second:
+                return
+            first_sites = group_sites.get(first) or {self.sites[first]}
+            second_sites = group_sites.get(second) or {self.sites[second]}
+            if first_sites & second_sites:
+                return
+            parent[second] = first
+            group_sites[first] = first_sites | second_sites
+            group_sites.pop(second, None)
+
+        # None for a resume without words, whose signature would be all
+        # EMPTY_BIN and match any other such resume: it is kept as unique
+        signatures: dict[int, tuple[int, ...] | None] = {}
+        for buckets in self.blocks.values():
+            ids = self._comparable(buckets)
+            for i in ids:
+                if i not in signatures:
+                    tokens = self._stored_tokens(i)
+                    signatures[i] = self.tokens_signature(tokens) if tokens else None
+            ids = [i for i in ids if signatures[i] is not None]
+            # LSH: only pairs that agree on a whole band are compared
+            banded: dict[tuple, set[int]] = defaultdict(set)
+            for i in ids:
+                bands = zip(*[iter(signatures[i])] * self.rows)
+                for band, rows in enumerate(bands):
+                    banded[band, rows].add(i)
+            checked = set()
+            # (similarity, first, second) of the duplicates of the block
+            pairs = []
+            for members in banded.values():
+                if len(members) < 2:
+                    continue
+                members = sorted(members)
+                for n, first in enumerate(members):
+                    for second in members[n + 1 :]:
+                        pair = (first, second)
+                        if (
+                            pair in checked
+                            or self.sites[first] == self.sites[second]
+                            or not self._near_ages(first, second)
+                        ):
+                            continue
+                        checked.add(pair)
+                        similarity = self.similarity(
+                            signatures[first], signatures[second]
+                        )
+                        if similarity >= self.threshold:
+                            pairs.append((similarity, first, second))
+            # closest pairs first, a record then joins its most similar match
+            for _, first, second in sorted(pairs, reverse=True):
+                union(first, second)
+
+        groups: dict[int, list[int]] = defaultdict(list)
+        for i in range(len(self.resumes)):
+            groups[find(i)].append(i)
+        return list(groups.values())
+
+    def unique(self) -> Iterator[BaseResumeModel]:
+        """One merged record per candidate, rebuilt as they are taken."""
+        for group in self.cluster_ids():
+            yield merge_duplicates([self.resumes[i] for i in group])
+
+
+def merge_duplicates(resumes: list[BaseResumeModel]) -> BaseResumeModel:
+    """Collapse records of one candidate into the most complete of them.
+
+    Empty fields of that record are filled from the other records.
+    """
+    best = max(resumes, key=lambda resume: resume.resume_filling)
+    update = {}
+    for field, value in best:
+        if value:
+            continue
+        for other in resumes:
+            if other_value := getattr(other, field):
+                update[field] = other_value
+                break
+    return best.model_copy(update=update) if update else best
@@ -0,0 +1,108 @@
+import re
+from typing import Any
+
+from app.helpers.enums import ExperienceType, LangLevelType, LangNameType, ScheduleType
+from app.helpers.resume_filter import ResumeFilter
+
+# work.ua shows these fields in Ukrainian, robota.ua ones come from the enums
+UA_SCHEDULES = {
+    "повна зайнятість": ScheduleType.FULLTIME,
+    "неповна зайнятість": ScheduleType.PARTIAL,
+    "дистанційна робота": ScheduleType.REMOTE,
+    "віддалена робота": ScheduleType.REMOTE,
+    "стажування": ScheduleType.INTERNSHIP,
+    "стажування/практика": ScheduleType.INTERNSHIP,
+    "проєктна робота": ScheduleType.PROJECT,
+    "проектна робота": ScheduleType.PROJECT,
+    "сезонна робота": ScheduleType.SEASONAL,
+}
+UA_LANGUAGES = {
+    "англійська": LangNameType.ENGLISH,
+    "німецька": LangNameType.GERMAN,
+    "французька": LangNameType.FRENCH,
+    "іспанська": LangNameType.SPANISH,
+    "італійська": LangNameType.ITALIAN,
+    "польська": LangNameType.POLISH,
+    "чеська": LangNameType.CZECH,
+    "португальська": LangNameType.PORTUGUESE,
+    "китайська": LangNameType.CHINESE,
+    "японська": LangNameType.JAPANESE,
+    "турецька": LangNameType.TURKISH,
+    "російська": LangNameType.RUSSIAN,
+    "українська": LangNameType.UKRAINIAN,
+}
+UA_LANG_LEVELS = {
+    "початковий": LangLevelType.ELEMENTARY,
+    "базовий": LangLevelType.ELEMENTARY,
+    "нижче середнього": LangLevelType.LOWER_INTERMEDIATE,
+    "середній": LangLevelType.INTERMEDIATE,
+    "вище середнього": LangLevelType.UPPER_INTERMEDIATE,
+    "просунутий": LangLevelType.ADVANCED,
+    "вільно": LangLevelType.FLUENT,
+    "вільний": LangLevelType.FLUENT,
+    "рідна": LangLevelType.NATIVE,
+    "рідний": LangLevelType.NATIVE,
+}
+# LangLevelType values are not ordered, a filter level means "at least"
+LEVEL_RANKS = {
+    level: rank
+    for rank, level in enumerate(
+        (
+            LangLevelType.ELEMENTARY,
+            LangLevelType.LOWER_INTERMEDIATE,
+            LangLevelType.INTERMEDIATE,
+            LangLevelType.UPPER_INTERMEDIATE,
+            LangLevelType.ADVANCED,
+            LangLevelType.FLUENT,
+            LangLevelType.NATIVE,
+        ),
+        start=1,
+    )
+}
+# (above, up to) total years of an ExperienceType, None is unbounded
+EXPERIENCE_YEARS = {
+    ExperienceType.NO_EXPERIENCE.value: (None, 0),
+    ExperienceType.UP_TO_1_YEAR.value: (0, 1),
+    ExperienceType.FROM_1_TO_2.value: (1, 2),
+    ExperienceType.FROM_2_TO_5.value: (2, 5),
+    ExperienceType.FROM_5_TO_10.value: (5, 10),
+    ExperienceType.MORE_THAN_10.value: (10, None),
+}
+WORD = re.compile(r"\w+")
+
+
+def _member(mapping: dict, enum, value: str):
+    value = value.strip().lower()
+    return mapping.get(value) or enum.get_by_name(value.replace(" ", "_"))
+
+
+def normalize_schedules(schedule: str) -> list[str]:
+    """Site-independent schedule keys of a resume, the ScheduleType names
+    when known. Work.ua lists several schedules separated by commas."""
+    keys = []
+    for part in schedule.split(","):
+        if not part.strip():
+            continue
+        member = _member(UA_SCHEDULES, ScheduleType, part)
+        keys.append(member.name if member is not None else part.strip().lower())
+    return keys
+
+
+def normalize_language(name: str, level: str) -> tuple[str, int]:
+    """Language key, the LangNameType name when known, and the rank of the
+    level in ``LEVEL_RANKS``, 0 when the level is unknown."""
+    member = _member(UA_LANGUAGES, LangNameType, name)
+    key = member.name if member is not None else name.strip().lower()
+    return key, LEVEL_RANKS.get(_member(UA_LANG_LEVELS, LangLevelType, level), 0)
+
+
+def experience_years(experiences: list[dict[str, Any]]) -> float:
+    """Total years of the experience entries of a resume."""
+    return sum(experience.get("period", 0) for experience in experiences)
+
+
+def query_words(filter_obj: ResumeFilter) -> list[str]:
+    """Lowercase words of the speciality and main skills of a filter, which
+    a resume has to contain to match it."""
+    text = " ".join([filter_obj.speciality, *filter_obj.main_skills])
+    return list(dict.fromkeys(WORD.findall(text.lower())))
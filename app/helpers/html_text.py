@@ -0,0 +1,124 @@
+import html
+from html.entities import html5
+from html.parser import HTMLParser
+
+# Tags whose own strings BeautifulSoup leaves out of ``.text``
+HIDDEN_STRING_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+# Whitespace-only strings made of these are collapsed by BeautifulSoup
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+# Tags that never get a closing tag, so they are not pushed on the stack
+VOID_TAGS = frozenset(
+    (
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "br",
+        "col",
+        "command",
+        "embed",
+        "frame",
+        "hr",
+        "image",
+        "img",
+        "input",
+        "isindex",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "nextid",
+        "param",
+        "source",
+        "spacer",
+        "track",
+        "wbr",
+    )
+)
+
+
+class _TextExtractor(HTMLParser):
+    """Streaming tag stripper that collects the text of an HTML fragment.
+
+    It runs the same tokenizer as BeautifulSoup's "html.parser" builder and
+    follows its rules for strings, but keeps only a stack of open tag names
+    instead of building a tree.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts: list[str] = []
+        self.stack: list[str] = []
+        self.data: list[str] = []
+
+    def end_data(self, cdata: bool = False) -> None:
+        """Finish the current string, like ``BeautifulSoup.endData``."""
+        if not self.data:
+            return
+        data = "".join(self.data)
+        self.data = []
+        # CDATA keeps its own string class even inside script or template
+        if not cdata and any(tag in HIDDEN_STRING_TAGS for tag in self.stack):
+            return
+        if (
+            not data.strip(ASCII_SPACES)
+            and "pre" not in self.stack
+            and "textarea" not in self.stack
+        ):
+            data = "\n" if "\n" in data else " "
+        self.parts.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        self.end_data()
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.end_data()
+
+    def handle_endtag(self, tag):
+        self.end_data()
+        if tag in self.stack:
+            while self.stack.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def handle_entityref(self, name):
+        self.data.append(html5.get(f"{name};", f"&{name}"))
+
+    def handle_charref(self, name):
+        self.data.append(html.unescape(f"&#{name};"))
+
+    def handle_comment(self, data):
+        self.end_data()
+
+    def handle_decl(self, decl):
+        self.end_data()
+
+    def handle_pi(self, data):
+        self.end_data()
+
+    def unknown_decl(self, data):
+        self.end_data()
+        if data.upper().startswith("CDATA["):
+            self.data.append(data[len("CDATA[") :])
+            self.end_data(cdata=True)
+
+
+def html_to_text(markup: str) -> str:
+    """Return the text of an HTML fragment.
+
+    Gives the same result as ``BeautifulSoup(markup, "html.parser").text``
+    without building a tree: tags, comments and script/style contents are
+    dropped, character references are decoded and whitespace-only strings
+    are collapsed.
+    """
+    if "<" not in markup and "&" not in markup and markup.strip(ASCII_SPACES):
+        return markup
+    extractor = _TextExtractor()
+    extractor.feed(markup)
+    extractor.close()
+    extractor.end_data()
+    return "".join(extractor.parts)
@@ -0,0 +1,154 @@
+import heapq
+import itertools
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+
+from app.helpers.resume_python_object import BaseResumeModel
+
+# Score of one keyword found in a field, a keyword counts once per field
+FIELD_WEIGHTS = {
+    "speciality": 3.0,
+    "skills": 2.0,
+    "experiences": 1.0,
+    "educations": 0.5,
+}
+
+
+def can_overlap(keywords: list[str]) -> bool:
+    """Whether two keywords can match overlapping text: one starts at a word
+    start inside the other or where the other's tail begins."""
+    for keyword in keywords:
+        for start in range(len(keyword)):
+            if start and re.match(r"\w", keyword[start - 1]):
+                continue
+            tail = keyword[start:]
+            for other in keywords:
+                if other is not keyword and (
+                    other.startswith(tail) or tail.startswith(other)
+                ):
+                    return True
+    return False
+
+
+def resume_fields(resume: BaseResumeModel) -> dict[str, str]:
+    """Texts of a resume searched for keywords, by field."""
+    return {
+        "speciality": resume.speciality,
+        "skills": resume.skills,
+        "experiences": "\n".join(
+            f"{ex.get('position', '')}\n{ex.get('description', '')}"
+            for ex in resume.experiences
+        ),
+        "educations": "\n".join(
+            f"{ed.get('name', '')}\n{ed.get('speciality', '')}\n{ed.get('comment', '')}"
+            for ed in resume.educations
+        ),
+    }
+
+
+class KeywordRanker:
+    """Scores resumes against ``ResumeFilter.keywords`` and keeps the best.
+
+    All keywords are compiled into one case-insensitive regex, so every
+    field is scanned once whatever the number of keywords. A keyword only
+    matches as a whole word and adds its field weight once per field.
+    Overlapping keywords all count: "machine learning" also finds "machine"
+    and "learning" when they are keywords. The ``n`` best resumes are kept
+    in a min-heap while resumes stream through.
+    """
+
+    def __init__(
+        self,
+        keywords: list[str],
+        n: int = 10,
+        weights: dict[str, float] = FIELD_WEIGHTS,
+    ):
+        if n < 1:
+            raise ValueError(f"At least one resume must be kept, not {n}")
+        self.keywords = list(
+            dict.fromkeys(k.strip().lower() for k in keywords if k.strip())
+        )
+        self.n = n
+        self.weights = weights
+        # Of the keywords starting at one position the longest is tried
+        # first, the shorter ones that end on a word boundary inside it are
+        # added from ``prefixes``. Keywords that can overlap are matched in a
+        # lookahead at every word start, which takes about twice as long as
+        # consuming the matches, so a later keyword starting inside an
+        # earlier match is found too.
+        alternatives = "|".join(
+            re.escape(k) for k in sorted(self.keywords, key=len, reverse=True)
+        )
+        keyword = (
+            rf"(?=({alternatives})(?!\w))"
+            if can_overlap(self.keywords)
+            else rf"({alternatives})(?!\w)"
+        )
+        self.pattern = (
+            re.compile(rf"(?<!\w){keyword}", re.IGNORECASE) if self.keywords else None
+        )
+        self.prefixes: dict[str, list[str]] = {}
+        for keyword in self.keywords:
+            prefixes = [
+                prefix
+                for prefix in self.keywords
+                if len(prefix) < len(keyword)
+                and keyword.startswith(prefix)
+                and not re.match(r"\w", keyword[len(prefix)])
+            ]
+            if prefixes:
+                self.prefixes[keyword] = prefixes
+        self.heap: list[tuple[float, int, BaseResumeModel]] = []
+        # tie breaker, earlier resumes win among equal scores
+        self.counter = itertools.count()
+
+    def matches(self, text: str) -> set[str]:
+        """Keywords found in ``text``."""
+        if self.pattern is None or not text:
+            return set()
+        found = {match.lower() for match in self.pattern.findall(text)}
+        if self.prefixes:
+            for keyword in found & self.prefixes.keys():
+                found.update(self.prefixes[keyword])
+        return found
+
+    def score(self, resume: BaseResumeModel) -> float:
+        return sum(
+            self.weights[field] * len(self.matches(text))
+            for field, text in resume_fields(resume).items()
+        )
+
+    def push(self, resume: BaseResumeModel) -> float:
+        """Score a resume and keep it if it is among the ``n`` best so far."""
+        score = self.score(resume)
+        item = (score, -next(self.counter), resume)
+        if len(self.heap) < self.n:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+        return score
+
+    def rank(
+        self, resumes: Iterable[BaseResumeModel]
+    ) -> list[tuple[float, BaseResumeModel]]:
+        """Score all ``resumes`` and return the ``n`` best."""
+        for resume in resumes:
+            self.push(resume)
+        return self.top()
+
+    async def track(
+        self, resumes: AsyncIterable[BaseResumeModel]
+    ) -> AsyncIterator[BaseResumeModel]:
+        """Pass resumes through unchanged while ranking them."""
+        async for resume in resumes:
+            self.push(resume)
+            yield resume
+
+    def top(self) -> list[tuple[float, BaseResumeModel]]:
+        """Best resumes seen so far with their scores, best first."""
+        return [
+            (score, resume)
+            for score, _, resume in sorted(
+                self.heap, key=lambda item: item[:2], reverse=True
+            )
+        ]
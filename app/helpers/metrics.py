@@ -0,0 +1,249 @@
+import asyncio
+import bisect
+import logging
+import multiprocessing
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+import aiohttp
+
+from app.settings import Settings
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+COUNTERS = {
+    "http_requests_total": "Requests that got a response",
+    "http_errors_total": "Requests that failed for good",
+    "http_retries_total": "Requests retried after a transient failure",
+    "http_received_bytes_total": "Decoded response body bytes",
+    "http_dns_cache_hits_total": "Connections that reused a cached DNS answer",
+    "http_dns_lookups_total": "Host names resolved",
+    "http_connections_total": "Connections opened, each with its own handshakes",
+    "http_connections_reused_total": "Requests sent on a pooled keep-alive connection",
+    "listing_pages_total": "Listing pages enumerated",
+    "resumes_parsed_total": "Resumes fetched and parsed",
+    "resumes_failed_total": "Resumes that failed",
+}
+# metric name (with labels) -> bucket upper bounds
+HISTOGRAMS = {
+    "http_dns_seconds": LATENCY_BUCKETS,
+    "http_connect_seconds": LATENCY_BUCKETS,
+    "http_ttfb_seconds": LATENCY_BUCKETS,
+    "http_download_seconds": LATENCY_BUCKETS,
+    'resume_parse_seconds{site="work.ua"}': LATENCY_BUCKETS,
+    'resume_parse_seconds{site="robota.ua"}': LATENCY_BUCKETS,
+    "url_queue_depth": DEPTH_BUCKETS,
+    "result_queue_depth": DEPTH_BUCKETS,
+}
+HELP = {
+    "http_dns_seconds": "DNS resolution time",
+    "http_connect_seconds": "Time to open a new connection",
+    "http_ttfb_seconds": "Time from sending a request to its response headers",
+    "http_download_seconds": "Time to read a response body",
+    "resume_parse_seconds": "Time to build a resume model from a response",
+    "url_queue_depth": "Resume URLs waiting for a worker, sampled on every put",
+    "result_queue_depth": "Parsed chunks waiting for the caller, sampled on every put",
+}
+
+
+def _split_name(key: str) -> tuple[str, str]:
+    """``name{labels}`` -> (name, labels without braces)."""
+    name, _, labels = key.partition("{")
+    return name, labels.rstrip("}")
+
+
+class CrawlMetrics:
+    """Counters and histograms of a crawl shared by all its processes.
+
+    The values live in shared memory, so a ``CrawlMetrics`` created before
+    the worker pool starts collects the requests and parse times of every
+    worker as well as of the parent. Only the metrics declared in
+    ``COUNTERS`` and ``HISTOGRAMS`` can be recorded.
+    """
+
+    def __init__(self):
+        self._lock = multiprocessing.Lock()
+        self._counters = multiprocessing.RawArray("d", len(COUNTERS))
+        self._counter_index = {name: i for i, name in enumerate(COUNTERS)}
+        # per histogram: one count per bucket and +Inf, then sum and count
+        self._histograms = {
+            key: multiprocessing.RawArray("d", len(buckets) + 3)
+            for key, buckets in HISTOGRAMS.items()
+        }
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[self._counter_index[name]] += value
+
+    def observe(self, key: str, value: float) -> None:
+        buckets = HISTOGRAMS[key]
+        values = self._histograms[key]
+        with self._lock:
+            values[bisect.bisect_left(buckets, value)] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    @contextmanager
+    def timer(self, key: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(key, time.perf_counter() - started)
+
+    def counter(self, name: str) -> float:
+        return self._counters[self._counter_index[name]]
+
+    def quantile(self, key: str, q: float) -> float | None:
+        """Estimate a quantile of a histogram, None if it is empty."""
+        buckets = HISTOGRAMS[key]
+        with self._lock:
+            values = list(self._histograms[key])
+        total = values[-1]
+        if not total:
+            return None
+        rank, seen, lower = q * total, 0.0, 0.0
+        for upper, count in zip(buckets, values):
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return buckets[-1]
+
+    def mean(self, key: str) -> float | None:
+        values = self._histograms[key]
+        return values[-2] / values[-1] if values[-1] else None
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp tracing that times the DNS, connect and TTFB phases and
+        counts new and reused connections."""
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_started = time.perf_counter()
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            self.inc("http_dns_lookups_total")
+            self.observe("http_dns_seconds", time.perf_counter() - ctx.dns_started)
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.inc("http_dns_cache_hits_total")
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.inc("http_connections_total")
+            self.observe(
+                "http_connect_seconds", time.perf_counter() - ctx.connect_started
+            )
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.inc("http_connections_reused_total")
+
+        async def on_request_end(session, ctx, params):
+            # fired when the response headers arrive, before the body is read
+            self.observe("http_ttfb_seconds", time.perf_counter() - ctx.started)
+
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(on_request_start)
+        config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        config.on_dns_cache_hit.append(on_dns_cache_hit)
+        config.on_connection_create_start.append(on_connection_create_start)
+        config.on_connection_create_end.append(on_connection_create_end)
+        config.on_connection_reuseconn.append(on_connection_reuseconn)
+        config.on_request_end.append(on_request_end)
+        return config
+
+    def summary(self) -> str:
+        """One line overview: throughput and where the time goes."""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        requests = self.counter("http_requests_total")
+        parsed = self.counter("resumes_parsed_total")
+        parts = [
+            f"{parsed:.0f} resumes ({parsed / elapsed:.1f}/s)",
+            f"{requests:.0f} requests ({requests / elapsed:.1f}/s)",
+            f"{self.counter('http_received_bytes_total') / 2**20:.1f} MiB",
+            f"{self.counter('http_connections_total'):.0f} connections",
+            f"{self.counter('http_retries_total'):.0f} retries",
+            f"{self.counter('resumes_failed_total'):.0f} failed",
+        ]
+        for key, label in (
+            ("http_ttfb_seconds", "ttfb"),
+            ("http_download_seconds", "download"),
+            ('resume_parse_seconds{site="work.ua"}', "parse work.ua"),
+            ('resume_parse_seconds{site="robota.ua"}', "parse robota.ua"),
+        ):
+            p50, p95 = self.quantile(key, 0.5), self.quantile(key, 0.95)
+            if p50 is not None:
+                parts.append(f"{label} p50 {p50 * 1000:.0f}ms p95 {p95 * 1000:.0f}ms")
+        for key, label in (("url_queue_depth", "url queue"),):
+            if (mean := self.mean(key)) is not None:
+                parts.append(f"{label} {mean:.1f}")
+        return ", ".join(parts)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, help_text in COUNTERS.items():
+            lines += [
+                f"# HELP {name} {help_text}",
+                f"# TYPE {name} counter",
+                f"{name} {self.counter(name):g}",
+            ]
+        described = set()
+        for key, buckets in HISTOGRAMS.items():
+            name, labels = _split_name(key)
+            if name not in described:
+                described.add(name)
+                lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} histogram"]
+            with self._lock:
+                values = list(self._histograms[key])
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0.0
+            for upper, count in zip((*buckets, "+Inf"), values):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{prefix}le="{upper}"}} {cumulative:g}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {values[-2]:g}")
+            lines.append(f"{name}_count{suffix} {values[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str | Path) -> None:
+        """Write the Prometheus text atomically, for a textfile collector."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.prometheus_text())
+        tmp.replace(path)
+
+    @asynccontextmanager
+    async def reporting(self, settings: Settings):
+        """Log a summary every ``settings.metrics_interval`` seconds while the
+        block runs, and once more with the Prometheus dump at the end."""
+
+        async def report():
+            while True:
+                await asyncio.sleep(settings.metrics_interval)
+                self.report(settings)
+
+        task = asyncio.create_task(report()) if settings.metrics_interval > 0 else None
+        try:
+            yield self
+        finally:
+            if task is not None:
+                task.cancel()
+            self.report(settings)
+
+    def report(self, settings: Settings) -> None:
+        logging.info(f"Metrics: {self.summary()}")
+        if settings.metrics_path:
+            self.dump(settings.metrics_path)
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, aclosing
+
+from app.helpers.checkpoint import CrawlCheckpoint
+from app.helpers.custom_session import CustomSession
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_parser import ResumeParser
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.worker_pool import ResumeWorkerPool
+from app.settings import Settings
+
+
+class CrawlOrchestrator:
+    """Crawls several resume sites with one filter as a single crawl.
+
+    Every site runs its own listing pipeline on the caller's event loop, but
+    all of them share one worker pool and one rate limiter, and their
+    resumes are merged into one stream in completion order. A worker handles
+    one chunk at a time, so the shared pool gets ``processes_count`` workers
+    per site; each site keeps the throughput of a crawl of its own and a
+    combined crawl takes about as long as the slowest site. A site that
+    fails is logged and recorded in ``failed`` while the others go on. The
+    session's metrics, if any, cover all sites and are reported periodically.
+    """
+
+    def __init__(
+        self,
+        filter_obj: ResumeFilter,
+        settings: Settings,
+        session: CustomSession,
+        parser_classes: Iterable[type[ResumeParser]],
+        checkpoint: CrawlCheckpoint | None = None,
+        limiter: RateLimiter | None = None,
+    ):
+        self.settings = settings
+        self.checkpoint = checkpoint
+        self.metrics = session.metrics
+        self.limiter = limiter or RateLimiter(settings)
+        self.parsers = [
+            parser_class(filter_obj, settings, session, self.limiter)
+            for parser_class in parser_classes
+        ]
+        self.failed: list[str] = []
+
+    async def iter_resumes(
+        self, raw: bool = False
+    ) -> AsyncIterator[BaseResumeModel | bytes]:
+        """Yield resumes of all sites as soon as they are parsed.
+
+        Parameters
+        ----------
+        raw : bool, default False
+            Yield the JSON bytes of every resume instead of a model.
+
+        Yields
+        ------
+        BaseResumeModel or bytes
+            Parsed resume of any of the sites.
+        """
+        self.failed = []
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.settings.processes_count * 2)
+        pool_settings = self.settings.model_copy(
+            update={
+                "processes_count": self.settings.processes_count * len(self.parsers)
+            }
+        )
+        async with AsyncExitStack() as stack:
+            if self.metrics is not None:
+                await stack.enter_async_context(self.metrics.reporting(self.settings))
+            pool = stack.enter_context(
+                ResumeWorkerPool(pool_settings, self.limiter, self.metrics)
+            )
+            tasks = [
+                asyncio.create_task(self._crawl(parser, pool, queue, raw))
+                for parser in self.parsers
+            ]
+            try:
+                running = len(tasks)
+                while running:
+                    resume = await queue.get()
+                    if resume is None:
+                        running -= 1
+                        continue
+                    yield resume
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        self.limiter.report()
+
+    async def _crawl(
+        self,
+        parser: ResumeParser,
+        pool: ResumeWorkerPool,
+        queue: asyncio.Queue,
+        raw: bool,
+    ) -> None:
+        try:
+            resumes = parser.iter_resumes(pool, self.checkpoint, raw)
+            async with aclosing(resumes):
+                async for resume in resumes:
+                    await queue.put(resume)
+        except Exception as e:  # noqa: BLE001 - kept in self.failed
+            logging.error(f"{parser.SOURCE} crawl failed: {e}")
+            self.failed.append(parser.SOURCE)
+        await queue.put(None)
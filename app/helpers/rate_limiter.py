@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from app.settings import Settings
+
+WORK_UA_HOST = "www.work.ua"
+ROBOTA_UA_HOST = "employer-api.robota.ua"
+KNOWN_HOSTS = (WORK_UA_HOST, ROBOTA_UA_HOST)
+
+# Polling interval while waiting for a free connection slot of another process
+SLOT_POLL_INTERVAL = 0.005
+# Adaptive concurrency: requests judged together, at least one per slot
+MIN_WINDOW = 20
+MAX_WINDOW = 100
+# share of failed requests of a window that counts as an overload
+MAX_ERROR_RATE = 0.05
+# the connection limit is multiplied by this on an overload
+DECREASE_FACTOR = 0.5
+
+
+class HostLimiter:
+    """Connection limit and token bucket of one host.
+
+    The counters live in shared memory, so a limiter created before the
+    worker pool starts is enforced across the parent and all worker
+    processes.
+
+    An adaptive limiter moves its connection limit between 1 and
+    ``max_connections`` with additive increase, multiplicative decrease:
+    requests reported with ``record`` are judged in windows of at least
+    ``MIN_WINDOW``, and a window whose p95 latency stays within
+    ``latency_tolerance`` times the lowest p95 seen and whose error rate
+    stays under ``MAX_ERROR_RATE`` allows one more request in flight. A
+    slow or failing window, a 429/503 or a timeout halves the limit, at
+    most once per round of requests in flight, so one burst of errors is
+    one decrease.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        rate: float,
+        burst: int,
+        adaptive: bool = False,
+        latency_tolerance: float = 2.0,
+    ):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_connections = max(max_connections, 1)
+        self.adaptive = adaptive
+        self.latency_tolerance = latency_tolerance
+        self._lock = multiprocessing.Lock()
+        self._tokens = multiprocessing.RawValue("d", float(self.burst))
+        self._updated = multiprocessing.RawValue("d", time.monotonic())
+        self._in_flight = multiprocessing.RawValue("i", 0)
+        # an adaptive limit starts halfway and finds its level from there
+        self._limit = multiprocessing.RawValue(
+            "d",
+            float(max(self.max_connections // 2, 1) if adaptive else max_connections),
+        )
+        self._peak = multiprocessing.RawValue("d", self._limit.value)
+        # latencies of the current window, its failures and the best p95
+        self._window = multiprocessing.RawArray("d", MAX_WINDOW)
+        self._window_size = multiprocessing.RawValue("i", 0)
+        self._window_errors = multiprocessing.RawValue("i", 0)
+        self._baseline = multiprocessing.RawValue("d", 0.0)
+        # requests reported since the last decrease
+        self._since_decrease = multiprocessing.RawValue("i", 0)
+
+    @property
+    def concurrency(self) -> int:
+        """Requests currently allowed in flight."""
+        return int(self._limit.value)
+
+    @property
+    def peak_concurrency(self) -> int:
+        return int(self._peak.value)
+
+    def _reserve_token(self) -> float:
+        """Take a token from the bucket.
+
+        Returns
+        -------
+        float
+            Seconds to wait before the reserved token becomes valid.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(
+                self.burst, self._tokens.value + (now - self._updated.value) * self.rate
+            )
+            # The balance may go negative, later callers then wait longer
+            self._tokens.value = tokens - 1
+            self._updated.value = now
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def _try_acquire_slot(self) -> bool:
+        with self._lock:
+            if self._in_flight.value >= int(self._limit.value):
+                return False
+            self._in_flight.value += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight.value -= 1
+
+    async def _acquire_slot(self) -> None:
+        while not self._try_acquire_slot():
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Hold a connection slot of the host for the duration of a request."""
+        await self._acquire_slot()
+        try:
+            if self.rate > 0:
+                delay = self._reserve_token()
+                if delay:
+                    await asyncio.sleep(delay)
+            yield
+        finally:
+            self._release_slot()
+
+    def record(
+        self, seconds: float, failed: bool = False, overloaded: bool = False
+    ) -> None:
+        """Adapt the connection limit to the outcome of a request.
+
+        Parameters
+        ----------
+        seconds : float
+            Time from sending the request to its response headers or error.
+        failed : bool, default False
+            The request got a 5xx response or no response at all.
+        overloaded : bool, default False
+            The host answered 429/503 or did not answer in time, which
+            decreases the limit at once.
+        """
+        if not self.adaptive:
+            return
+        with self._lock:
+            size = self._window_size.value
+            self._window[size] = seconds
+            self._window_size.value = size = size + 1
+            self._window_errors.value += failed or overloaded
+            self._since_decrease.value += 1
+            # the requests sent before the last decrease report it too
+            if overloaded and self._since_decrease.value > self._limit.value:
+                self._decrease()
+            elif size >= min(MAX_WINDOW, max(MIN_WINDOW, int(self._limit.value))):
+                self._adjust()
+
+    def _adjust(self) -> None:
+        """Judge a full window, with the lock held."""
+        size = self._window_size.value
+        p95 = sorted(self._window[:size])[int(size * 0.95) - 1]
+        baseline = self._baseline.value
+        if not baseline or p95 < baseline:
+            self._baseline.value = baseline = p95
+        if (
+            self._window_errors.value > size * MAX_ERROR_RATE
+            or p95 > baseline * self.latency_tolerance
+        ):
+            if self._limit.value <= 1:
+                # already at one request, the host is slower than it was
+                self._baseline.value = p95
+            self._decrease()
+            return
+        self._limit.value = min(self._limit.value + 1, self.max_connections)
+        self._peak.value = max(self._peak.value, self._limit.value)
+        self._window_size.value = self._window_errors.value = 0
+
+    def _decrease(self) -> None:
+        """Halve the limit and start a new window, with the lock held."""
+        self._limit.value = max(self._limit.value * DECREASE_FACTOR, 1.0)
+        self._window_size.value = self._window_errors.value = 0
+        self._since_decrease.value = 0
+
+
+class RateLimiter:
+    """Per-host limiters configured by ``Settings`` for one crawl."""
+
+    def __init__(self, settings: Settings, hosts: tuple[str, ...] = KNOWN_HOSTS):
+        self.hosts = {
+            host: HostLimiter(
+                max_connections=settings.host_max_connections,
+                rate=settings.host_rate_limit,
+                burst=settings.host_rate_burst,
+                adaptive=settings.adaptive_concurrency,
+                latency_tolerance=settings.adaptive_latency_tolerance,
+            )
+            for host in hosts
+        }
+
+    @asynccontextmanager
+    async def acquire(self, url: str):
+        """Wait until a request to ``url`` is allowed by its host limits."""
+        limiter = self.hosts.get(urlsplit(url).hostname or "")
+        if limiter is None:
+            yield
+            return
+        async with limiter.acquire():
+            yield
+
+    def record(
+        self, url: str, seconds: float, failed: bool = False, overloaded: bool = False
+    ) -> None:
+        """Report the outcome of a request to ``url`` to its host limiter."""
+        limiter = self.hosts.get(urlsplit(url).hostname or "")
+        if limiter is not None:
+            limiter.record(seconds, failed, overloaded)
+
+    def report(self) -> None:
+        """Log the connection limit every adaptive host settled on."""
+        for host, limiter in self.hosts.items():
+            if limiter.adaptive:
+                logging.info(
+                    f"{host}: settled at {limiter.concurrency} concurrent "
+                    f"requests, peak {limiter.peak_concurrency} of "
+                    f"{limiter.max_connections}"
+                )
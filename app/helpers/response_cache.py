@@ -0,0 +1,173 @@
+import multiprocessing
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.settings import Settings
+
+# Size of the cache is checked after this many stores in a process
+EVICT_EVERY = 100
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    encoding: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def validators(self) -> dict[str, str]:
+        """Headers of a conditional request revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Persistent HTTP response cache keyed by URL.
+
+    Responses are stored in a SQLite database shared by all worker processes.
+    Entries younger than ``ttl`` seconds are served without a request, older
+    ones are revalidated with ETag/Last-Modified when the server sent them.
+    When the stored bodies exceed ``max_size`` bytes the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, path: str | Path, ttl: float, max_size: int):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._stores = 0
+        # Shared with the worker processes, like the rate limiter counters
+        self._hits = multiprocessing.Value("L", 0)
+        self._misses = multiprocessing.Value("L", 0)
+        self._revalidated = multiprocessing.Value("L", 0)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResponseCache | None":
+        """Build the cache configured in ``settings`` or None if it is disabled."""
+        if not settings.cache_path:
+            return None
+        return cls(
+            path=settings.cache_path,
+            ttl=settings.cache_ttl,
+            max_size=settings.cache_max_size,
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_pid"] = None
+        return state
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # sqlite connections must not cross fork, so every process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, body BLOB NOT NULL, encoding TEXT NOT NULL, "
+                "etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                "ON responses (accessed_at)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Return the stored response of ``url`` or None."""
+        row = self.conn.execute(
+            "SELECT body, encoding, etag, last_modified, fetched_at "
+            "FROM responses WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            self._count(self._misses)
+            return None
+        return CachedResponse(*row)
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        return time.time() - cached.fetched_at < self.ttl
+
+    def hit(self, url: str) -> None:
+        """Record that a fresh stored response of ``url`` was served."""
+        self._count(self._hits)
+        self.conn.execute(
+            "UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url)
+        )
+
+    def revalidate(self, url: str) -> None:
+        """Record a 304 response, the stored body is fresh again."""
+        self._count(self._revalidated)
+        now = time.time()
+        self.conn.execute(
+            "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+            (now, now, url),
+        )
+
+    def miss(self) -> None:
+        """Record a stale entry that could not be revalidated."""
+        self._count(self._misses)
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        encoding: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store the response of ``url``."""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, body, encoding, etag, last_modified, now, now, len(body)),
+        )
+        self._stores += 1
+        if self._stores % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits ``max_size``."""
+        (total,) = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        excess = total - self.max_size
+        if excess <= 0:
+            return
+        stale = []
+        for url, size in self.conn.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        ):
+            stale.append((url,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.conn.executemany("DELETE FROM responses WHERE url = ?", stale)
+
+    def _count(self, counter) -> None:
+        with counter.get_lock():
+            counter.value += 1
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters of all processes using this cache."""
+        return {
+            "hits": self._hits.value,
+            "revalidated": self._revalidated.value,
+            "misses": self._misses.value,
+        }
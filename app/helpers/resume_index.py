@@ -0,0 +1,278 @@
+import sqlite3
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from pathlib import Path
+
+from app.helpers.dedup import normalize_city
+from app.helpers.enums import CityType, LangLevelType, LangNameType, ScheduleType
+from app.helpers.facets import (
+    EXPERIENCE_YEARS,
+    LEVEL_RANKS,
+    experience_years,
+    normalize_language,
+    normalize_schedules,
+    query_words,
+)
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_python_object import BaseResumeModel
+from app.settings import Settings
+
+LEVEL_NAMES = {rank: level.name for level, rank in LEVEL_RANKS.items()}
+# Lower bounds of the buckets of the numeric facets, 0 salary or age is unknown
+SALARY_BUCKETS = (1, 10000, 15000, 20000, 30000, 40000, 50000, 100000)
+AGE_BUCKETS = (1, 18, 25, 30, 35, 45, 55)
+EXPERIENCE_BUCKETS = (0, 1, 2, 5, 10)
+NUMERIC_FACETS = {
+    "salary_expectation": SALARY_BUCKETS,
+    "age": AGE_BUCKETS,
+    "experience_years": EXPERIENCE_BUCKETS,
+}
+TERM_FACETS = ("city", "schedule", "language", "language_level")
+
+SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS resumes ("
+        "id INTEGER PRIMARY KEY, cv_link TEXT NOT NULL UNIQUE, "
+        "salary_expectation INTEGER NOT NULL, age INTEGER NOT NULL, "
+        "experience_years REAL NOT NULL, data TEXT NOT NULL)"
+    ),
+    "CREATE INDEX IF NOT EXISTS resumes_salary ON resumes (salary_expectation)",
+    "CREATE INDEX IF NOT EXISTS resumes_age ON resumes (age)",
+    "CREATE INDEX IF NOT EXISTS resumes_experience ON resumes (experience_years)",
+    # city, schedules, languages and language levels of every resume
+    (
+        "CREATE TABLE IF NOT EXISTS terms ("
+        "resume_id INTEGER NOT NULL, facet TEXT NOT NULL, value TEXT NOT NULL)"
+    ),
+    "CREATE INDEX IF NOT EXISTS terms_value ON terms (facet, value, resume_id)",
+    "CREATE INDEX IF NOT EXISTS terms_resume ON terms (resume_id, facet, value)",
+    (
+        "CREATE TABLE IF NOT EXISTS languages ("
+        "resume_id INTEGER NOT NULL, language TEXT NOT NULL, level INTEGER NOT NULL)"
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS languages_level ON languages "
+        "(language, level, resume_id)"
+    ),
+    "CREATE INDEX IF NOT EXISTS languages_resume ON languages (resume_id)",
+    # Ukrainian words lose their letters with the default remove_diacritics
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS resume_text USING fts5("
+        "speciality, skills, experiences, tokenize='unicode61 remove_diacritics 0')"
+    ),
+)
+
+
+class ResumeIndex:
+    """Local full-text and faceted index of crawled resumes.
+
+    Resumes are kept in SQLite as their JSON next to the fields a
+    ``ResumeFilter`` narrows by: the normalized city, schedules and
+    languages with the rank of their level, salary, age and total years of
+    experience, and an FTS5 table of the speciality, skills and experience
+    text. Adding a resume with a known ``cv_link`` replaces it, so the index
+    can be fed while a crawl streams resumes in.
+
+    ``search`` answers a filter offline and ``facets`` counts the matching
+    resumes by city, schedule, language, language level and buckets of
+    salary, age and experience years. The words of the speciality and main
+    skills all have to start a word of the resume text. Education, period
+    and photo are not part of the parsed resumes and are not applied.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResumeIndex | None":
+        """Build the index configured in ``settings`` or None if it is disabled."""
+        if not settings.resume_index_path:
+            return None
+        return cls(path=settings.resume_index_path)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def add(self, resumes: Iterable[BaseResumeModel]) -> None:
+        """Index resumes, replacing earlier versions with the same link."""
+        with self.conn:
+            for resume in resumes:
+                self._add(resume)
+
+    def _add(self, resume: BaseResumeModel) -> None:
+        years = experience_years(resume.experiences)
+        (resume_id,) = self.conn.execute(
+            "INSERT INTO resumes "
+            "(cv_link, salary_expectation, age, experience_years, data) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (cv_link) DO UPDATE SET "
+            "salary_expectation = excluded.salary_expectation, "
+            "age = excluded.age, experience_years = excluded.experience_years, "
+            "data = excluded.data RETURNING id",
+            (
+                resume.cv_link,
+                resume.salary_expectation,
+                resume.age,
+                years,
+                resume.model_dump_json(),
+            ),
+        ).fetchone()
+        for table in ("terms", "languages"):
+            self.conn.execute(f"DELETE FROM {table} WHERE resume_id = ?", (resume_id,))
+        self.conn.execute("DELETE FROM resume_text WHERE rowid = ?", (resume_id,))
+
+        terms = [
+            ("schedule", schedule) for schedule in normalize_schedules(resume.schedule)
+        ]
+        if resume.city:
+            terms.append(("city", normalize_city(resume.city)))
+        languages = []
+        for language in resume.languages:
+            for name, level in language.items():
+                key, rank = normalize_language(name, level)
+                languages.append((resume_id, key, rank))
+                terms.append(("language", key))
+                if rank:
+                    terms.append(("language_level", f"{key}:{LEVEL_NAMES[rank]}"))
+        self.conn.executemany(
+            "INSERT INTO terms VALUES (?, ?, ?)",
+            [(resume_id, facet, value) for facet, value in dict.fromkeys(terms)],
+        )
+        self.conn.executemany("INSERT INTO languages VALUES (?, ?, ?)", languages)
+        experience_text = " ".join(
+            f"{ex.get('position', '')} {ex.get('company', '')} "
+            f"{ex.get('description', '')}"
+            for ex in resume.experiences
+        )
+        self.conn.execute(
+            "INSERT INTO resume_text (rowid, speciality, skills, experiences) "
+            "VALUES (?, ?, ?, ?)",
+            (resume_id, resume.speciality, resume.skills, experience_text),
+        )
+
+    async def track(
+        self, resumes: AsyncIterable[BaseResumeModel], batch_size: int = 1000
+    ) -> AsyncIterator[BaseResumeModel]:
+        """Pass resumes through unchanged while indexing them in batches."""
+        batch = []
+        try:
+            async for resume in resumes:
+                batch.append(resume)
+                if len(batch) >= batch_size:
+                    self.add(batch)
+                    batch = []
+                yield resume
+        finally:
+            self.add(batch)
+
+    def _where(self, filter_obj: ResumeFilter) -> tuple[str, list]:
+        """SQL condition on ``resumes`` selecting the resumes of a filter."""
+        conditions, params = [], []
+        if words := query_words(filter_obj):
+            conditions.append(
+                "id IN (SELECT rowid FROM resume_text WHERE resume_text MATCH ?)"
+            )
+            params.append(" ".join(f'"{word}"*' for word in words))
+        if filter_obj.city != CityType.ALL_UKRAINE.value:
+            conditions.append(
+                "id IN (SELECT resume_id FROM terms WHERE facet = 'city' AND value = ?)"
+            )
+            params.append(CityType(filter_obj.city).name)
+        if filter_obj.schedule:
+            conditions.append(
+                "id IN (SELECT resume_id FROM terms "
+                "WHERE facet = 'schedule' AND value = ?)"
+            )
+            params.append(ScheduleType(filter_obj.schedule).name)
+        for column, low, high in (
+            ("age", filter_obj.age_from, filter_obj.age_to),
+            ("salary_expectation", filter_obj.salary_from, filter_obj.salary_to),
+        ):
+            # 0 is an unknown value in a resume and no bound in a filter
+            if low or high:
+                conditions.append(f"{column} > 0")
+            if low:
+                conditions.append(f"{column} >= ?")
+                params.append(low)
+            if high:
+                conditions.append(f"{column} <= ?")
+                params.append(high)
+        if filter_obj.experience in EXPERIENCE_YEARS:
+            above, up_to = EXPERIENCE_YEARS[filter_obj.experience]
+            if above is not None:
+                conditions.append("experience_years > ?")
+                params.append(above)
+            if up_to is not None:
+                conditions.append("experience_years <= ?")
+                params.append(up_to)
+        for language, level in filter_obj.languages.items():
+            conditions.append(
+                "id IN (SELECT resume_id FROM languages "
+                "WHERE language = ? AND level >= ?)"
+            )
+            params += [LangNameType(language).name, LEVEL_RANKS[LangLevelType(level)]]
+        return " AND ".join(conditions) or "1", params
+
+    def search(
+        self, filter_obj: ResumeFilter, limit: int | None = None
+    ) -> list[BaseResumeModel]:
+        """Indexed resumes that match a filter, in the order they were added."""
+        where, params = self._where(filter_obj)
+        rows = self.conn.execute(
+            f"SELECT data FROM resumes WHERE {where} ORDER BY id LIMIT ?",
+            (*params, -1 if limit is None else limit),
+        )
+        return [BaseResumeModel.model_validate_json(data) for (data,) in rows]
+
+    def count(self, filter_obj: ResumeFilter) -> int:
+        where, params = self._where(filter_obj)
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM resumes WHERE {where}", params
+        ).fetchone()[0]
+
+    def facets(self, filter_obj: ResumeFilter) -> dict[str, dict[str, int]]:
+        """Counts of the resumes matching a filter by facet value.
+
+        Returns
+        -------
+        dict
+            For every name of ``TERM_FACETS`` and ``NUMERIC_FACETS`` the
+            number of matching resumes per value, most frequent first. The
+            numeric facets are counted per bucket labelled by its lower
+            bound, like ``"20000+"``; resumes below the first bound, with an
+            unknown (0) salary or age, are left out.
+        """
+        where, params = self._where(filter_obj)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS matched (id INTEGER PRIMARY KEY)"
+            )
+            self.conn.execute("DELETE FROM matched")
+            self.conn.execute(
+                f"INSERT INTO matched SELECT id FROM resumes WHERE {where}", params
+            )
+        facets: dict[str, dict[str, int]] = {facet: {} for facet in TERM_FACETS}
+        rows = self.conn.execute(
+            # CROSS JOIN keeps the matched resumes as the outer loop
+            "SELECT facet, value, COUNT(*) AS n FROM matched "
+            "CROSS JOIN terms ON terms.resume_id = matched.id "
+            "GROUP BY facet, value ORDER BY n DESC, value"
+        )
+        for facet, value, n in rows:
+            facets[facet][value] = n
+        for column, bounds in NUMERIC_FACETS.items():
+            # index of the last bound the value reaches
+            bucket = " + ".join(f"({column} >= {bound})" for bound in bounds[1:])
+            rows = self.conn.execute(
+                f"SELECT {bucket} AS bucket, COUNT(*) FROM matched "
+                f"CROSS JOIN resumes USING (id) WHERE {column} >= {bounds[0]} "
+                "GROUP BY bucket ORDER BY bucket"
+            )
+            facets[column] = {f"{bounds[i]}+": n for i, n in rows}
+        return facets
+
+    def close(self) -> None:
+        self.conn.close()
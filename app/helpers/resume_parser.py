@@ -0,0 +1,156 @@
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack
+
+from app.helpers.checkpoint import CrawlCheckpoint
+from app.helpers.crawl_pipeline import CrawlPipeline
+from app.helpers.custom_session import CustomSession
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.retry_queue import RetryQueue
+from app.helpers.seen_index import SeenIndex
+from app.helpers.worker_pool import FetchFunc, ResumeWorkerPool
+from app.settings import Settings
+
+
+class ResumeParser(ABC):
+    """Crawl flow shared by the resume sites.
+
+    A site parser sets ``SOURCE`` and ``fetch_func`` (a module-level
+    coroutine function the worker processes run for every resume URL) and
+    implements ``get_page_nums`` and ``get_resumes_links``; listing pages are
+    requested through ``self.session`` in the main process. A listing page
+    fetched while counting the pages can be put in ``prefetched_pages`` so
+    the crawl does not request it again.
+    """
+
+    # site name used in logs
+    SOURCE = ""
+    fetch_func: FetchFunc
+
+    def __init__(
+        self,
+        settings: Settings,
+        session: CustomSession,
+        limiter: RateLimiter | None = None,
+    ):
+        self.settings = settings
+        self.session = session
+        self.url = ""
+        # Links of listing pages fetched by get_page_nums, by page number
+        self.prefetched_pages: dict[int, list[tuple[str, str]]] = {}
+        # Shared by listing requests of this session and all worker processes
+        self.limiter = limiter or RateLimiter(settings)
+        if self.session.limiter is None:
+            self.session.limiter = self.limiter
+
+    @abstractmethod
+    async def get_page_nums(self) -> Iterable[int]:
+        """Numbers of the listing pages to crawl."""
+
+    @abstractmethod
+    async def get_resumes_links(self, page_num: int) -> list[tuple[str, str]]:
+        """Resume URLs of a listing page with their listing fingerprints."""
+
+    @property
+    def listing_concurrency(self) -> int:
+        """Listing pages requested at once during a crawl."""
+        return self.settings.listing_concurrency
+
+    async def get_page_links(self, page_num: int) -> list[tuple[str, str]]:
+        """Links of a listing page, reusing it if it was prefetched."""
+        if (links := self.prefetched_pages.pop(page_num, None)) is not None:
+            return links
+        return await self.get_resumes_links(page_num)
+
+    async def iter_resumes(
+        self,
+        pool: ResumeWorkerPool | None = None,
+        checkpoint: CrawlCheckpoint | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[BaseResumeModel | bytes]:
+        """Yield resumes one by one as soon as they are parsed.
+
+        The crawl advances only as fast as the caller consumes resumes. Close
+        the generator (e.g. with ``contextlib.aclosing``) when leaving the
+        loop early to stop the worker pool. With ``settings.incremental``
+        only new or changed resumes are fetched and yielded. Resumes that
+        fail are skipped and kept in the retry queue for the next crawl of
+        the same search.
+
+        Parameters
+        ----------
+        pool : ResumeWorkerPool, optional
+            Running pool shared with other crawls. By default the parser
+            starts its own pool for the duration of the crawl and, if the
+            session has metrics, reports them while it runs.
+        checkpoint : CrawlCheckpoint, optional
+            Saved progress of the crawl, continued if it has any.
+        raw : bool, default False
+            Yield the JSON bytes of every resume instead of a model, for
+            callers that only write them out.
+
+        Yields
+        ------
+        BaseResumeModel or bytes
+            Parsed resume.
+        """
+        logging.info(f"Sending request {self.url} to {self.SOURCE}...")
+        page_nums = await self.get_page_nums()
+        # a checkpoint saves the hashes with the output, over one connection
+        # for all the sites of the crawl
+        seen = (
+            checkpoint.seen_index(self.settings)
+            if checkpoint is not None
+            else SeenIndex.from_settings(self.settings)
+        )
+        retry = RetryQueue.from_settings(self.settings, self.SOURCE, self.url)
+        try:
+            async with AsyncExitStack() as stack:
+                if pool is None:
+                    metrics = self.session.metrics
+                    if metrics is not None:
+                        # the last report comes after the workers are done
+                        await stack.enter_async_context(
+                            metrics.reporting(self.settings)
+                        )
+                    pool = stack.enter_context(
+                        ResumeWorkerPool(self.settings, self.limiter, metrics)
+                    )
+                pipeline = CrawlPipeline(
+                    self.settings,
+                    pool,
+                    type(self).fetch_func,
+                    self.get_page_links,
+                    seen=seen,
+                    retry=retry,
+                    checkpoint=(
+                        checkpoint.for_source(self.SOURCE)
+                        if checkpoint is not None
+                        else None
+                    ),
+                    listing_concurrency=self.listing_concurrency,
+                )
+                async for resume in pipeline.iter_results(page_nums, raw):
+                    yield resume
+                if pipeline.failed or pipeline.failed_pages:
+                    logging.warning(
+                        f"{self.SOURCE}: {len(pipeline.failed)} resumes and "
+                        f"{len(pipeline.failed_pages)} listing pages failed"
+                    )
+        finally:
+            if seen is not None and checkpoint is None:
+                seen.close()
+            if retry is not None:
+                retry.close()
+
+    async def run_parser(self) -> list[BaseResumeModel] | None:
+        try:
+            res = [resume async for resume in self.iter_resumes()]
+            logging.info(f"Parsing finished\nParsed {len(res)} resumes")
+            return res
+
+        except Exception as e:
+            logging.error(e)
+            return None
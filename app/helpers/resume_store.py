@@ -0,0 +1,232 @@
+import json
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+from app.helpers.facets import experience_years
+from app.helpers.resume_python_object import BaseResumeModel
+
+# Free text, kept as one string per resume
+TEXT_COLUMNS = ("cv_link", "skills")
+# Repeated strings, kept as a code per resume into a list of distinct values
+CATEGORY_COLUMNS = (
+    "city",
+    "schedule",
+    "currency",
+    "first_name",
+    "last_name",
+    "father_name",
+    "speciality",
+)
+INT_COLUMNS = ("age", "salary_expectation", "resume_filling")
+# Lists of dicts, kept as UTF-8 JSON of their values per resume
+JSON_COLUMNS = ("educations", "experiences")
+
+
+class Categories:
+    """Distinct values of a column with the code of each one."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.values: list[Any] = []
+        self.codes: dict[Any, int] = {}
+
+    def encode(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ResumeStore:
+    """Columnar in-memory store of resumes.
+
+    A list of 100k pydantic resumes is millions of small objects: the
+    models, their field dicts and the dicts of every education, experience
+    and language. Here every scalar field is a column: numbers in typed
+    arrays, repeated strings (city, schedule, currency, names, speciality)
+    as 4-byte codes into one list of distinct values, educations and
+    experiences as UTF-8 JSON of the dict values with a code of their keys,
+    and languages as code pairs. The total
+    years of experience are kept as a column of their own for scans.
+
+    The store is a sequence of resumes, rebuilt as the model class they
+    were added as, and supports bulk scans over the columns with
+    ``column``, ``rows``, ``where`` and ``take``.
+    """
+
+    def __init__(self):
+        self.text: dict[str, list[str]] = {name: [] for name in TEXT_COLUMNS}
+        self.categories = {name: Categories() for name in CATEGORY_COLUMNS}
+        self.category_codes = {name: array("I") for name in CATEGORY_COLUMNS}
+        self.ints = {name: array("q") for name in INT_COLUMNS}
+        self.json: dict[str, list[bytes]] = {name: [] for name in JSON_COLUMNS}
+        # key tuples of the nested dicts
+        self.json_keys = Categories()
+        self.experience_years = array("d")
+        # languages of resume i are pairs lang_offsets[i]:lang_offsets[i + 1]
+        self.lang_offsets = array("I", [0])
+        self.lang_names = Categories()
+        self.lang_name_codes = array("I")
+        self.lang_levels = Categories()
+        self.lang_level_codes = array("I")
+        self.models = Categories()
+        self.model_codes = array("I")
+
+    @classmethod
+    def from_models(cls, resumes: Iterable[BaseResumeModel]) -> "ResumeStore":
+        store = cls()
+        store.extend(resumes)
+        return store
+
+    def append(self, resume: BaseResumeModel) -> None:
+        for name, column in self.text.items():
+            column.append(getattr(resume, name))
+        for name, codes in self.category_codes.items():
+            codes.append(self.categories[name].encode(getattr(resume, name)))
+        for name, column in self.ints.items():
+            column.append(getattr(resume, name))
+        for name, column in self.json.items():
+            column.append(self._pack(getattr(resume, name)))
+        self.experience_years.append(experience_years(resume.experiences))
+        for language in resume.languages:
+            for name, level in language.items():
+                self.lang_name_codes.append(self.lang_names.encode(name))
+                self.lang_level_codes.append(self.lang_levels.encode(level))
+        self.lang_offsets.append(len(self.lang_name_codes))
+        self.model_codes.append(self.models.encode(type(resume)))
+
+    def extend(self, resumes: Iterable[BaseResumeModel]) -> None:
+        for resume in resumes:
+            self.append(resume)
+
+    def __len__(self) -> int:
+        return len(self.model_codes)
+
+    def __getitem__(self, i: int) -> BaseResumeModel:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("ResumeStore index out of range")
+        values: dict[str, Any] = {name: column[i] for name, column in self.text.items()}
+        for name, codes in self.category_codes.items():
+            values[name] = self.categories[name].values[codes[i]]
+        for name, column in self.ints.items():
+            values[name] = column[i]
+        for name, column in self.json.items():
+            values[name] = self._unpack(column[i])
+        values["languages"] = [{name: level} for name, level in self.languages(i)]
+        model = self.models.values[self.model_codes[i]]
+        # the values were validated when the resume was added
+        return model.model_construct(**values)
+
+    def _pack(self, items: list[dict[str, Any]]) -> bytes:
+        if not items:
+            return b""
+        rows = [[self.json_keys.encode(tuple(item)), *item.values()] for item in items]
+        return json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def _unpack(self, data: bytes) -> list[dict[str, Any]]:
+        if not data:
+            return []
+        keys = self.json_keys.values
+        return [dict(zip(keys[row[0]], row[1:])) for row in json.loads(data)]
+
+    def __iter__(self) -> Iterator[BaseResumeModel]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def value(self, i: int, name: str) -> Any:
+        """One field of a resume without rebuilding the model."""
+        if name in self.category_codes:
+            return self.categories[name].values[self.category_codes[name][i]]
+        if name in self.json:
+            return self._unpack(self.json[name][i])
+        if name == "languages":
+            return [{lang: level} for lang, level in self.languages(i)]
+        return self.column(name)[i]
+
+    def languages(self, i: int) -> list[tuple[str, str]]:
+        """``(language, level)`` pairs of a resume."""
+        start, end = self.lang_offsets[i], self.lang_offsets[i + 1]
+        names, levels = self.lang_names.values, self.lang_levels.values
+        return [
+            (names[self.lang_name_codes[j]], levels[self.lang_level_codes[j]])
+            for j in range(start, end)
+        ]
+
+    def column(self, name: str, codes: bool = False) -> Sequence[Any]:
+        """Values of a scalar column for all resumes, in order.
+
+        With ``codes`` a category column is returned as its codes, which
+        are compared with ``code(name, value)`` without decoding anything.
+        """
+        if name in self.category_codes:
+            if codes:
+                return self.category_codes[name]
+            values = self.categories[name].values
+            return [values[code] for code in self.category_codes[name]]
+        if name in self.text:
+            return self.text[name]
+        if name == "experience_years":
+            return self.experience_years
+        return self.ints[name]
+
+    def code(self, name: str, value: Any) -> int | None:
+        """Code of a value in a category column, None if no resume has it."""
+        return self.categories[name].codes.get(value)
+
+    def rows(self, *names: str, codes: bool = False) -> Iterator[tuple]:
+        """Tuples of the given columns, one per resume."""
+        return zip(*(self.column(name, codes) for name in names))
+
+    def where(
+        self, predicate: Callable[..., bool], *names: str, codes: bool = False
+    ) -> list[int]:
+        """Indexes of the resumes whose columns ``names`` match the predicate.
+
+        Parameters
+        ----------
+        predicate : callable
+            Called with the values of ``names`` of every resume.
+        *names : str
+            Scalar columns passed to the predicate.
+        codes : bool, default False
+            Pass category columns as codes, see ``column``.
+
+        Returns
+        -------
+        list of int
+            Indexes of the matching resumes, in order.
+        """
+        rows = self.rows(*names, codes=codes)
+        return [i for i, row in enumerate(rows) if predicate(*row)]
+
+    def take(self, indexes: Iterable[int]) -> "ResumeStore":
+        """A store of the given resumes, sharing the distinct values."""
+        indexes = list(indexes)
+        store = ResumeStore()
+        store.categories = self.categories
+        store.lang_names, store.lang_levels = self.lang_names, self.lang_levels
+        store.models, store.json_keys = self.models, self.json_keys
+        for name, column in self.text.items():
+            store.text[name] = [column[i] for i in indexes]
+        for name, codes in self.category_codes.items():
+            store.category_codes[name] = array("I", (codes[i] for i in indexes))
+        for name, column in self.ints.items():
+            store.ints[name] = array("q", (column[i] for i in indexes))
+        for name, column in self.json.items():
+            store.json[name] = [column[i] for i in indexes]
+        store.experience_years = array("d", (self.experience_years[i] for i in indexes))
+        for i in indexes:
+            start, end = self.lang_offsets[i], self.lang_offsets[i + 1]
+            store.lang_name_codes.extend(self.lang_name_codes[start:end])
+            store.lang_level_codes.extend(self.lang_level_codes[start:end])
+            store.lang_offsets.append(len(store.lang_name_codes))
+        store.model_codes = array("I", (self.model_codes[i] for i in indexes))
+        return store
@@ -0,0 +1,89 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.settings import Settings
+
+
+@dataclass
+class FailedUrl:
+    """Result of a resume URL that could not be fetched or parsed."""
+
+    url: str
+    error: str
+
+
+class RetryQueue:
+    """Resume URLs of one site and search that failed, kept on disk between
+    crawls.
+
+    The next crawl of the same search on the site fetches them again before
+    its listing pages; other searches never see them, so a resume only goes
+    to the output of a search that listed it. ``search`` is the listing URL
+    of the site for the filter. A URL is dropped when it succeeds and is not
+    tried again after ``max_attempts`` failures.
+    """
+
+    def __init__(self, path: str | Path, source: str, search: str, max_attempts: int):
+        self.path = Path(path)
+        self.source = source
+        self.search = search
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(failed)")}
+        if columns and "search" not in columns:
+            # failures saved before searches were told apart
+            self.conn.execute("DROP TABLE failed")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS failed ("
+            "source TEXT NOT NULL, search TEXT NOT NULL, url TEXT NOT NULL, "
+            "error TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "failed_at REAL NOT NULL, PRIMARY KEY (source, search, url))"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, source: str, search: str
+    ) -> "RetryQueue | None":
+        """Build the queue configured in ``settings`` or None if it is disabled."""
+        if not settings.retry_queue_path:
+            return None
+        return cls(
+            path=settings.retry_queue_path,
+            source=source,
+            search=search,
+            max_attempts=settings.retry_max_attempts,
+        )
+
+    def pending(self) -> list[str]:
+        """URLs to fetch again, oldest failures first."""
+        rows = self.conn.execute(
+            "SELECT url FROM failed WHERE source = ? AND search = ? "
+            "AND attempts < ? ORDER BY failed_at",
+            (self.source, self.search, self.max_attempts),
+        )
+        return [url for (url,) in rows]
+
+    def add(self, failures: list[FailedUrl]) -> None:
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO failed VALUES (?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (source, search, url) DO UPDATE SET "
+                "error = excluded.error, attempts = attempts + 1, "
+                "failed_at = excluded.failed_at",
+                [(self.source, self.search, f.url, f.error, now) for f in failures],
+            )
+
+    def remove(self, urls: list[str]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM failed WHERE source = ? AND search = ? AND url = ?",
+                [(self.source, self.search, url) for url in urls],
+            )
+
+    def close(self) -> None:
+        self.conn.close()
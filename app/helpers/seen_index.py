@@ -0,0 +1,95 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from app.settings import Settings
+
+
+def content_hash(model: BaseModel | bytes) -> str:
+    """Hash of the parsed resume, or of its JSON, used to detect changed
+    candidates."""
+    data = model if isinstance(model, bytes) else model.model_dump_json().encode()
+    return hashlib.sha1(data).hexdigest()
+
+
+class SeenIndex:
+    """Local index of already crawled resumes for incremental crawls.
+
+    For every resume URL it keeps the fingerprint seen on the listing page,
+    the hash of the parsed resume and the time it was last fetched. Resumes
+    with an unchanged fingerprint fetched less than ``max_age`` seconds ago
+    are not fetched again.
+    """
+
+    def __init__(self, path: str | Path, max_age: float):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "url TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+            "content_hash TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SeenIndex | None":
+        """Build the index configured in ``settings`` or None if incremental
+        mode is off."""
+        if not settings.incremental:
+            return None
+        return cls(path=settings.seen_index_path, max_age=settings.seen_max_age)
+
+    def is_unchanged(self, url: str, fingerprint: str) -> bool:
+        """Whether the resume can be skipped without fetching it."""
+        row = self.conn.execute(
+            "SELECT fingerprint, fetched_at FROM seen WHERE url = ?", (url,)
+        ).fetchone()
+        return (
+            row is not None
+            and row[0] == fingerprint
+            and time.time() - row[1] < self.max_age
+        )
+
+    def changed(self, entries: list[tuple[str, str]]) -> list[bool]:
+        """Whether fetched resumes are new or their content changed.
+
+        Parameters
+        ----------
+        entries : list of tuple
+            ``(url, content_hash)`` of fetched resumes.
+
+        Returns
+        -------
+        list of bool
+            One flag per entry.
+        """
+        changed = []
+        for url, hash_ in entries:
+            row = self.conn.execute(
+                "SELECT content_hash FROM seen WHERE url = ?", (url,)
+            ).fetchone()
+            changed.append(row is None or row[0] != hash_)
+        return changed
+
+    def record(self, entries: list[tuple[str, str, str]]) -> None:
+        """Store fetched resumes as ``(url, fingerprint, content_hash)``.
+
+        The entries stay in an open transaction until ``commit``, so they
+        can be saved together with the output the resumes went to.
+        """
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO seen VALUES (?, ?, ?, ?)",
+            [(url, fp, hash_, now) for url, fp, hash_ in entries],
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,402 @@
+import csv
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, Callable, Iterator
+from pathlib import Path
+
+from app.helpers.resume_python_object import BaseResumeModel
+from app.settings import Settings
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for .zst output
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, only needed for Parquet output
+    pa = pq = None
+
+
+# Columns of every output format, in the order of BaseResumeModel fields
+FIELDS = list(BaseResumeModel.model_fields)
+NESTED_FIELDS = ("educations", "experiences", "languages")
+# bytes read at once when scanning an existing output file
+READ_SIZE = 1 << 20
+
+# A parsed resume or the bytes of its model JSON
+Resume = BaseResumeModel | bytes
+
+
+def resume_json(resume: Resume) -> bytes:
+    return resume if isinstance(resume, bytes) else resume.model_dump_json().encode()
+
+
+def resume_dict(resume: Resume) -> dict:
+    return json.loads(resume) if isinstance(resume, bytes) else resume.model_dump()
+
+
+class ResumeSink(ABC):
+    """Buffered writer of parsed resumes.
+
+    Resumes are kept in memory until ``buffer_size`` of them arrive, or
+    ``flush_interval`` seconds passed since the last write, and are then
+    written to ``path`` in one batch, so a crawl of any size runs with
+    bounded memory. ``on_flush`` is called after every batch is written.
+    Resumes can be given as models or as the JSON bytes the crawl yields
+    with ``raw=True``, which are written without building a model. An
+    existing file is replaced, or extended with ``append`` when a crawl
+    continues into it, once a batch a crash left incomplete is cut off.
+    Use it as a context manager or call ``close`` to flush the last batch.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        buffer_size: int = 1000,
+        flush_interval: float = 0,
+        append: bool = False,
+    ):
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.append = append
+        self.buffer: list[Resume] = []
+        self.written = 0
+        self.flushed_at = time.monotonic()
+        self.on_flush: Callable[[], None] | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, resume: Resume) -> None:
+        self.buffer.append(resume)
+        if len(self.buffer) >= self.buffer_size or (
+            self.flush_interval
+            and time.monotonic() - self.flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    async def consume(self, resumes: AsyncIterable[Resume]) -> int:
+        """Write resumes as they arrive and return how many were written."""
+        async for resume in resumes:
+            self.write(resume)
+        self.flush()
+        return self.written
+
+    def flush(self) -> None:
+        if self.buffer:
+            self._write_batch(self.buffer)
+            self.written += len(self.buffer)
+            self.buffer = []
+        self.flushed_at = time.monotonic()
+        if self.on_flush is not None:
+            self.on_flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abstractmethod
+    def _write_batch(self, resumes: list[Resume]) -> None:
+        """Write a batch of buffered resumes to the file."""
+
+    def _close(self) -> None:
+        pass
+
+
+class JsonlSink(ResumeSink):
+    """One JSON object per line, optionally gzip or zstd compressed.
+
+    The compression is taken from the file suffix (``.gz`` or ``.zst``).
+    Each batch is appended as a separate gzip member or zstd frame, which
+    both formats read back as one stream.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        buffer_size: int = 1000,
+        flush_interval: float = 0,
+        append: bool = False,
+    ):
+        super().__init__(path, buffer_size, flush_interval, append)
+        if self.path.suffix not in (".jsonl", ".gz", ".zst"):
+            raise ValueError(f"Unsupported JSONL compression: {self.path.suffix}")
+        if self.path.suffix == ".zst" and zstandard is None:
+            raise ValueError("zstd output requires the zstandard package")
+        if append:
+            _drop_incomplete_tail(self.path)
+        # kept open for the lifetime of the sink, closed by _close
+        self.file = open(self.path, "ab" if append else "wb")  # noqa: SIM115
+
+    def _write_batch(self, resumes: list[Resume]) -> None:
+        data = b"".join(resume_json(resume) + b"\n" for resume in resumes)
+        if self.path.suffix == ".gz":
+            data = gzip.compress(data)
+        elif self.path.suffix == ".zst":
+            data = zstandard.ZstdCompressor().compress(data)
+        self.file.write(data)
+        self.file.flush()
+
+    def _close(self) -> None:
+        self.file.close()
+
+
+class CsvSink(ResumeSink):
+    """Flat CSV file, nested lists are stored as JSON strings."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        buffer_size: int = 1000,
+        flush_interval: float = 0,
+        append: bool = False,
+    ):
+        super().__init__(path, buffer_size, flush_interval, append)
+        if append:
+            _drop_incomplete_tail(self.path)
+        # kept open for the lifetime of the sink, closed by _close
+        self.file = open(  # noqa: SIM115
+            self.path, "a" if append else "w", newline="", encoding="utf-8"
+        )
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        if self.file.tell() == 0:
+            self.writer.writeheader()
+
+    def _write_batch(self, resumes: list[Resume]) -> None:
+        rows = []
+        for resume in resumes:
+            row = resume_dict(resume)
+            for field in NESTED_FIELDS:
+                row[field] = json.dumps(row[field], ensure_ascii=False)
+            rows.append(row)
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def _close(self) -> None:
+        self.file.close()
+
+
+def _arrow_schema():
+    string, integer = pa.string(), pa.int64()
+    return pa.schema(
+        [
+            ("cv_link", string),
+            ("last_name", string),
+            ("first_name", string),
+            ("father_name", string),
+            ("age", integer),
+            ("speciality", string),
+            ("city", string),
+            ("schedule", string),
+            ("salary_expectation", integer),
+            ("currency", string),
+            ("resume_filling", integer),
+            ("skills", string),
+            (
+                "educations",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("name", string),
+                            ("comment", string),
+                            ("location", string),
+                            ("speciality", string),
+                            ("yearOfGraduation", integer),
+                        ]
+                    )
+                ),
+            ),
+            (
+                "experiences",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("position", string),
+                            ("company", string),
+                            ("description", string),
+                            ("period", pa.float64()),
+                        ]
+                    )
+                ),
+            ),
+            # every language entry is a one-item {language: level} dict
+            ("languages", pa.list_(pa.map_(string, string))),
+        ]
+    )
+
+
+class ParquetSink(ResumeSink):
+    """Columnar Parquet file with the nested lists kept as Arrow lists.
+
+    Every batch becomes a row group. Parquet files can not be appended to
+    after they are closed, so ``append`` is not supported.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        buffer_size: int = 1000,
+        flush_interval: float = 0,
+        append: bool = False,
+    ):
+        super().__init__(path, buffer_size, flush_interval, append)
+        if append:
+            raise ValueError("Parquet output can not be appended to")
+        if pa is None:
+            raise ValueError("Parquet output requires the pyarrow package")
+        self.schema = _arrow_schema()
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+    def _write_batch(self, resumes: list[Resume]) -> None:
+        rows = []
+        for resume in resumes:
+            row = resume_dict(resume)
+            row["languages"] = [list(lang.items()) for lang in row["languages"]]
+            rows.append(row)
+        self.writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def _close(self) -> None:
+        self.writer.close()
+
+
+def _jsonl_batches(path: Path) -> Iterator[tuple[int, bytes]]:
+    """Complete batches of a JSONL output file with the offset each ends at.
+
+    A gzip member or zstd frame cut off by a crash is not yielded, nor is a
+    last line without its newline in plain JSONL. Undecodable data before
+    the end of the file raises ``ValueError``.
+    """
+    if path.suffix == ".zst" and zstandard is None:
+        raise ValueError("zstd output requires the zstandard package")
+    end = 0
+    with open(path, "rb") as file:
+        if path.suffix == ".jsonl":
+            rest = b""
+            while chunk := file.read(READ_SIZE):
+                data = rest + chunk
+                lines = data.rfind(b"\n") + 1
+                rest = data[lines:]
+                if lines:
+                    end += lines
+                    yield end, data[:lines]
+            return
+        errors: tuple[type[Exception], ...] = (zlib.error,)
+        if zstandard is not None:
+            errors += (zstandard.ZstdError,)
+        decompressor, fed, out = None, 0, []
+        while chunk := file.read(READ_SIZE):
+            while chunk:
+                if decompressor is None:
+                    decompressor = (
+                        zlib.decompressobj(wbits=31)
+                        if path.suffix == ".gz"
+                        else zstandard.ZstdDecompressor().decompressobj()
+                    )
+                    fed, out = 0, []
+                fed += len(chunk)
+                try:
+                    out.append(decompressor.decompress(chunk))
+                except errors as e:
+                    raise ValueError(f"{path} is corrupt after byte {end}: {e}") from e
+                if not decompressor.eof:
+                    break
+                chunk = decompressor.unused_data
+                end += fed - len(chunk)
+                decompressor = None
+                yield end, b"".join(out)
+
+
+def _csv_rows(path: Path) -> Iterator[tuple[int, list[str]]]:
+    """Complete rows of a CSV output file, the header first, with the offset
+    each ends at.
+
+    A row cut off by a crash lacks fields or its line break: the last
+    column holds JSON, which never contains a raw line break.
+    """
+    end, line = 0, ""
+
+    def lines() -> Iterator[str]:
+        nonlocal end, line
+        for line in file:
+            end += len(line.encode("utf-8", "surrogateescape"))
+            yield line
+
+    with open(path, newline="", encoding="utf-8", errors="surrogateescape") as file:
+        for row in csv.reader(lines()):
+            if len(row) == len(FIELDS) and line.endswith("\n"):
+                yield end, row
+
+
+def _drop_incomplete_tail(path: Path) -> None:
+    """Cut an output file back to the end of its last complete batch or row,
+    so data appended after a crash does not follow a broken one."""
+    if not path.exists():
+        return
+    batches = _csv_rows(path) if path.suffix == ".csv" else _jsonl_batches(path)
+    size = 0
+    for size, _ in batches:
+        pass
+    if (extra := path.stat().st_size - size) > 0:
+        logging.warning(f"Dropped {extra} bytes cut off at the end of {path}")
+        os.truncate(path, size)
+
+
+def read_links(path: str | Path) -> set[str]:
+    """``cv_link`` of the resumes already in a JSONL or CSV output file.
+
+    A missing file has none. Only complete batches and rows are read, those
+    an appending sink keeps; a line that is not a resume is skipped.
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    if path.suffix == ".csv":
+        rows = _csv_rows(path)
+        next(rows, None)  # the header
+        column = FIELDS.index("cv_link")
+        return {row[column] for _, row in rows if row[column]}
+    links = set()
+    for _, batch in _jsonl_batches(path):
+        for line in batch.splitlines():
+            try:
+                links.add(json.loads(line)["cv_link"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return links
+
+
+def open_sink(path: str | Path, settings: Settings, append: bool = False) -> ResumeSink:
+    """Open the sink matching the suffix of ``path``.
+
+    Supported files are ``.jsonl``, ``.jsonl.gz``, ``.jsonl.zst``, ``.csv``
+    and ``.parquet``. An existing file is replaced unless ``append`` is set,
+    which Parquet does not support; appending first cuts off a last batch or
+    row left incomplete by a crash.
+    """
+    suffixes = Path(path).suffixes
+    if ".jsonl" in suffixes[-2:]:
+        sink = JsonlSink
+    elif suffixes[-1:] == [".csv"]:
+        sink = CsvSink
+    elif suffixes[-1:] == [".parquet"]:
+        sink = ParquetSink
+    else:
+        raise ValueError(f"Unsupported output file: {path}")
+    return sink(
+        path,
+        buffer_size=settings.output_buffer_size,
+        flush_interval=settings.output_flush_interval,
+        append=append,
+    )
@@ -0,0 +1,180 @@
+from collections.abc import Callable, Iterable
+
+from app.helpers.dedup import normalize_city, words
+from app.helpers.enums import CityType, LangLevelType, LangNameType, ScheduleType
+from app.helpers.facets import (
+    EXPERIENCE_YEARS,
+    LEVEL_RANKS,
+    normalize_language,
+    normalize_schedules,
+    query_words,
+)
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_store import Categories, ResumeStore
+
+
+class StoreFilter:
+    """Evaluates ``ResumeFilter``s exactly against the resumes of a store.
+
+    The site query strings only approximate a filter: work.ua has a few
+    salary and experience steps and no way to ask for the total years.
+    Here a filter is applied to the columns of a ``ResumeStore`` with the
+    semantics of ``ResumeIndex``, so one broad crawl can be narrowed by many
+    filters without asking the sites again. ``main.py --offline --batch``
+    loads the indexed resumes into a store once and selects every filter
+    of the batch from it.
+
+    Each condition is a list comprehension over the column it needs that
+    only looks at the resumes passing the earlier, cheaper ones. City,
+    schedule and languages are normalized once per distinct value, not per
+    resume, and compared as codes. Text is checked last: a substring test on the raw
+    columns rules most resumes out before their words are taken.
+    """
+
+    def __init__(self, store: ResumeStore):
+        self.store = store
+        # normalized value per category code, extended as the store grows
+        self.city_keys: list[str] = []
+        self.schedule_keys: list[list[str]] = []
+        self.language_keys: list[tuple[str, int]] = []
+        self.level_ranks: list[int] = []
+        self.speciality_text: list[str] = []
+
+    @staticmethod
+    def _extend(cache: list, categories: Categories, normalize: Callable) -> list:
+        for value in categories.values[len(cache) :]:
+            cache.append(normalize(value))
+        return cache
+
+    def _codes(
+        self, name: str, cache: list, normalize: Callable, accept: Callable
+    ) -> set[int]:
+        """Codes of a category column whose normalized value is accepted."""
+        keys = self._extend(cache, self.store.categories[name], normalize)
+        return {code for code, key in enumerate(keys) if accept(key)}
+
+    def select(
+        self, filter_obj: ResumeFilter, indexes: Iterable[int] | None = None
+    ) -> list[int]:
+        """Indexes of the resumes that match a filter.
+
+        Parameters
+        ----------
+        filter_obj : ResumeFilter
+            The filter; education, period and photo are not part of the
+            stored resumes and are not applied.
+        indexes : iterable of int, optional
+            Resumes to look at, all of them by default.
+
+        Returns
+        -------
+        list of int
+            Indexes of the matching resumes, in the order they were given.
+        """
+        store = self.store
+        selected = list(range(len(store)) if indexes is None else indexes)
+
+        if filter_obj.city != CityType.ALL_UKRAINE.value:
+            city = CityType(filter_obj.city).name
+            codes = self._codes(
+                "city", self.city_keys, normalize_city, lambda key: key == city
+            )
+            column = store.category_codes["city"]
+            selected = [i for i in selected if column[i] in codes]
+        if filter_obj.schedule:
+            schedule = ScheduleType(filter_obj.schedule).name
+            codes = self._codes(
+                "schedule",
+                self.schedule_keys,
+                normalize_schedules,
+                lambda keys: schedule in keys,
+            )
+            column = store.category_codes["schedule"]
+            selected = [i for i in selected if column[i] in codes]
+
+        for name, low, high in (
+            ("age", filter_obj.age_from, filter_obj.age_to),
+            ("salary_expectation", filter_obj.salary_from, filter_obj.salary_to),
+        ):
+            column = store.ints[name]
+            # 0 is an unknown value in a resume and no bound in a filter
+            if low or high:
+                low = max(low, 1)
+                high = high or float("inf")
+                selected = [i for i in selected if low <= column[i] <= high]
+        if filter_obj.experience in EXPERIENCE_YEARS:
+            above, up_to = EXPERIENCE_YEARS[filter_obj.experience]
+            above = float("-inf") if above is None else above
+            up_to = float("inf") if up_to is None else up_to
+            column = store.experience_years
+            selected = [i for i in selected if above < column[i] <= up_to]
+
+        if filter_obj.languages:
+            selected = self._select_languages(filter_obj.languages, selected)
+        if query := query_words(filter_obj):
+            selected = self._select_words(query, selected)
+        return selected
+
+    def _select_languages(
+        self, languages: dict[int, int], selected: list[int]
+    ) -> list[int]:
+        store = self.store
+        keys = self._extend(
+            self.language_keys,
+            store.lang_names,
+            lambda name: normalize_language(name, "")[0],
+        )
+        ranks = self._extend(
+            self.level_ranks,
+            store.lang_levels,
+            lambda level: normalize_language("", level)[1],
+        )
+        for language, level in languages.items():
+            language = LangNameType(language).name
+            names = {code for code, key in enumerate(keys) if key == language}
+            levels = {
+                code
+                for code, rank in enumerate(ranks)
+                if rank >= LEVEL_RANKS[LangLevelType(level)]
+            }
+            offsets = store.lang_offsets
+            name_codes, level_codes = store.lang_name_codes, store.lang_level_codes
+            selected = [
+                i
+                for i in selected
+                if any(
+                    name_codes[j] in names and level_codes[j] in levels
+                    for j in range(offsets[i], offsets[i + 1])
+                )
+            ]
+        return selected
+
+    def _select_words(self, query: list[str], selected: list[int]) -> list[int]:
+        """Resumes with a word starting with every query word."""
+        store = self.store
+        speciality = self._extend(
+            self.speciality_text, store.categories["speciality"], str.lower
+        )
+        speciality_codes = store.category_codes["speciality"]
+        skills, experiences = store.text["skills"], store.json["experiences"]
+        found = []
+        for i in selected:
+            # every word of a field is in its JSON as is, so a missing
+            # substring rules the resume out without splitting anything
+            text = " ".join(
+                (
+                    speciality[speciality_codes[i]],
+                    skills[i].lower(),
+                    experiences[i].decode().lower(),
+                )
+            )
+            if not all(word in text for word in query):
+                continue
+            tokens = words(
+                store.value(i, "speciality"),
+                skills[i],
+                store.value(i, "experiences"),
+            )
+            if all(any(token.startswith(word) for token in tokens) for word in query):
+                found.append(i)
+        return found
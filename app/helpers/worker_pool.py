@@ -0,0 +1,224 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from multiprocessing import Pool
+from multiprocessing.util import Finalize
+from typing import Any, Self
+
+from pydantic import BaseModel
+
+from app.helpers.custom_session import CustomSession
+from app.helpers.metrics import CrawlMetrics
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.response_cache import ResponseCache
+from app.helpers.retry_queue import FailedUrl
+from app.settings import Settings
+
+FetchFunc = Callable[[str, CustomSession, Settings], Awaitable[Any]]
+
+# Per-process state, created once by the pool initializer and reused by every
+# task the worker receives during the crawl.
+_loop: asyncio.AbstractEventLoop | None = None
+_session: CustomSession | None = None
+_settings: Settings | None = None
+
+
+def _init_worker(
+    settings: Settings,
+    limiter: RateLimiter | None,
+    cache: ResponseCache | None,
+    metrics: CrawlMetrics | None,
+) -> None:
+    """Create the event loop and the aiohttp session of a worker process."""
+    global _loop, _session, _settings
+    _settings = settings
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _session = _loop.run_until_complete(
+        _create_session(settings, limiter, cache, metrics)
+    )
+    Finalize(None, _close_worker, exitpriority=10)
+
+
+async def _create_session(
+    settings: Settings,
+    limiter: RateLimiter | None,
+    cache: ResponseCache | None,
+    metrics: CrawlMetrics | None,
+) -> CustomSession:
+    # aiohttp binds the session to the running loop, so build it inside one
+    return CustomSession.from_settings(
+        settings,
+        limiter=limiter,
+        max_connections=settings.process_max_connections,
+        cache=cache,
+        metrics=metrics,
+    )
+
+
+def _close_worker() -> None:
+    """Close the worker session and loop when the process shuts down."""
+    global _loop, _session
+    if _loop is None:
+        return
+    if _session is not None:
+        _loop.run_until_complete(_session.close())
+        _session = None
+    _loop.close()
+    _loop = None
+
+
+def _run_chunk(args: tuple[FetchFunc, list[str]]) -> list[Any]:
+    """Fetch and parse a chunk of URLs on the worker's persistent loop."""
+    fetch_func, urls = args
+    return _loop.run_until_complete(_process_urls(fetch_func, urls))
+
+
+async def _process_urls(fetch_func: FetchFunc, urls: list[str]) -> list[Any]:
+    # One bad URL must not lose the rest of the chunk, failures come back as
+    # FailedUrl since exceptions are not always picklable. Models are sent as
+    # their JSON, which pickles as a plain copy of bytes.
+    tasks = [fetch_func(url, _session, _settings) for url in urls]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return [
+        FailedUrl(url, f"{type(res).__name__}: {res}")
+        if isinstance(res, Exception)
+        else res.model_dump_json().encode()
+        if isinstance(res, BaseModel)
+        else res
+        for url, res in zip(urls, results)
+    ]
+
+
+class ResumeWorkerPool:
+    """A process pool that lives for the whole crawl.
+
+    Every worker keeps its own event loop and ``CustomSession`` between tasks,
+    so bs4/lxml/pydantic are imported and connections are opened only once
+    per process instead of once per listing page. The ``limiter`` is shared
+    with the workers, so its host limits hold across all processes, and so are
+    the response cache configured in ``settings`` and the ``metrics``.
+    Pydantic models returned by a fetch function come back as the bytes of
+    their JSON, so the parent decides when, if ever, to rebuild them.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        limiter: RateLimiter | None = None,
+        metrics: CrawlMetrics | None = None,
+    ):
+        self.settings = settings
+        self.limiter = limiter
+        self.metrics = metrics
+        self.cache = ResponseCache.from_settings(settings)
+        self._pool = None
+
+    def __enter__(self) -> Self:
+        self._pool = Pool(
+            processes=self.settings.processes_count,
+            initializer=_init_worker,
+            initargs=(self.settings, self.limiter, self.cache, self.metrics),
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            # Let workers finish and run their finalizers (session close)
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+        if self.cache is not None:
+            logging.info(f"Response cache: {self.cache.stats()}")
+
+    def split_urls(self, urls: list[str]) -> list[list[str]]:
+        """Split a list of URLs into one chunk per worker process.
+
+        Parameters
+        ----------
+        urls : list of str
+            List of URLs to split.
+
+        Returns
+        -------
+        list of list of str
+            A list containing the split chunks of URLs.
+        """
+        chunk_len = (
+            len(urls) + self.settings.processes_count - 1
+        ) // self.settings.processes_count
+        return (
+            [urls[i : i + chunk_len] for i in range(0, len(urls), chunk_len)]
+            if chunk_len
+            else []
+        )
+
+    def map_urls(self, fetch_func: FetchFunc, urls: list[str]) -> list[Any]:
+        """Fetch and parse URLs across the worker processes.
+
+        Parameters
+        ----------
+        fetch_func : callable
+            Module-level coroutine function ``(url, session, settings)`` that
+            fetches one URL and returns the parsed model.
+        urls : list of str
+            List of URLs to fetch data from.
+
+        Returns
+        -------
+        list
+            Combined list of parsed data from all processes, with a
+            ``FailedUrl`` in place of every URL that failed and the JSON
+            bytes in place of every model.
+        """
+        if self._pool is None:
+            raise RuntimeError("ResumeWorkerPool is not started")
+        results = self._pool.map(
+            _run_chunk,
+            [(fetch_func, url_group) for url_group in self.split_urls(urls)],
+        )
+        res = []
+        for url_group in results:
+            res.extend(url_group)
+        return res
+
+    def submit(self, fetch_func: FetchFunc, urls: list[str]) -> asyncio.Future:
+        """Schedule one chunk of URLs on the pool without blocking the loop.
+
+        Parameters
+        ----------
+        fetch_func : callable
+            Module-level coroutine function ``(url, session, settings)``.
+        urls : list of str
+            Chunk of URLs processed by a single worker.
+
+        Returns
+        -------
+        asyncio.Future
+            Future resolved with the list of parsed results of the chunk,
+            failed URLs are returned as ``FailedUrl`` and models as their
+            JSON bytes.
+        """
+        if self._pool is None:
+            raise RuntimeError("ResumeWorkerPool is not started")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_result(result):
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exc):
+            if not future.done():
+                future.set_exception(exc)
+
+        # Pool callbacks run in the pool's result handler thread
+        self._pool.apply_async(
+            _run_chunk,
+            ((fetch_func, urls),),
+            callback=lambda res: loop.call_soon_threadsafe(set_result, res),
+            error_callback=lambda exc: loop.call_soon_threadsafe(set_exception, exc),
+        )
+        return future
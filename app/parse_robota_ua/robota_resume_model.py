@@ -1,11 +1,15 @@
 from datetime import datetime
 from pydantic import model_validator, field_validator
-from bs4 import BeautifulSoup
 
+from app.helpers.html_text import html_to_text
 from app.helpers.resume_python_object import BaseResumeModel
 from app.helpers.enums import CityType, ScheduleType, LangNameType, LangLevelType
 
 
+# robota.ua has cities CityType does not know, they are stored without one
+CITY_IDS = frozenset(city.value for city in CityType)
+
+
 class RobotaResumeModel(BaseResumeModel):
     @field_validator("age", mode="before")
     def parse_age(cls, value):
@@ -19,7 +23,7 @@ class RobotaResumeModel(BaseResumeModel):
     def clean_skills(cls, value):
         if isinstance(value, list) and value:
             skill = value[0].get("description", "")
-            return BeautifulSoup(skill, "html.parser").text
+            return html_to_text(skill)
         return ""
 
     @model_validator(mode="before")
@@ -35,7 +39,7 @@ class RobotaResumeModel(BaseResumeModel):
         )
         values["city"] = (
             str(CityType(values["cityId"]))
-            if values["cityId"] in CityType.__members__.values()
+            if values["cityId"] in CITY_IDS
             else ""
         )
         values["schedule"] = str(ScheduleType(values["scheduleId"]))
@@ -47,7 +51,7 @@ class RobotaResumeModel(BaseResumeModel):
             values["languages"].append({language: language_lvl})
         temp = list()
         for ed in values.get("educations", []):
-            comment = BeautifulSoup(ed["comment"], "html.parser").text
+            comment = html_to_text(ed["comment"])
             temp.append(
                 {
                     "name": ed["name"],
@@ -67,7 +71,7 @@ class RobotaResumeModel(BaseResumeModel):
                 else datetime.now(),
             )
             rounded_years = round((end_work - start_work).days / 365.25, 1)
-            desc = BeautifulSoup(ex["description"], "html.parser").text
+            desc = html_to_text(ex["description"])
             temp.append(
                 {
                     "position": ex["position"],
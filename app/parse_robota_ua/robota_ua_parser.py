@@ -1,24 +1,53 @@
+import hashlib
+import json
 import logging
 
-from aiohttp import ClientError
-import asyncio
-from multiprocessing import Pool
+from contextlib import nullcontext
 from typing import Any
 
 from app.helpers.custom_session import CustomSession
+from app.helpers.rate_limiter import RateLimiter
 from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_parser import ResumeParser
 from app.settings import Settings
 from app.parse_robota_ua.robota_resume_model import RobotaResumeModel
 from app.parse_robota_ua.get_link import get_robota_link
 
 
-class RobotaUaParser:
+async def fetch_and_parse(
+    url: str, session: CustomSession, settings: Settings
+) -> RobotaResumeModel:
+    """Fetch json with resume data and parse it"""
+    res = await session.fetch_json(url)
+    with (
+        session.metrics.timer('resume_parse_seconds{site="robota.ua"}')
+        if session.metrics is not None
+        else nullcontext()
+    ):
+        model = RobotaResumeModel(**res)
+    if isinstance(model, RobotaResumeModel):
+        logging.debug(f"Parse {url}")
+    else:
+        raise ValueError(f"Resume {url} didn`t parse: {model}")
+    return model
+
+
+class RobotaUaParser(ResumeParser):
+    SOURCE = "robota.ua api"
+    API_URL = "https://employer-api.robota.ua"
+    # resumes asked for per API page, the API may return fewer
+    PAGE_SIZE = 100
+    fetch_func = fetch_and_parse
+
     def __init__(
-        self, filter_obj: ResumeFilter, settings: Settings, session: CustomSession
+        self,
+        filter_obj: ResumeFilter,
+        settings: Settings,
+        session: CustomSession,
+        limiter: RateLimiter | None = None,
     ):
+        super().__init__(settings, session, limiter)
         self.url = get_robota_link(filter_obj)
-        self.settings = settings
-        self.session = session
 
     async def get_resumes_page(self, request_link) -> dict[str, Any]:
         """Retrieve a page of resumes from the employer API.
@@ -34,37 +63,26 @@ class RobotaUaParser:
         dict
             The JSON response from the API containing the resumes and related data.
         """
-        async with self.session.get(request_link) as response:
-            if not response.ok:
-                raise ClientError(
-                    f"get_resumes_page: {response.status}: {response.reason}"
-                )
-            res = await response.json()
-        return res
-
-    async def get_page_count(self, request_link) -> int:
+        return await self.session.fetch_json(request_link, use_cache=False)
+
+    async def get_page_count(self) -> int:
         """Retrieve a page count.
 
-        Parameters
-        ----------
-        request_data : dict
-            A dictionary containing the request parameters for fetching resumes,
-            structured according to the API specifications.
+        The first page is requested with the largest page size and kept in
+        ``prefetched_pages``, and the page size the API actually used gives
+        the number of pages.
 
         Returns
         -------
         int
             Number of resume pages found using special filters.
         """
-        async with self.session.get(request_link) as response:
-            if not response.ok:
-                raise ClientError(
-                    f"get_page_count: {response.status}: {response.reason}"
-                )
-            res = await response.json()
+        res = await self.get_resumes_page(self.page_url(0))
         total = res["total"]
         if total:
-            page_count = (total + 19) // 20
+            self.prefetched_pages[0] = self.parse_links(res)
+            page_size = len(res["documents"]) or self.PAGE_SIZE
+            page_count = (total + page_size - 1) // page_size
             if page_count:
                 logging.info(f"Found {total} resumes|{page_count} pages")
                 return page_count
@@ -74,113 +92,41 @@ class RobotaUaParser:
         else:
             raise ValueError("get_page_count: Resumes not found")
 
-    async def run_parser(self) -> list[RobotaResumeModel] | None:
-        try:
-            logging.info(f"Sending request {self.url} to robota.ua api...")
-            page_count = await self.get_page_count(self.url)
-            results = []
-            for page_num in range(page_count):
-                logging.info(f"Parsing {page_num+1} page...")
-                url = f"{self.url}&page={str(page_num)}"
-                resumes_page = await self.get_resumes_page(url)
-                resumes_links = []
-
-                for document in resumes_page["documents"]:
-                    resumes_links.append(
-                        f"https://employer-api.robota.ua/resume/{document['resumeId']}"
-                    )
-
-                results.append(
-                    self.get_resumes_data_from_urls(resumes_urls=resumes_links)
-                )
-            res = []
-            for url_group in results:
-                res.extend(url_group)
-            logging.info(f"Parsing finished\nParsed {len(res)} resumes")
-            return res
-
-        except Exception as e:
-            logging.error(e)
-            return None
-
-    def get_resumes_data_from_urls(
-        self, resumes_urls: list[str]
-    ) -> list[RobotaResumeModel]:
-        """Retrieve product data from a list of URLs using multiple processes.
-
-        Parameters
-        ----------
-        resumes_urls : list of str
-            List of resumes URLs to fetch data from.
-
-        Returns
-        -------
-        list
-            Combined list of parsed resumes data from all processes.
-        """
-        url_groups = self.split_urls(urls=resumes_urls)
+    def page_url(self, page_num: int) -> str:
+        return f"{self.url}&count={self.PAGE_SIZE}&page={page_num}"
 
-        with Pool(processes=self.settings.processes_count) as pool:
-            results = pool.map(
-                process_wrapper,
-                [(url_group, self.settings) for url_group in url_groups],
+    def parse_links(self, resumes_page: dict[str, Any]) -> list[tuple[str, str]]:
+        """Resume URLs of an API response with their listing fingerprints."""
+        return [
+            (
+                f"{self.API_URL}/resume/{document['resumeId']}",
+                hashlib.sha1(json.dumps(document, sort_keys=True).encode()).hexdigest(),
             )
+            for document in resumes_page["documents"]
+        ]
 
-        res = []
-        for url_group in results:
-            res.extend(url_group)
-        return res
-
-    def split_urls(self, urls: list[str]):
-        """Split a list of URLs into smaller chunks.
+    async def get_resumes_links(self, page_num: int) -> list[tuple[str, str]]:
+        """Retrieve resume URLs listed on one page of the API response.
 
         Parameters
         ----------
-        urls : list of str
-            List of URLs to split.
+        page_num : int
+            Number of the page, starting from 0.
 
         Returns
         -------
-        list of list of str
-            A list containing the split chunks of URLs.
+        list of tuple of str
+            URLs of the resumes in the employer API with a fingerprint of
+            their listing documents.
         """
-        chunk_len = (
-            len(urls) + self.settings.processes_count - 1
-        ) // self.settings.processes_count
-        return (
-            [urls[i : i + chunk_len] for i in range(0, len(urls), chunk_len)]
-            if chunk_len
-            else []
-        )
-
-
-def process_wrapper(args) -> list[RobotaResumeModel]:
-    """Wrapper to run asyncio tasks within a process."""
-    urls, settings = args
-    return asyncio.run(process_urls(urls, settings))
-
-
-async def process_urls(urls: list[str], settings: Settings) -> list[RobotaResumeModel]:
-    """Asynchronously fetch and parse resumes in a given set of URLs."""
-    async with CustomSession() as session:
-        tasks = [fetch_and_parse(url, session, settings) for url in urls]
-        return await asyncio.gather(*tasks)
+        return self.parse_links(await self.get_resumes_page(self.page_url(page_num)))
 
+    @property
+    def listing_concurrency(self) -> int:
+        # JSON pages are cheap, request as many as the host limits allow
+        return max(
+            self.settings.listing_concurrency, self.settings.host_max_connections
+        )
 
-async def fetch_and_parse(
-    url: str, session: CustomSession, settings: Settings
-) -> RobotaResumeModel:
-    """Fetch json with resume data and parse it"""
-    async with asyncio.Semaphore(settings.process_max_connections):
-        async with session.get(url) as response:
-            if not response.ok:
-                raise ClientError(
-                    f"fetch_and_parse: {response.status}: {response.reason}"
-                )
-            res = await response.json()
-    model = RobotaResumeModel(**res)
-    if isinstance(model, RobotaResumeModel):
-        logging.info(f"Parse {url}")
-    else:
-        raise ValueError(f"Resume {url} didn`t parse: {model}")
-    return model
+    async def get_page_nums(self) -> range:
+        return range(await self.get_page_count())
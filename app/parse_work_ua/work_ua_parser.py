@@ -1,13 +1,13 @@
 import logging
+from contextlib import nullcontext
 
-from aiohttp import ClientError
-import asyncio
-from multiprocessing import Pool
 from typing import Any
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from app.helpers.custom_session import CustomSession
+from app.helpers.rate_limiter import RateLimiter
 from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_parser import ResumeParser
 from app.helpers.enums import (
     CityType,
     LangNameType,
@@ -23,18 +23,116 @@ from app.settings import Settings
 from app.parse_work_ua.work_resume_model import WorkResumeModel
 
 
-class WorkUaParser:
+async def fetch_and_parse(
+    url: str, session: CustomSession, settings: Settings
+) -> WorkResumeModel:
+    """Fetch json with resume data and parse it"""
+    html = await session.fetch_text(url)
+    from_html = (
+        WorkResumeModel.from_html_lxml
+        if settings.work_html_parser == "lxml"
+        else WorkResumeModel.from_html
+    )
+    timer = (
+        session.metrics.timer('resume_parse_seconds{site="work.ua"}')
+        if session.metrics is not None
+        else nullcontext()
+    )
+    try:
+        with timer:
+            model = from_html(html)
+        logging.debug(f"Parsed {url}")
+        return model
+    except Exception as e:
+        raise ValueError(f"fetch_and_parse - error at parsing {url}: {e}")
+
+
+# Ancestors of the resume count header as (tag, id, classes), a None tag
+# or id matches any, the path of the selector the parser used to have
+TOTAL_PATH = (
+    (None, "pjax", ()),
+    ("div", None, ()),
+    ("div", None, ("row",)),
+    ("div", None, ("col-md-8",)),
+    ("div", None, ("flex", "flex-justify-between", "flex-align-flex-start")),
+    ("div", None, ("mt-8", "text-default-7")),
+)
+
+
+class _ListingTarget:
+    """lxml parser target that picks the resume count and the resume links
+    of a search page from the parse events without building a tree."""
+
+    def __init__(self):
+        # (tag, id, classes) of the open elements
+        self.stack: list[tuple[str, str, list[str]]] = []
+        self.links: list[str] = []
+        self.total: str | None = None
+        self.total_parts: list[str] | None = None
+
+    def start(self, tag: str, attrib) -> None:
+        parent, _, parent_classes = self.stack[-1] if self.stack else ("", "", [])
+        if tag == "a" and parent == "h2" and "mt-0" in parent_classes:
+            if href := attrib.get("href"):
+                self.links.append(href)
+        elif tag == "h1" and self.total is None and self._in_total_path():
+            self.total_parts = []
+        self.stack.append((tag, attrib.get("id", ""), attrib.get("class", "").split()))
+
+    def _in_total_path(self) -> bool:
+        if len(self.stack) < len(TOTAL_PATH):
+            return False
+        return all(
+            (tag is None or tag == open_tag)
+            and (id_ is None or id_ == open_id)
+            and all(name in open_classes for name in classes)
+            for (tag, id_, classes), (open_tag, open_id, open_classes) in zip(
+                TOTAL_PATH, self.stack[-len(TOTAL_PATH) :]
+            )
+        )
+
+    def end(self, tag: str) -> None:
+        while self.stack and self.stack.pop()[0] != tag:
+            pass
+        if tag == "h1" and self.total_parts is not None:
+            self.total = "".join(self.total_parts)
+            self.total_parts = None
+
+    def data(self, data: str) -> None:
+        if self.total_parts is not None:
+            self.total_parts.append(data)
+
+    def close(self) -> "_ListingTarget":
+        return self
+
+
+def parse_listing(html: str) -> tuple[str | None, list[str]]:
+    """Text of the resume count header and the resume hrefs of a search page.
+
+    The same elements as the full-path count header selector and
+    ``h2.mt-0 > a``, found while lxml tokenizes the page.
+    """
+    target = etree.fromstring(html, etree.HTMLParser(target=_ListingTarget()))
+    return target.total, target.links
+
+
+class WorkUaParser(ResumeParser):
+    SOURCE = "work.ua"
     PER_PAGE = 14
     BASE_URL = "https://www.work.ua"
     RESUMES_URL = "https://www.work.ua/resumes"
+    fetch_func = fetch_and_parse
 
     def __init__(
-        self, filter_obj: ResumeFilter, settings: Settings, session: CustomSession
+        self,
+        filter_obj: ResumeFilter,
+        settings: Settings,
+        session: CustomSession,
+        limiter: RateLimiter | None = None,
     ):
+        super().__init__(settings, session, limiter)
         self.filter_obj = filter_obj
         self.url = self.get_work_link()
-        self.settings = settings
-        self.session = session
 
     def get_work_link(self) -> str:
         """Returns a formatted string for request to work ua"""
@@ -106,42 +204,26 @@ class WorkUaParser:
         dict
             The JSON response from the API containing the resumes and related data.
         """
-        async with self.session.get(request_link) as response:
-            if not response.ok:
-                raise ClientError(
-                    f"get_resumes_page: {response.status}: {response.reason}"
-                )
-            res = await response.text()
-        return res
+        return await self.session.fetch_text(request_link, use_cache=False)
 
     async def get_page_count(self) -> int:
         """Retrieve a page count.
 
-        Parameters
-        ----------
-        request_data : dict
-            A dictionary containing the request parameters for fetching resumes,
-            structured according to the API specifications.
+        The search page is the first listing page as well, so its links are
+        kept in ``prefetched_pages``.
 
         Returns
         -------
         int
             Number of resume pages found using special filters.
         """
-        async with self.session.get(self.url) as response:
-            if not response.ok:
-                raise ClientError(
-                    f"get_page_count: {response.status}: {response.reason}"
-                )
-            res = await response.text()
-        soup = BeautifulSoup(res, "lxml")
-        total = soup.select_one(
-            selector=(
-                "#pjax > div > div.row > div.col-md-8 > div.flex.flex-justify-between.flex-align-flex-start "
-                "> div.mt-8.text-default-7 > h1"
-            )
-        )
-        total = int(total.text.strip().split(" ")[0])
+        res = await self.get_resumes_page(self.url)
+        total, links = parse_listing(res)
+        if total is None:
+            raise ValueError("get_page_count: Resumes not found")
+        # the search URL without a page number is the first page
+        self.prefetched_pages[1] = [(f"{self.BASE_URL}{href}", "") for href in links]
+        total = int(total.strip().split(" ")[0])
         if total:
             page_count = (total + self.PER_PAGE - 1) // self.PER_PAGE
             if page_count:
@@ -153,110 +235,24 @@ class WorkUaParser:
         else:
             raise ValueError("get_page_count: Resumes not found")
 
-    async def run_parser(self) -> list[WorkResumeModel] | None:
-        try:
-            logging.info(f"Sending request {self.url} to work.ua...")
-            page_count = await self.get_page_count()
-            results = []
-            for page_num in range(1, page_count + 1):
-                logging.info(f"Parsing {page_num} page...")
-                page_url = f"{self.url}&page={str(page_num)}"
-                resumes_page = await self.get_resumes_page(page_url)
-                soup = BeautifulSoup(resumes_page, "lxml")
-                links = soup.select(selector=("h2.mt-0 > a"))
-                resumes_links = [f"{self.BASE_URL}{a['href']}" for a in links]
-
-                results.append(
-                    self.get_resumes_data_from_urls(resumes_urls=resumes_links)
-                )
-            res = []
-            for url_group in results:
-                res.extend(url_group)
-            logging.info(f"Parsing finished\nParsed {len(res)} resumes")
-            return res
-
-        except Exception as e:
-            logging.error(e)
-            return None
-
-    def get_resumes_data_from_urls(
-        self, resumes_urls: list[str]
-    ) -> list[WorkResumeModel]:
-        """Retrieve product data from a list of URLs using multiple processes.
+    async def get_resumes_links(self, page_num: int) -> list[tuple[str, str]]:
+        """Retrieve resume URLs listed on one search page.
 
         Parameters
         ----------
-        resumes_urls : list of str
-            List of resumes URLs to fetch data from.
+        page_num : int
+            Number of the search page, starting from 1.
 
         Returns
         -------
-        list
-            Combined list of parsed resumes data from all processes.
+        list of tuple of str
+            Absolute URLs of the resumes found on the page with their listing
+            fingerprints. Work.ua cards only show relative dates, so the
+            fingerprint is empty and known resumes are refreshed by age.
         """
-        url_groups = self.split_urls(urls=resumes_urls)
-
-        with Pool(processes=self.settings.processes_count) as pool:
-            results = pool.map(
-                process_wrapper,
-                [(url_group, self.settings) for url_group in url_groups],
-            )
-
-        res = []
-        for url_group in results:
-            res.extend(url_group)
-        return res
-
-    def split_urls(self, urls: list[str]):
-        """Split a list of URLs into smaller chunks.
+        page_url = f"{self.url}&page={str(page_num)}"
+        _, links = parse_listing(await self.get_resumes_page(page_url))
+        return [(f"{self.BASE_URL}{href}", "") for href in links]
 
-        Parameters
-        ----------
-        urls : list of str
-            List of URLs to split.
-
-        Returns
-        -------
-        list of list of str
-            A list containing the split chunks of URLs.
-        """
-        chunk_len = (
-            len(urls) + self.settings.processes_count - 1
-        ) // self.settings.processes_count
-        return (
-            [urls[i : i + chunk_len] for i in range(0, len(urls), chunk_len)]
-            if chunk_len
-            else []
-        )
-
-
-def process_wrapper(args) -> list[WorkResumeModel]:
-    """Wrapper to run asyncio tasks within a process."""
-    urls, settings = args
-    return asyncio.run(process_urls(urls, settings))
-
-
-async def process_urls(urls: list[str], settings: Settings) -> list[WorkResumeModel]:
-    """Asynchronously fetch and parse resumes in a given set of URLs."""
-    async with CustomSession() as session:
-        tasks = [fetch_and_parse(url, session, settings) for url in urls]
-        return await asyncio.gather(*tasks)
-
-
-async def fetch_and_parse(
-    url: str, session: CustomSession, settings: Settings
-) -> WorkResumeModel:
-    """Fetch json with resume data and parse it"""
-    async with asyncio.Semaphore(settings.process_max_connections):
-        async with session.get(url) as response:
-            if not response.ok:
-                raise ClientError(
-                    f"fetch_and_parse: {response.status}: {response.reason}"
-                )
-            html = await response.text()
-    try:
-        model = WorkResumeModel.from_html(html)
-        logging.info(f"Parsed {url}")
-        return model
-    except Exception as e:
-        raise ValueError(f"fetch_and_parse - error at parsing {url}: {e}")
+    async def get_page_nums(self) -> range:
+        return range(1, await self.get_page_count() + 1)
@@ -1,6 +1,7 @@
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Literal
 
 
 env_file = Path(__file__).parent.parent / ".env"
@@ -9,6 +10,57 @@ env_file = Path(__file__).parent.parent / ".env"
 class Settings(BaseSettings):
     processes_count: int = 4
     process_max_connections: int = 2
+    # pooled connections of a session to one host, 0 for no limit
+    connection_limit_per_host: int = 8
+    # seconds an idle connection is kept open and a DNS answer reused
+    keepalive_timeout: float = 60.0
+    dns_cache_ttl: int = 300
+    # limits of one site shared by all processes of a crawl
+    host_max_connections: int = 8
+    # requests per second, 0 disables the rate limit
+    host_rate_limit: float = 10.0
+    host_rate_burst: int = 10
+    # adapt the connections of a host between 1 and host_max_connections to
+    # its latency and errors; a p95 above tolerance times the best is too slow
+    adaptive_concurrency: bool = True
+    adaptive_latency_tolerance: float = 2.0
+    # listing pages fetched ahead of the resume workers
+    listing_concurrency: int = 4
+    # resume URLs waiting for a worker
+    url_queue_size: int = 100
+    # resume URLs sent to a worker process in one task
+    worker_chunk_size: int = 4
+    # on-disk cache of resume responses, empty path disables it
+    cache_path: str = ""
+    cache_ttl: int = 24 * 60 * 60
+    cache_max_size: int = 512 * 1024 * 1024
+    # incremental mode skips resumes fetched less than seen_max_age seconds ago
+    incremental: bool = False
+    seen_index_path: str = ".cache/seen.sqlite3"
+    seen_max_age: int = 7 * 24 * 60 * 60
+    # work.ua resume extractor: "bs4" or the faster "lxml"
+    work_html_parser: Literal["bs4", "lxml"] = "bs4"
+    # retries of a failed request with jittered exponential backoff (seconds)
+    fetch_retries: int = 3
+    retry_backoff: float = 0.5
+    retry_max_backoff: float = 30.0
+    # resumes that still failed, fetched again by the next crawl; empty disables
+    retry_queue_path: str = ".cache/retry.sqlite3"
+    retry_max_attempts: int = 5
+    # resumes kept in memory before an output file is written to
+    output_buffer_size: int = 1000
+    # seconds after which buffered resumes are written anyway, 0 disables it
+    output_flush_interval: float = 30.0
+    # crawl progress saved with every output write, for main.py --resume
+    checkpoint_path: str = ".cache/checkpoint.sqlite3"
+    # estimated Jaccard similarity of two records of the same candidate
+    dedup_threshold: float = 0.5
+    # seconds between metrics log lines, 0 to report only at the end
+    metrics_interval: float = 30.0
+    # Prometheus text file rewritten with every report, empty to disable
+    metrics_path: str = ".cache/metrics.prom"
+    # local full-text and faceted index of crawled resumes, empty disables it
+    resume_index_path: str = ""
 
     model_config = ConfigDict(
         extra="ignore",
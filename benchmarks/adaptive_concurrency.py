@@ -0,0 +1,105 @@
+"""Crawl an overloaded site with static and adaptive connection limits.
+
+Run with ``python -m benchmarks.adaptive_concurrency [--capacity 4]``. The
+robota.ua site of ``benchmarks.fake_sites`` works on ``--capacity``
+requests at once, queues as many more and answers the rest with 429. It is
+crawled three times through the orchestrator with room for ``--max``
+requests in flight:
+
+* with a static limit of ``--max`` connections,
+* with a static limit of ``--capacity``, the limit one would tune by hand,
+* with ``adaptive_concurrency`` starting halfway to ``--max``.
+
+Each run reports resumes/sec, the retried and failed requests, p95 time
+to first byte and, for the adaptive run, the limit it settled on.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from app.helpers.custom_session import CustomSession
+from app.helpers.metrics import CrawlMetrics
+from app.helpers.orchestrator import CrawlOrchestrator
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.resume_filter import ResumeFilter
+from app.settings import Settings
+from benchmarks.crawl import local_parsers
+from benchmarks.fake_sites import HOST, FakeSites
+
+
+async def crawl(settings: Settings, parser_class: type) -> tuple[int, dict]:
+    metrics = CrawlMetrics()
+    limiter = RateLimiter(settings, hosts=(HOST,))
+    async with CustomSession.from_settings(settings, metrics=metrics) as session:
+        orchestrator = CrawlOrchestrator(
+            ResumeFilter(speciality="python developer"),
+            settings,
+            session,
+            [parser_class],
+            limiter=limiter,
+        )
+        resumes = 0
+        async for _ in orchestrator.iter_resumes(raw=True):
+            resumes += 1
+    host = limiter.hosts[HOST]
+    return resumes, {
+        "retries": metrics.counter("http_retries_total"),
+        "errors": metrics.counter("http_errors_total"),
+        "ttfb_p95": metrics.quantile("http_ttfb_seconds", 0.95),
+        "limit": host.concurrency,
+        "peak": host.peak_concurrency,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--max", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    base = Settings(
+        processes_count=max(args.max // 2, 1),
+        process_max_connections=2,
+        host_max_connections=args.max,
+        host_rate_limit=0,
+        cache_path="",
+        incremental=False,
+        retry_queue_path="",
+        metrics_interval=0,
+        metrics_path="",
+    )
+    with FakeSites(
+        total=args.resumes, latency=args.latency, capacity=args.capacity
+    ) as sites:
+        parser_class = local_parsers(sites)["robota"]
+        for name, update in (
+            (f"static {args.max}", {"adaptive_concurrency": False}),
+            (
+                f"static {args.capacity}",
+                {"adaptive_concurrency": False, "host_max_connections": args.capacity},
+            ),
+            ("adaptive", {"adaptive_concurrency": True}),
+        ):
+            settings = base.model_copy(update=update)
+            started = time.perf_counter()
+            resumes, stats = asyncio.run(crawl(settings, parser_class))
+            elapsed = time.perf_counter() - started
+            settled = (
+                f", settled at {stats['limit']} (peak {stats['peak']})"
+                if settings.adaptive_concurrency
+                else ""
+            )
+            print(
+                f"{name:>9}: {resumes / elapsed:6.1f} resumes/s, "
+                f"{stats['retries']:.0f} retries, {stats['errors']:.0f} failed, "
+                f"p95 TTFB {stats['ttfb_p95'] * 1000:.0f} ms{settled}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare separate crawls of several filters with one ``BatchSearch``.
+
+Run with ``python -m benchmarks.batch_search [--filters 6] [--share 0.3]``.
+The filters share a speciality and differ in the main skill, and every
+search of ``benchmarks.fake_sites`` lists a ``--share`` of the resumes, so
+they overlap the way daily searches do. The filters are crawled one after
+another with ``CrawlOrchestrator`` and then together with ``BatchSearch``
+against both sites. The script fails if a filter gets other resumes from
+the batch, then reports the resume requests and time of both.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from app.helpers.batch_search import BatchSearch
+from app.helpers.custom_session import CustomSession
+from app.helpers.orchestrator import CrawlOrchestrator
+from app.helpers.resume_filter import ResumeFilter
+from app.settings import Settings
+from benchmarks.crawl import local_parsers
+from benchmarks.fake_sites import FakeSites
+
+SKILLS = ("django", "flask", "fastapi", "asyncio", "pandas", "celery", "docker")
+
+
+async def separate(
+    filters: list[ResumeFilter], settings: Settings, parser_classes: list[type]
+) -> list[set[str]]:
+    found = []
+    async with CustomSession.from_settings(settings) as session:
+        for filter_obj in filters:
+            crawl = CrawlOrchestrator(filter_obj, settings, session, parser_classes)
+            found.append({resume.cv_link async for resume in crawl.iter_resumes()})
+    return found
+
+
+async def batch(
+    filters: list[ResumeFilter], settings: Settings, parser_classes: list[type]
+) -> tuple[list[set[str]], BatchSearch]:
+    found: list[set[str]] = [set() for _ in filters]
+    async with CustomSession.from_settings(settings) as session:
+        search = BatchSearch(filters, settings, session, parser_classes)
+        async for resume, matched in search.iter_resumes():
+            for n in matched:
+                found[n].add(resume.cv_link)
+    return found, search
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filters", type=int, default=6)
+    parser.add_argument("--share", type=float, default=0.3)
+    parser.add_argument("--resumes", type=int, default=500, help="per site")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    settings = Settings(
+        host_rate_limit=0,
+        cache_path="",
+        incremental=False,
+        retry_queue_path="",
+        metrics_interval=0,
+        metrics_path="",
+    )
+    filters = [
+        ResumeFilter(speciality="python developer", main_skills=[SKILLS[n % 7]])
+        for n in range(args.filters)
+    ]
+    with FakeSites(
+        total=args.resumes,
+        latency=args.latency,
+        jitter=args.jitter,
+        query_share=args.share,
+    ) as sites:
+        parser_classes = list(local_parsers(sites).values())
+        results = {}
+        for mode in ("separate", "batch"):
+            before = sites.request_counts()
+            started = time.perf_counter()
+            if mode == "separate":
+                found = asyncio.run(separate(filters, settings, parser_classes))
+            else:
+                found, search = asyncio.run(batch(filters, settings, parser_classes))
+            elapsed = time.perf_counter() - started
+            after = sites.request_counts()
+            resumes = sum(
+                after[route] - before[route]
+                for route in ("work_resume", "robota_resume")
+            )
+            results[mode] = found
+            print(
+                f"{mode:>8}: {sum(map(len, found))} filter matches, "
+                f"{resumes} resume requests in {elapsed:.2f}s"
+            )
+    if results["separate"] != results["batch"]:
+        raise SystemExit("The batch attributed other resumes to the filters")
+    print(
+        f"listed {search.listed}, fetched {search.fetched}, "
+        f"saved {search.requests_saved} requests"
+    )
+
+
+if __name__ == "__main__":
+    main()
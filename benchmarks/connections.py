@@ -0,0 +1,130 @@
+"""Count the connections and DNS lookups of a crawl.
+
+Run with ``python -m benchmarks.connections [--rate 0.5]``. Both sites of
+``benchmarks.fake_sites`` are crawled through the orchestrator, addressed
+as ``localhost`` so host names are resolved, in three ways:
+
+* with a new session for every resume, what a crawl costs without pooling,
+* with the worker sessions and the connector aiohttp uses by default
+  (15 s keep-alive, 10 s DNS cache),
+* with the worker sessions and the pool of ``Settings``.
+
+Each run reports the connections opened (one TCP and, on the real sites,
+one TLS handshake each), the requests sent on reused connections and the
+DNS lookups. A fast crawl keeps every pooled connection busy, so both
+pools open about one connection per worker and site; with a polite
+``--rate`` (requests per second per site) connections idle between
+requests longer than aiohttp's keep-alive and are opened again.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from urllib.parse import urlsplit
+
+from app.helpers.custom_session import CustomSession
+from app.helpers.metrics import CrawlMetrics
+from app.helpers.orchestrator import CrawlOrchestrator
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.resume_filter import ResumeFilter
+from app.settings import Settings
+from benchmarks.crawl import local_parsers
+from benchmarks.fake_sites import HOST, FakeSites
+
+# what aiohttp.TCPConnector does without arguments
+AIOHTTP_DEFAULTS = {
+    "connection_limit_per_host": 0,
+    "keepalive_timeout": 15.0,
+    "dns_cache_ttl": 10,
+}
+COUNTERS = (
+    "http_requests_total",
+    "http_connections_total",
+    "http_connections_reused_total",
+    "http_dns_lookups_total",
+)
+# port of a fake site -> the fetch function of its parser
+FETCH_FUNCS = {}
+
+
+async def fetch_unpooled(url: str, session: CustomSession, settings: Settings):
+    """Fetch a resume on a session of its own, closed right after."""
+    fetch_func = FETCH_FUNCS[urlsplit(url).port]
+    async with CustomSession.from_settings(
+        settings, limiter=session.limiter, metrics=session.metrics
+    ) as own_session:
+        return await fetch_func(url, own_session, settings)
+
+
+def localhost_parsers(sites: FakeSites, pooled: bool = True) -> list[type]:
+    parsers = []
+    for parser_class in local_parsers(sites).values():
+        attrs = {
+            name: getattr(parser_class, name).replace(HOST, "localhost")
+            for name in ("BASE_URL", "RESUMES_URL", "API_URL")
+            if name in vars(parser_class)
+        }
+        url = attrs.get("BASE_URL") or attrs["API_URL"]
+        FETCH_FUNCS[urlsplit(url).port] = parser_class.fetch_func
+        if not pooled:
+            attrs["fetch_func"] = fetch_unpooled
+        parsers.append(type(parser_class.__name__, (parser_class,), attrs))
+    return parsers
+
+
+async def crawl(settings: Settings, parser_classes: list[type]) -> dict[str, float]:
+    metrics = CrawlMetrics()
+    limiter = RateLimiter(settings, hosts=("localhost",))
+    async with CustomSession.from_settings(settings, metrics=metrics) as session:
+        orchestrator = CrawlOrchestrator(
+            ResumeFilter(speciality="python developer"),
+            settings,
+            session,
+            parser_classes,
+            limiter=limiter,
+        )
+        async for _ in orchestrator.iter_resumes(raw=True):
+            pass
+    return {name: metrics.counter(name) for name in COUNTERS}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=500, help="per site")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0, help="0 for no limit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    base = Settings(
+        processes_count=args.processes,
+        host_rate_limit=args.rate,
+        host_rate_burst=1,
+        cache_path="",
+        incremental=False,
+        retry_queue_path="",
+        metrics_interval=0,
+        metrics_path="",
+    )
+    with FakeSites(total=args.resumes, latency=args.latency, jitter=0.02) as sites:
+        for name, settings, pooled in (
+            ("session per resume", base, False),
+            ("aiohttp defaults", base.model_copy(update=AIOHTTP_DEFAULTS), True),
+            ("tuned pool", base, True),
+        ):
+            parser_classes = localhost_parsers(sites, pooled)
+            started = time.perf_counter()
+            counts = asyncio.run(crawl(settings, parser_classes))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>19}: {counts['http_requests_total']:.0f} requests in "
+                f"{elapsed:.1f}s, {counts['http_connections_total']:.0f} "
+                f"connections opened, {counts['http_connections_reused_total']:.0f}"
+                f" reused, {counts['http_dns_lookups_total']:.0f} DNS lookups"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""End-to-end crawl benchmark against local fake sites.
+
+Run with ``python -m benchmarks.crawl``. ``WorkUaParser`` and
+``RobotaUaParser`` crawl ``benchmarks.fake_sites`` through the real
+orchestrator, session, worker pool and pipeline, and every scenario reports:
+
+* resumes/sec over the wall time of the crawl,
+* p50/p99 time to first byte of the crawler's requests,
+* peak RSS of the main process and of the largest worker,
+* CPU time per resume of the main process and the workers together, and
+  of the main process alone.
+
+Each scenario runs ``--repeat`` times in a fresh process, so peak RSS is
+its own, and the median of every result is kept. The results are compared
+with ``benchmarks/baselines/crawl.json`` and the script exits with status 1
+if any of them is worse by more than ``--tolerance``; record a new baseline
+with ``--save-baseline`` on the machine that checks for regressions, since
+the numbers depend on it. Latency quantiles come from
+the ``CrawlMetrics`` histograms and are interpolated within a bucket.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from app.helpers.custom_session import CustomSession
+from app.helpers.metrics import CrawlMetrics
+from app.helpers.orchestrator import CrawlOrchestrator
+from app.helpers.resume_filter import ResumeFilter
+from app.parse_robota_ua.robota_ua_parser import RobotaUaParser
+from app.parse_work_ua.work_ua_parser import WorkUaParser
+from app.settings import Settings
+from benchmarks.fake_sites import FakeSites
+
+BASELINE = Path(__file__).parent / "baselines" / "crawl.json"
+SCENARIOS = ("work", "robota", "all")
+# result -> whether a larger value is better
+RESULTS = {
+    "resumes_per_sec": True,
+    "ttfb_p50_ms": False,
+    "ttfb_p99_ms": False,
+    "peak_rss_mib": False,
+    "worker_peak_rss_mib": False,
+    "cpu_ms_per_resume": False,
+    "main_cpu_ms_per_resume": False,
+}
+
+
+def local_parsers(sites: FakeSites) -> dict[str, type]:
+    """The site parsers pointed at the fake sites."""
+
+    class LocalWorkUaParser(WorkUaParser):
+        BASE_URL = sites.work_url
+        RESUMES_URL = f"{sites.work_url}/resumes"
+
+    class LocalRobotaUaParser(RobotaUaParser):
+        API_URL = sites.robota_url
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.url = self.url.replace(RobotaUaParser.API_URL, self.API_URL)
+
+    return {"work": LocalWorkUaParser, "robota": LocalRobotaUaParser}
+
+
+async def crawl(
+    settings: Settings, parser_classes: list[type], raw: bool
+) -> tuple[int, dict]:
+    metrics = CrawlMetrics()
+    async with CustomSession.from_settings(settings, metrics=metrics) as session:
+        orchestrator = CrawlOrchestrator(
+            ResumeFilter(speciality="python developer"),
+            settings,
+            session,
+            parser_classes,
+        )
+        count = 0
+        async for _ in orchestrator.iter_resumes(raw=raw):
+            count += 1
+    if orchestrator.failed:
+        raise RuntimeError(f"Crawl of {orchestrator.failed} failed")
+    p50 = metrics.quantile("http_ttfb_seconds", 0.5) or 0.0
+    p99 = metrics.quantile("http_ttfb_seconds", 0.99) or 0.0
+    latency = {"ttfb_p50_ms": 1000 * p50, "ttfb_p99_ms": 1000 * p99}
+    return count, latency
+
+
+def run_scenario(scenario: str, args: argparse.Namespace, conn) -> None:
+    settings = Settings(
+        processes_count=args.processes,
+        host_rate_limit=0,
+        cache_path="",
+        incremental=False,
+        retry_queue_path="",
+        metrics_interval=0,
+        metrics_path="",
+    )
+    with FakeSites(
+        total=args.resumes,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    ) as sites:
+        parsers = local_parsers(sites)
+        classes = list(parsers.values()) if scenario == "all" else [parsers[scenario]]
+        started, main_cpu = time.perf_counter(), time.process_time()
+        count, latency = asyncio.run(crawl(settings, classes, args.raw))
+        elapsed = time.perf_counter() - started
+        main_cpu = time.process_time() - main_cpu
+        requests = sites.request_counts()
+        # the worker pool has been joined and the fake sites still run in a
+        # child that is not waited for yet, so the children's usage covers
+        # only the crawler's workers
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        workers = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = own.ru_utime + own.ru_stime + workers.ru_utime + workers.ru_stime
+    conn.send(
+        {
+            "resumes": count,
+            "requests": sum(requests.values()),
+            "resumes_per_sec": count / elapsed,
+            **latency,
+            "peak_rss_mib": own.ru_maxrss / 1024,
+            "worker_peak_rss_mib": workers.ru_maxrss / 1024,
+            "cpu_ms_per_resume": 1000 * cpu / max(count, 1),
+            "main_cpu_ms_per_resume": 1000 * main_cpu / max(count, 1),
+        }
+    )
+    conn.close()
+
+
+def measure(scenario: str, args: argparse.Namespace) -> dict:
+    """Median of every result over ``args.repeat`` runs of a scenario."""
+    runs = []
+    for _ in range(args.repeat):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=run_scenario, args=(scenario, args, sender)
+        )
+        process.start()
+        runs.append(receiver.recv())
+        process.join()
+    return {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+
+def compare(result: dict, base: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, higher_is_better in RESULTS.items():
+        if not base.get(name):
+            continue
+        change = result[name] / base[name] - 1
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append(f"{name} {base[name]:.2f} -> {result[name]:.2f}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenario", choices=SCENARIOS, action="append", help="default: all"
+    )
+    parser.add_argument("--resumes", type=int, default=500, help="per site")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--raw", action="store_true", help="take resumes as JSON bytes, not models"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    # retries of the injected errors are expected, keep the report readable
+    logging.basicConfig(level=logging.ERROR)
+
+    options = {
+        key: getattr(args, key)
+        for key in ("resumes", "latency", "jitter", "error_rate", "processes", "raw")
+    }
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if baseline and baseline.get("options") != options:
+        print("The baseline was recorded with other options, not comparing")
+        baseline = {}
+    results, failed = {}, False
+    for scenario in args.scenario or SCENARIOS:
+        results[scenario] = result = measure(scenario, args)
+        print(
+            f"{scenario:>7}: {result['resumes']} resumes, "
+            f"{result['requests']} requests, "
+            + ", ".join(f"{name} {result[name]:.2f}" for name in RESULTS)
+        )
+        base = baseline.get("results", {}).get(scenario)
+        if base and (regressions := compare(result, base, args.tolerance)):
+            failed = True
+            print(f"{scenario:>7}: regression: {'; '.join(regressions)}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "options": options,
+                    "results": {**baseline.get("results", {}), **results},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Saved the baseline to {args.baseline}")
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Time ``DedupIndex`` on a synthetic merged crawl.
+
+Run with ``python -m benchmarks.dedup [--resumes N] [--duplicates SHARE]
+[--lookalikes SHARE]``. N resumes with random names, cities, ages and
+skills are generated and a SHARE of them gets a second record the way the
+other site would show the candidate: the city in the other language, the
+age one year off and some words of the skills and experience changed.
+Another share gets a lookalike on the same site, another candidate with
+the same name, city and skills, which must not be collapsed. The script
+reports how long the index takes and the recall and wrong merges of the
+pairs it collapses.
+"""
+
+import argparse
+import random
+import time
+
+from app.helpers.dedup import UA_CITY_NAMES, DedupIndex
+from app.helpers.resume_python_object import BaseResumeModel
+
+SYLLABLES = ("ан", "дрій", "ол", "ек", "сандр", "ір", "ина", "та", "рас", "ма", "рія")
+CITIES = list(UA_CITY_NAMES.items())
+
+
+def make_resume(rnd: random.Random, n: int, vocabulary: list[str]) -> BaseResumeModel:
+    name = "".join(rnd.choices(SYLLABLES, k=2)).capitalize()
+    city, _ = rnd.choice(CITIES)
+    return BaseResumeModel(
+        cv_link=f"https://www.work.ua/resumes/{n}/",
+        first_name=name,
+        age=rnd.randint(18, 65),
+        speciality=" ".join(rnd.sample(vocabulary, 2)),
+        city=city.capitalize(),
+        resume_filling=rnd.randint(0, 100),
+        skills=", ".join(rnd.sample(vocabulary, rnd.randint(3, 12))),
+        experiences=[
+            {
+                "position": " ".join(rnd.sample(vocabulary, 2)),
+                "company": rnd.choice(vocabulary),
+                "description": " ".join(rnd.sample(vocabulary, rnd.randint(5, 25))),
+                "period": 1.0,
+            }
+            for _ in range(rnd.randint(0, 3))
+        ],
+    )
+
+
+def other_site_copy(
+    rnd: random.Random, resume: BaseResumeModel, vocabulary: list[str]
+) -> BaseResumeModel:
+    skills = resume.skills.split(", ")
+    skills[rnd.randrange(len(skills))] = rnd.choice(vocabulary)
+    return resume.model_copy(
+        update={
+            "cv_link": resume.cv_link.replace(
+                "www.work.ua/resumes", "robota.ua/candidates"
+            ),
+            "city": str(UA_CITY_NAMES[resume.city.lower()]),
+            "age": resume.age + rnd.choice((-1, 0, 1)),
+            "skills": ", ".join(skills),
+        }
+    )
+
+
+def lookalike(rnd: random.Random, resume: BaseResumeModel, n: int) -> BaseResumeModel:
+    """Another candidate of the same site who looks like ``resume``."""
+    return resume.model_copy(
+        update={
+            "cv_link": f"https://www.work.ua/resumes/{n}/",
+            "age": resume.age + rnd.choice((-1, 0, 1)),
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=50_000)
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--lookalikes", type=float, default=0.02)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    vocabulary = [f"skill{i}" for i in range(2000)]
+    resumes, expected = [], set()
+    for n in range(args.resumes):
+        resume = make_resume(rnd, n, vocabulary)
+        resumes.append(resume)
+        if rnd.random() < args.duplicates:
+            resumes.append(other_site_copy(rnd, resume, vocabulary))
+            expected.add(resume.cv_link.rsplit("/", 2)[-2])
+        if rnd.random() < args.lookalikes:
+            resumes.append(lookalike(rnd, resume, args.resumes + n))
+    rnd.shuffle(resumes)
+
+    started = time.perf_counter()
+    index = DedupIndex()
+    index.extend(resumes)
+    clusters = index.clusters()
+    elapsed = time.perf_counter() - started
+
+    found = set()
+    false_pairs = 0
+    for cluster in clusters:
+        ids = {resume.cv_link.rsplit("/", 2)[-2] for resume in cluster}
+        if len(cluster) < 2:
+            continue
+        if len(ids) == 1:
+            found |= ids
+        else:
+            false_pairs += len(cluster) - 1
+    collapsed = len(resumes) - len(clusters)
+    print(f"{len(resumes)} resumes, {len(expected)} duplicated candidates")
+    print(f"collapsed {collapsed} records in {elapsed:.2f} s")
+    print(
+        f"recall {len(found) / max(len(expected), 1):.3f}, wrong merges {false_pairs}"
+    )
+
+
+if __name__ == "__main__":
+    main()
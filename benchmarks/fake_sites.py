@@ -0,0 +1,230 @@
+"""Local stand-ins for work.ua and robota.ua built from the saved fixtures.
+
+``FakeSites`` serves the work.ua search and resume pages and the robota.ua
+``cvdb/resumes`` and ``resume/<id>`` API in a separate process, one port
+per site so the host limits of the crawler apply as they do to the real
+sites. Every response waits ``latency`` seconds plus normal ``jitter``, and
+``error_rate`` of them are answered with 503 so the retry path is exercised.
+With a ``capacity`` a site works on that many requests at once, queues as
+many more and answers the rest with 429, like an overloaded server.
+The pages are the fixtures with the resume id substituted, so the real
+parsers run on them unchanged. With ``query_share`` below 1 a search only
+lists that share of the resumes, a window that starts at a hash of the
+query, so different filters find overlapping candidates.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import re
+import socket
+import time
+import zlib
+from pathlib import Path
+from typing import Self
+
+from aiohttp import web
+
+HOST = "127.0.0.1"
+FIXTURES = Path(__file__).parent / "fixtures"
+WORK_PER_PAGE = 14
+ROBOTA_PER_PAGE = 20
+ROUTES = ("work_listing", "work_resume", "robota_listing", "robota_resume")
+_CANONICAL = re.compile(r"(/resumes/)\d+/")
+
+
+class FakeSites:
+    """Serve fake work.ua and robota.ua with ``total`` resumes each.
+
+    Use as a context manager; ``requests`` counts the requests of every
+    route in ``ROUTES`` across the server process.
+    """
+
+    def __init__(
+        self,
+        total: int = 500,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        query_share: float = 1.0,
+        capacity: int = 0,
+        work_port: int = 8781,
+        robota_port: int = 8782,
+    ):
+        self.total = total
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.query_share = query_share
+        self.capacity = capacity
+        self.work_port = work_port
+        self.robota_port = robota_port
+        self.requests = multiprocessing.RawArray("l", len(ROUTES))
+        self._process: multiprocessing.Process | None = None
+
+    @property
+    def work_url(self) -> str:
+        return f"http://{HOST}:{self.work_port}"
+
+    @property
+    def robota_url(self) -> str:
+        return f"http://{HOST}:{self.robota_port}"
+
+    def request_counts(self) -> dict[str, int]:
+        return dict(zip(ROUTES, self.requests))
+
+    def __enter__(self) -> Self:
+        self._process = multiprocessing.Process(target=self._serve, daemon=True)
+        self._process.start()
+        for port in (self.work_port, self.robota_port):
+            _wait_for_port(port)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._process.terminate()
+        self._process.join()
+        self._process = None
+
+    def _serve(self) -> None:
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        self._random = random.Random(self.seed)
+        self._load_fixtures()
+        # per site: requests being worked on and requests waiting for them
+        self._servers = {
+            site: asyncio.Semaphore(self.capacity) for site in ("work", "robota")
+        }
+        self._queued = dict.fromkeys(self._servers, 0)
+        runners = []
+        for app, port in (
+            (self._work_app(), self.work_port),
+            (self._robota_app(), self.robota_port),
+        ):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, HOST, port).start()
+            runners.append(runner)
+        await asyncio.Event().wait()
+
+    def _load_fixtures(self) -> None:
+        work, robota = FIXTURES / "work_ua", FIXTURES / "robota_ua"
+        self.work_listing = (work / "listing.html").read_text()
+        self.work_card = (work / "card.html").read_text()
+        self.work_resumes = [
+            path.read_text() for path in sorted(work.glob("resume_*.html"))
+        ]
+        self.robota_documents = json.loads((robota / "listing.json").read_text())[
+            "documents"
+        ]
+        self.robota_resumes = [
+            json.loads(path.read_text())
+            for path in sorted(robota.glob("resume_*.json"))
+        ]
+
+    async def _delay(self, route: str) -> web.Response | None:
+        """Count the request, wait like a remote site and maybe fail it."""
+        self.requests[ROUTES.index(route)] += 1
+        if self.capacity:
+            site = route.partition("_")[0]
+            if self._queued[site] >= self.capacity:
+                return web.Response(status=429)
+            self._queued[site] += 1
+            try:
+                await self._servers[site].acquire()
+            finally:
+                self._queued[site] -= 1
+            try:
+                await self._wait()
+            finally:
+                self._servers[site].release()
+        else:
+            await self._wait()
+        if self._random.random() < self.error_rate:
+            return web.Response(status=503)
+        return None
+
+    async def _wait(self) -> None:
+        await asyncio.sleep(max(0.0, self._random.gauss(self.latency, self.jitter)))
+
+    def _listing(
+        self, request: web.Request, page: int, per_page: int
+    ) -> tuple[int, list[int]]:
+        """Number of resumes a search finds and the ids on one of its pages."""
+        found = max(1, int(self.total * self.query_share))
+        query = [(k, v) for k, v in request.query.items() if k not in ("page", "count")]
+        start = (
+            zlib.crc32(f"{request.path}?{query}".encode()) if found < self.total else 0
+        )
+        ids = range(page * per_page, min((page + 1) * per_page, found))
+        return found, [(start + i) % self.total for i in ids]
+
+    def _work_app(self) -> web.Application:
+        async def listing(request: web.Request) -> web.Response:
+            if error := await self._delay("work_listing"):
+                return error
+            page = int(request.query.get("page", "1"))
+            found, ids = self._listing(request, page - 1, WORK_PER_PAGE)
+            cards = "".join(self.work_card.replace("{id}", str(i)) for i in ids)
+            text = self.work_listing.replace("{total}", str(found))
+            return web.Response(
+                text=text.replace("{cards}", cards), content_type="text/html"
+            )
+
+        async def resume(request: web.Request) -> web.Response:
+            if error := await self._delay("work_resume"):
+                return error
+            resume_id = int(request.match_info["id"])
+            html = self.work_resumes[resume_id % len(self.work_resumes)]
+            return web.Response(
+                text=_CANONICAL.sub(rf"\g<1>{resume_id}/", html, count=1),
+                content_type="text/html",
+            )
+
+        app = web.Application()
+        app.router.add_get(r"/resumes/{id:\d+}/", resume)
+        app.router.add_get(r"/{path:resumes-.*}", listing)
+        return app
+
+    def _robota_app(self) -> web.Application:
+        async def listing(request: web.Request) -> web.Response:
+            if error := await self._delay("robota_listing"):
+                return error
+            page = int(request.query.get("page", "0"))
+            count = int(request.query.get("count", ROBOTA_PER_PAGE))
+            found, ids = self._listing(request, page, count)
+            documents = [
+                {
+                    **self.robota_documents[i % len(self.robota_documents)],
+                    "resumeId": i,
+                }
+                for i in ids
+            ]
+            return web.json_response({"total": found, "documents": documents})
+
+        async def resume(request: web.Request) -> web.Response:
+            if error := await self._delay("robota_resume"):
+                return error
+            resume_id = int(request.match_info["id"])
+            data = self.robota_resumes[resume_id % len(self.robota_resumes)]
+            return web.json_response({**data, "resumeId": resume_id})
+
+        app = web.Application()
+        app.router.add_get("/cvdb/resumes", listing)
+        app.router.add_get(r"/resume/{id:\d+}", resume)
+        return app
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
@@ -0,0 +1,80 @@
+"""Check and time ``html_to_text`` against BeautifulSoup.
+
+Run with ``python -m benchmarks.html_text [--resumes DIR]``. Every HTML field
+of the saved robota.ua resumes in DIR (skills, education comments and
+experience descriptions), plus a set of random fragments, is converted by
+both ``BeautifulSoup(markup, "html.parser").text`` and ``html_to_text``. The
+script fails on the first difference and then reports fields/sec of each.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.helpers.html_text import html_to_text
+
+FIXTURES = Path(__file__).parent / "fixtures" / "robota_ua"
+TOKENS = (
+    "<p>", "</p>", "<b>", "</b>", "<br>", "<br/>", "<ul>", "</ul>", "<li>",
+    "</li>", "<pre>", "</pre>", "<script>x</script>", "<style>y</style>",
+    "<template>", "</template>", "<!-- c -->", "<![CDATA[z]]>", "&amp;",
+    "&nbsp;", "&#39;", "&#150;", "&copy", "&lt;", "text ", "Текст ", "\n",
+    " ", "\t",
+)  # fmt: skip
+
+
+def bs4_text(markup: str) -> str:
+    return BeautifulSoup(markup, "html.parser").text
+
+
+def resume_fields(path: Path) -> list[str]:
+    fields = []
+    for file in sorted(path.glob("resume_*.json")):
+        resume = json.loads(file.read_text(encoding="utf-8"))
+        fields.extend(skill["description"] for skill in resume.get("skills", []))
+        fields.extend(ed["comment"] for ed in resume.get("educations", []))
+        fields.extend(ex["description"] for ex in resume.get("experiences", []))
+    return fields
+
+
+def random_fragments(count: int) -> list[str]:
+    rnd = random.Random(0)
+    return [
+        "".join(rnd.choice(TOKENS) for _ in range(rnd.randint(0, 30)))
+        for _ in range(count)
+    ]
+
+
+def per_sec(func, fields: list[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for markup in fields:
+            func(markup)
+    return repeat * len(fields) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=Path, default=FIXTURES)
+    parser.add_argument("--fragments", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    fields = resume_fields(args.resumes)
+    for markup in fields + random_fragments(args.fragments):
+        if (expected := bs4_text(markup)) != (actual := html_to_text(markup)):
+            sys.exit(f"{markup!r}: {expected!r} != {actual!r}")
+    print(f"{len(fields)} resume fields, {args.fragments} fragments: identical")
+
+    for name, func in (("bs4", bs4_text), ("html_to_text", html_to_text)):
+        rate = per_sec(func, fields, args.repeat)
+        print(f"{name:>12}: {rate:9.1f} fields/sec")
+
+
+if __name__ == "__main__":
+    main()
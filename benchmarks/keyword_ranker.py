@@ -0,0 +1,102 @@
+"""Check and time ``KeywordRanker`` against a per-keyword scan.
+
+Run with ``python -m benchmarks.keyword_ranker [--resumes N] [--keywords K]``.
+The saved work.ua and robota.ua fixtures are parsed, copied into N resumes
+with random keyword-like words mixed into their fields and ranked with K
+keywords. Scores must match a reference that runs one regex per keyword,
+then the resumes/sec of both are reported.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from app.helpers.keyword_ranker import FIELD_WEIGHTS, KeywordRanker, resume_fields
+from app.helpers.resume_python_object import BaseResumeModel
+from app.parse_robota_ua.robota_resume_model import RobotaResumeModel
+from app.parse_work_ua.work_resume_model import WorkResumeModel
+
+FIXTURES = Path(__file__).parent / "fixtures"
+WORDS = (
+    "python", "django", "sql", "c++", "c#", ".net", "machine learning",
+    "machine", "excel", "1c", "бухгалтер", "English", "Docker", "aws",
+)  # fmt: skip
+
+
+def load_resumes() -> list[BaseResumeModel]:
+    resumes: list[BaseResumeModel] = [
+        WorkResumeModel.from_html(file.read_text(encoding="utf-8"))
+        for file in sorted((FIXTURES / "work_ua").glob("resume_*.html"))
+    ]
+    resumes += [
+        RobotaResumeModel(**json.loads(file.read_text(encoding="utf-8")))
+        for file in sorted((FIXTURES / "robota_ua").glob("resume_*.json"))
+    ]
+    return resumes
+
+
+def mutate(resume: BaseResumeModel, rnd: random.Random) -> BaseResumeModel:
+    def noise(text: str) -> str:
+        return " ".join([text, *rnd.sample(WORDS, rnd.randint(0, 4))])
+
+    return resume.model_copy(
+        update={
+            "speciality": noise(resume.speciality),
+            "skills": noise(resume.skills),
+            "experiences": [
+                {**ex, "description": noise(ex.get("description", ""))}
+                for ex in resume.experiences
+            ],
+        }
+    )
+
+
+def reference_score(keywords: list[str], resume: BaseResumeModel) -> float:
+    score = 0.0
+    for field, text in resume_fields(resume).items():
+        for keyword in keywords:
+            pattern = rf"(?<!\w){re.escape(keyword)}(?!\w)"
+            if re.search(pattern, text, re.IGNORECASE):
+                score += FIELD_WEIGHTS[field]
+    return score
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--keywords", type=int, default=10)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    base = load_resumes()
+    resumes = [mutate(rnd.choice(base), rnd) for _ in range(args.resumes)]
+    keywords = rnd.sample(WORDS, min(args.keywords, len(WORDS)))
+    # overlapping keywords are scored separately by the reference
+    keywords = [k for k in keywords if not any(k in o and k != o for o in keywords)]
+
+    ranker = KeywordRanker(keywords, n=10)
+    started = time.perf_counter()
+    top = ranker.rank(resumes)
+    fast = len(resumes) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    expected = [reference_score(ranker.keywords, resume) for resume in resumes]
+    slow = len(resumes) / (time.perf_counter() - started)
+
+    for resume, score in zip(resumes, expected):
+        if ranker.score(resume) != score:
+            sys.exit(f"{resume.cv_link}: {ranker.score(resume)} != {score}")
+    if [score for score, _ in top] != sorted(expected, reverse=True)[:10]:
+        sys.exit("top-N does not match the reference ranking")
+
+    print(f"{len(resumes)} resumes, keywords {keywords}: identical scores")
+    print(f"   per-keyword scan: {slow:9.1f} resumes/sec")
+    print(f"    combined regex: {fast:9.1f} resumes/sec")
+
+
+if __name__ == "__main__":
+    main()
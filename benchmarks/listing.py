@@ -0,0 +1,144 @@
+"""Time the discovery of resume links on the listing pages.
+
+Run with ``python -m benchmarks.listing [--site robota] [--latency 0.05]``.
+The site parser enumerates every listing page of ``benchmarks.fake_sites``
+twice, with the default ``host_max_connections`` but no
+``host_rate_limit``, which would otherwise cap both modes at the same
+pages/sec once the latency is low:
+
+* sequential: the page count request, then every page one after another,
+  the first one again included, with the page size the parser used to have;
+* concurrent: the way ``CrawlPipeline`` does it, with the first page reused
+  and ``listing_concurrency`` pages in flight.
+
+For work.ua the links of a generated search page are also extracted with
+the BeautifulSoup selectors the parser used before and with
+``parse_listing``, and pages/sec of each is reported. The script fails if
+the two modes or the two extractors find different links.
+
+The defaults, 1400 work.ua resumes (100 listing pages) served with 300 ms
+of latency, are the run quoted for the change: about 31 s sequential
+against 8 s concurrent.
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.helpers.custom_session import CustomSession
+from app.helpers.rate_limiter import RateLimiter
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_parser import ResumeParser
+from app.parse_work_ua.work_ua_parser import parse_listing
+from app.settings import Settings
+from benchmarks.crawl import local_parsers
+from benchmarks.fake_sites import HOST, FakeSites
+
+# page size of the sites before the parsers asked for larger pages
+LEGACY_PAGE_SIZE = {"robota": 20}
+WORK_FIXTURES = Path(__file__).parent / "fixtures" / "work_ua"
+WORK_TOTAL = (
+    "#pjax > div > div.row > div.col-md-8 > "
+    "div.flex.flex-justify-between.flex-align-flex-start > div.mt-8.text-default-7 > h1"
+)
+
+
+def parse_listing_bs4(html: str) -> tuple[str | None, list[str]]:
+    soup = BeautifulSoup(html, "lxml")
+    total = soup.select_one(WORK_TOTAL)
+    links = [a["href"] for a in soup.select("h2.mt-0 > a")]
+    return (total.text if total is not None else None), links
+
+
+def compare_extractors(repeat: int = 300) -> None:
+    card = (WORK_FIXTURES / "card.html").read_text()
+    html = (
+        (WORK_FIXTURES / "listing.html")
+        .read_text()
+        .replace("{total}", "1234")
+        .replace("{cards}", "".join(card.replace("{id}", str(i)) for i in range(14)))
+    )
+    if parse_listing_bs4(html) != parse_listing(html):
+        raise SystemExit("parse_listing differs from the BeautifulSoup selectors")
+    for name, extract in (("bs4", parse_listing_bs4), ("lxml target", parse_listing)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            extract(html)
+        print(f"{name:>11}: {repeat / (time.perf_counter() - started):.0f} pages/sec")
+
+
+async def sequential(parser: ResumeParser) -> list[tuple[str, str]]:
+    page_nums = await parser.get_page_nums()
+    parser.prefetched_pages.clear()
+    links = []
+    for page_num in page_nums:
+        links += await parser.get_resumes_links(page_num)
+    return links
+
+
+async def concurrent(parser: ResumeParser) -> list[tuple[str, str]]:
+    page_iter = iter(await parser.get_page_nums())
+    links = []
+
+    async def fetch_pages():
+        for page_num in page_iter:
+            links.extend(await parser.get_page_links(page_num))
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(parser.listing_concurrency):
+            tg.create_task(fetch_pages())
+    return links
+
+
+async def discover(site: str, sites: FakeSites, mode: str) -> tuple[set, float]:
+    settings = Settings(cache_path="", metrics_path="", host_rate_limit=0)
+    parser_class = local_parsers(sites)[site]
+    if mode == "sequential" and site in LEGACY_PAGE_SIZE:
+        parser_class = type(
+            parser_class.__name__,
+            (parser_class,),
+            {"PAGE_SIZE": LEGACY_PAGE_SIZE[site]},
+        )
+    async with CustomSession.from_settings(settings) as session:
+        parser = parser_class(
+            ResumeFilter(speciality="python developer"),
+            settings,
+            session,
+            RateLimiter(settings, hosts=(HOST,)),
+        )
+        started = time.perf_counter()
+        links = await (sequential if mode == "sequential" else concurrent)(parser)
+        return {url for url, _ in links}, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--site", choices=["work", "robota"], default="work")
+    parser.add_argument("--resumes", type=int, default=1400)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    args = parser.parse_args()
+
+    if args.site == "work":
+        compare_extractors()
+    found = {}
+    with FakeSites(
+        total=args.resumes, latency=args.latency, jitter=args.jitter
+    ) as sites:
+        for mode in ("sequential", "concurrent"):
+            before = sum(sites.request_counts().values())
+            found[mode], elapsed = asyncio.run(discover(args.site, sites, mode))
+            requests = sum(sites.request_counts().values()) - before
+            print(
+                f"{mode:>10}: {len(found[mode])} links, {requests} requests "
+                f"in {elapsed:.2f}s"
+            )
+    if found["sequential"] != found["concurrent"]:
+        raise SystemExit("The two modes found different links")
+
+
+if __name__ == "__main__":
+    main()
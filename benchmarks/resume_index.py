@@ -0,0 +1,144 @@
+"""Time offline searches of a ``ResumeIndex``.
+
+Run with ``python -m benchmarks.resume_index [--resumes N]``. N synthetic
+resumes are indexed in batches the way a crawl feeds the index, then a set
+of filters is answered from the index and by scanning the models in
+Python. The script fails if the two disagree and reports the indexing
+rate and the time of every search and facet count.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.helpers.dedup import normalize_city, words
+from app.helpers.enums import (
+    CityType,
+    ExperienceType,
+    LangLevelType,
+    LangNameType,
+    ScheduleType,
+)
+from app.helpers.facets import (
+    EXPERIENCE_YEARS,
+    LEVEL_RANKS,
+    experience_years,
+    normalize_language,
+    normalize_schedules,
+    query_words,
+)
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_index import ResumeIndex
+from app.helpers.resume_python_object import BaseResumeModel
+from benchmarks.resume_store import make_resumes
+
+FILTERS = {
+    "text": ResumeFilter(speciality="skill1234"),
+    "text + city": ResumeFilter(speciality="skill777", city=CityType.KYIV.value),
+    "skills + age": ResumeFilter(
+        speciality="skill100", main_skills=["skill20"], age_from=25, age_to=40
+    ),
+    "salary + schedule": ResumeFilter(
+        speciality="skill345",
+        salary_from=20000,
+        salary_to=50000,
+        schedule=ScheduleType.REMOTE.value,
+    ),
+    "experience + language": ResumeFilter(
+        speciality="skill45",
+        experience=ExperienceType.FROM_1_TO_2.value,
+        languages={LangNameType.ENGLISH.value: LangLevelType.INTERMEDIATE.value},
+    ),
+    "facets only": ResumeFilter(speciality="", city=CityType.LVIV.value),
+}
+
+
+def matches(filter_obj: ResumeFilter, resume: BaseResumeModel) -> bool:
+    tokens = words(resume.speciality, resume.skills, resume.experiences)
+    for word in query_words(filter_obj):
+        if not any(token.startswith(word) for token in tokens):
+            return False
+    if (
+        filter_obj.city
+        and normalize_city(resume.city) != CityType(filter_obj.city).name
+    ):
+        return False
+    if filter_obj.schedule and ScheduleType(
+        filter_obj.schedule
+    ).name not in normalize_schedules(resume.schedule):
+        return False
+    for value, low, high in (
+        (resume.age, filter_obj.age_from, filter_obj.age_to),
+        (resume.salary_expectation, filter_obj.salary_from, filter_obj.salary_to),
+    ):
+        if (low or high) and not value:
+            return False
+        if low and value < low or high and value > high:
+            return False
+    if filter_obj.experience in EXPERIENCE_YEARS:
+        above, up_to = EXPERIENCE_YEARS[filter_obj.experience]
+        years = experience_years(resume.experiences)
+        if above is not None and years <= above:
+            return False
+        if up_to is not None and years > up_to:
+            return False
+    languages = dict(
+        normalize_language(name, level)
+        for language in resume.languages
+        for name, level in language.items()
+    )
+    for language, level in filter_obj.languages.items():
+        rank = languages.get(LangNameType(language).name)
+        if rank is None or rank < LEVEL_RANKS[LangLevelType(level)]:
+            return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    resumes = make_resumes(args.resumes)
+    rnd = random.Random(1)
+    for resume in resumes:
+        resume.experiences = [
+            {**experience, "period": round(rnd.uniform(0, 4), 1)}
+            for experience in resume.experiences
+        ]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ResumeIndex(Path(tmp) / "resumes.sqlite3")
+        started = time.perf_counter()
+        for start in range(0, len(resumes), args.batch_size):
+            index.add(resumes[start : start + args.batch_size])
+        elapsed = time.perf_counter() - started
+        print(
+            f"indexed {len(index)} resumes in {elapsed:.1f}s "
+            f"({len(resumes) / elapsed:.0f} resumes/sec)"
+        )
+        for name, filter_obj in FILTERS.items():
+            started = time.perf_counter()
+            found = index.search(filter_obj)
+            search_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            index.facets(filter_obj)
+            facets_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            expected = [resume for resume in resumes if matches(filter_obj, resume)]
+            scan_ms = (time.perf_counter() - started) * 1000
+            if [resume.cv_link for resume in found] != [
+                resume.cv_link for resume in expected
+            ]:
+                raise SystemExit(f"{name}: the index found other resumes")
+            print(
+                f"{name:>22}: {len(found):5} resumes, search {search_ms:6.1f} ms, "
+                f"facets {facets_ms:6.1f} ms, python scan {scan_ms:7.1f} ms"
+            )
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare a list of resume models with a ``ResumeStore``.
+
+Run with ``python -m benchmarks.resume_store [--resumes N]``. N synthetic
+resumes are kept as pydantic models and then moved into a store. The
+script fails if any resume read back from the store differs from its
+model, then reports the memory each representation holds (traced by
+``tracemalloc``) and the time of one filter scan over both.
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.resume_store import ResumeStore
+from benchmarks.dedup import make_resume
+
+LANGUAGES = ("Англійська", "Українська", "Польська", "Німецька")
+LEVELS = ("базовий", "середній", "вище середнього", "вільно")
+SCHEDULES = ("Повна зайнятість", "Неповна зайнятість", "Дистанційна робота")
+
+
+def make_resumes(count: int) -> list[BaseResumeModel]:
+    rnd = random.Random(0)
+    vocabulary = [f"skill{i}" for i in range(2000)]
+    resumes = []
+    for n in range(count):
+        resume = make_resume(rnd, n, vocabulary)
+        resume.schedule = rnd.choice(SCHEDULES)
+        resume.salary_expectation = rnd.randrange(0, 100_000, 500)
+        resume.currency = "грн" if resume.salary_expectation else ""
+        resume.educations = [
+            {
+                "name": f"Університет {rnd.randrange(300)}",
+                "comment": "",
+                "speciality": " ".join(rnd.sample(vocabulary, 2)),
+                "yearOfGraduation": rnd.randint(1990, 2024),
+            }
+            for _ in range(rnd.randint(0, 2))
+        ]
+        resume.languages = [
+            {language: rnd.choice(LEVELS)}
+            for language in rnd.sample(LANGUAGES, rnd.randint(0, 3))
+        ]
+        resumes.append(resume)
+    return resumes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    resumes = make_resumes(args.resumes)
+    models_size = tracemalloc.get_traced_memory()[0]
+    store = ResumeStore.from_models(resumes)
+    for i, resume in enumerate(resumes):
+        if store[i] != resume:
+            raise SystemExit(f"Resume {i} differs after a round trip")
+
+    city = resumes[0].city
+    started = time.perf_counter()
+    expected = [
+        i
+        for i, resume in enumerate(resumes)
+        if resume.city == city and 25 <= resume.age <= 40 and resume.experiences
+    ]
+    models_scan = time.perf_counter() - started
+    started = time.perf_counter()
+    city_code = store.code("city", city)
+    found = store.where(
+        lambda c, age, years: c == city_code and 25 <= age <= 40 and years,
+        "city",
+        "age",
+        "experience_years",
+        codes=True,
+    )
+    store_scan = time.perf_counter() - started
+    if found != expected:
+        raise SystemExit("The store scan found other resumes")
+
+    del resumes, expected
+    gc.collect()
+    store_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{args.resumes} resumes, {len(found)} match the scan")
+    print(f"models: {models_size / 2**20:7.1f} MiB, scan {models_scan * 1000:.0f} ms")
+    print(f" store: {store_size / 2**20:7.1f} MiB, scan {store_scan * 1000:.0f} ms")
+    print(f"memory cut {models_size / store_size:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time ``StoreFilter`` against a scan of the resume models.
+
+``main.py --offline --batch`` narrows the indexed resumes this way. Run
+with ``python -m benchmarks.store_filter [--resumes N]``. N synthetic
+resumes stand for one broad crawl kept in a ``ResumeStore``. Every filter
+of ``benchmarks.resume_index`` is applied to the store twice, the second
+time with the normalized values already cached, and to the models one by
+one. The script fails if the results differ.
+"""
+
+import argparse
+import random
+import time
+
+from app.helpers.resume_store import ResumeStore
+from app.helpers.store_filter import StoreFilter
+from benchmarks.resume_index import FILTERS, matches
+from benchmarks.resume_store import make_resumes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=50_000)
+    args = parser.parse_args()
+
+    resumes = make_resumes(args.resumes)
+    rnd = random.Random(1)
+    for resume in resumes:
+        resume.experiences = [
+            {**experience, "period": round(rnd.uniform(0, 4), 1)}
+            for experience in resume.experiences
+        ]
+    store_filter = StoreFilter(ResumeStore.from_models(resumes))
+    totals = [0.0, 0.0]
+    for name, filter_obj in FILTERS.items():
+        timings = []
+        for select in (
+            store_filter.select,
+            store_filter.select,
+            lambda filter_obj: [
+                i for i, resume in enumerate(resumes) if matches(filter_obj, resume)
+            ],
+        ):
+            started = time.perf_counter()
+            found = select(filter_obj)
+            timings.append((time.perf_counter() - started) * 1000)
+        if found != store_filter.select(filter_obj):
+            raise SystemExit(f"{name}: the store filter found other resumes")
+        totals[0] += timings[1]
+        totals[1] += timings[2]
+        print(
+            f"{name:>22}: {len(found):5} resumes, store {timings[0]:6.1f} ms, "
+            f"cached {timings[1]:6.1f} ms, models {timings[2]:7.1f} ms"
+        )
+    print(f"all filters {totals[1] / totals[0]:.1f}x faster on the store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Check and time the work.ua resume extractors.
+
+Run with ``python -m benchmarks.work_html_parser [--pages DIR]``. Every saved
+resume page (``resume_*.html``) in DIR is parsed by
+``WorkResumeModel.from_html`` and ``WorkResumeModel.from_html_lxml``, as
+well as copies with the text of the terms, definitions and section headers
+wrapped in one, two or a mixed set of inline elements. The script fails if
+the two models differ in any field or only one of them fails, then reports
+resumes/sec of a single core for each saved page.
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from app.parse_work_ua.work_resume_model import WorkResumeModel
+
+FIXTURES = Path(__file__).parent / "fixtures" / "work_ua"
+_WRAPPABLE = re.compile(r'(<dt>|<dd>|<h2 class="mt-xl">)([^<]+)(</)')
+# markup around the text of a wrappable element, which bs4 ``.string`` and
+# the lxml lookups must treat alike
+WRAPPERS = (
+    "<span>{}</span>",
+    "<b><span>{}</span></b>",
+    "<span>{}</span> ",
+    "{}<!-- note -->",
+)
+
+
+def variants(pages: list[tuple[Path, str]]) -> list[tuple[Path, str]]:
+    """The pages with the text of terms, definitions and headers wrapped."""
+    return [
+        (
+            path.with_name(f"{path.stem}.wrapped{n}.html"),
+            _WRAPPABLE.sub(
+                lambda match, wrapper=wrapper: (
+                    match[1] + wrapper.format(match[2]) + match[3]
+                ),
+                html,
+            ),
+        )
+        for path, html in pages
+        for n, wrapper in enumerate(WRAPPERS)
+    ]
+
+
+def extract(from_html, html: str) -> dict:
+    """Fields of the model, or the error a page without them raises."""
+    try:
+        return from_html(html).model_dump()
+    except Exception as e:  # noqa: BLE001 - both extractors must fail alike
+        return {"error": type(e).__name__}
+
+
+def compare(pages: list[tuple[Path, str]]) -> int:
+    mismatches = 0
+    for path, html in pages:
+        expected = extract(WorkResumeModel.from_html, html)
+        actual = extract(WorkResumeModel.from_html_lxml, html)
+        for field, value in expected.items():
+            if actual.get(field) != value:
+                mismatches += 1
+                print(f"{path.name}: {field}: {value!r} != {actual.get(field)!r}")
+    return mismatches
+
+
+def resumes_per_sec(from_html, pages: list[tuple[Path, str]], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in pages:
+            from_html(html)
+    return repeat * len(pages) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=Path, default=FIXTURES)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = [
+        (path, path.read_text(encoding="utf-8"))
+        for path in sorted(args.pages.glob("resume_*.html"))
+    ]
+    if not pages:
+        sys.exit(f"No saved pages in {args.pages}")
+    checked = pages + variants(pages)
+    if mismatches := compare(checked):
+        sys.exit(f"{mismatches} fields differ")
+    print(f"{len(checked)} pages: models are identical")
+
+    for name, from_html in (
+        ("bs4", WorkResumeModel.from_html),
+        ("lxml", WorkResumeModel.from_html_lxml),
+    ):
+        rate = resumes_per_sec(from_html, pages, args.repeat)
+        print(f"{name:>5}: {rate:9.1f} resumes/sec per core")
+
+
+if __name__ == "__main__":
+    main()
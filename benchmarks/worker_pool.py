@@ -0,0 +1,81 @@
+"""Compare a pool per listing page with one pool for the whole crawl.
+
+Run with ``python -m benchmarks.worker_pool``. A local aiohttp server stands
+in for the resume pages so the numbers reflect pool and session overhead
+rather than the remote sites.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from aiohttp import web
+from bs4 import BeautifulSoup
+
+from app.helpers.custom_session import CustomSession
+from app.helpers.worker_pool import ResumeWorkerPool
+from app.settings import Settings
+
+HOST, PORT = "127.0.0.1", 8765
+PAGE = "<html><body>" + "<div><span>resume</span></div>" * 200 + "</body></html>"
+
+
+async def fetch_and_parse(url: str, session: CustomSession, settings: Settings):
+    async with session.get(url) as response:
+        html = await response.text()
+    return len(BeautifulSoup(html, "lxml").find_all("span"))
+
+
+def start_server() -> None:
+    async def handler(request):
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/resumes/{id}/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, HOST, PORT).start()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    time.sleep(0.5)
+
+
+def page_urls(page_num: int, per_page: int) -> list[str]:
+    return [
+        f"http://{HOST}:{PORT}/resumes/{page_num * per_page + i}/"
+        for i in range(per_page)
+    ]
+
+
+def per_page_pool(settings: Settings, pages: int, per_page: int) -> None:
+    for page_num in range(pages):
+        with ResumeWorkerPool(settings) as pool:
+            pool.map_urls(fetch_and_parse, page_urls(page_num, per_page))
+
+
+def persistent_pool(settings: Settings, pages: int, per_page: int) -> None:
+    with ResumeWorkerPool(settings) as pool:
+        for page_num in range(pages):
+            pool.map_urls(fetch_and_parse, page_urls(page_num, per_page))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--per-page", type=int, default=14)
+    args = parser.parse_args()
+
+    start_server()
+    settings = Settings()
+    for name, func in (("per-page", per_page_pool), ("persistent", persistent_pool)):
+        started = time.perf_counter()
+        func(settings, args.pages, args.per_page)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>10}: {args.pages / elapsed:8.2f} pages/sec ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,255 @@
+import argparse
+import asyncio
+import json
 import logging
+from collections.abc import AsyncIterator
+
+from app.helpers.batch_search import BatchSearch
+from app.helpers.checkpoint import CrawlCheckpoint
+from app.helpers.custom_session import CustomSession
+from app.helpers.dedup import DedupIndex
+from app.helpers.keyword_ranker import KeywordRanker
+from app.helpers.metrics import CrawlMetrics
+from app.helpers.orchestrator import CrawlOrchestrator
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_index import ResumeIndex
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.resume_store import ResumeStore
+from app.helpers.sinks import open_sink, read_links
+from app.helpers.store_filter import StoreFilter
+from app.parse_robota_ua.robota_ua_parser import RobotaUaParser
+from app.parse_work_ua.work_ua_parser import WorkUaParser
+from app.settings import settings
 
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+PARSERS = {"work": WorkUaParser, "robota": RobotaUaParser}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Crawl resumes to a file")
+    parser.add_argument("speciality", nargs="?")
+    parser.add_argument("--skill", dest="main_skills", action="append", default=[])
+    parser.add_argument("--keyword", dest="keywords", action="append", default=[])
+    parser.add_argument("--top", type=int, default=10, help="best resumes to log")
+    parser.add_argument("--source", choices=["all", *PARSERS], default="all")
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="collapse candidates found on several sites, kept in memory until "
+        "the crawl ends",
+    )
+    parser.add_argument(
+        "--output",
+        default="resumes.jsonl.gz",
+        help="output file: .jsonl, .jsonl.gz, .jsonl.zst, .csv or .parquet",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the last unfinished crawl with its arguments",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="JSON list of filters crawled together, each resume fetched once; "
+        "the resumes of every filter go to <output>.filters.json",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="search the local resume index instead of the sites; with --batch "
+        "the indexed resumes are loaded once and narrowed by every filter",
+    )
+    args = parser.parse_args()
+    if not args.resume and not args.batch and not args.speciality:
+        parser.error("speciality is required unless --resume or --batch is given")
+    if args.batch and args.resume:
+        parser.error("--batch can not be combined with --resume")
+    if args.offline and (args.resume or not settings.resume_index_path):
+        parser.error("--offline needs resume_index_path and no --resume")
+    if args.top < 1:
+        parser.error("--top must be at least 1")
+    return args
+
+
+def search_offline(args: argparse.Namespace) -> None:
+    filter_obj = ResumeFilter(speciality=args.speciality, main_skills=args.main_skills)
+    index = ResumeIndex.from_settings(settings)
+    resumes = index.search(filter_obj)
+    for facet, counts in index.facets(filter_obj).items():
+        logging.info(f"{facet}: {counts}")
+    index.close()
+    with open_sink(args.output, settings) as sink:
+        for resume in resumes:
+            sink.write(resume)
+    logging.info(f"Saved {len(resumes)} indexed resumes to {args.output}")
+
+
+def search_offline_batch(args: argparse.Namespace) -> None:
+    filters = load_filters(args.batch)
+    index = ResumeIndex.from_settings(settings)
+    # an empty speciality matches every indexed resume
+    store = ResumeStore.from_models(index.search(ResumeFilter(speciality="")))
+    index.close()
+    store_filter = StoreFilter(store)
+    selected = [store_filter.select(filter_obj) for filter_obj in filters]
+    links = store.column("cv_link")
+    found = [[links[i] for i in indexes] for indexes in selected]
+    with open_sink(args.output, settings) as sink:
+        for i in sorted(set().union(*selected)):
+            sink.write(store[i])
+    save_filters(args.output, filters, found)
+    logging.info(
+        f"Saved {sink.written} of {len(store)} indexed resumes "
+        f"of {len(filters)} filters"
+    )
+
+
+def load_filters(path: str) -> list[ResumeFilter]:
+    with open(path, encoding="utf-8") as file:
+        return [ResumeFilter(**data) for data in json.load(file)]
+
+
+def save_filters(
+    output: str, filters: list[ResumeFilter], found: list[list[str]]
+) -> None:
+    """Save the ``cv_link`` of the resumes of every filter next to the output."""
+    with open(f"{output}.filters.json", "w", encoding="utf-8") as file:
+        json.dump(
+            [
+                {"filter": filter_obj.model_dump(), "resumes": links}
+                for filter_obj, links in zip(filters, found)
+            ],
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def search_batch(args: argparse.Namespace) -> None:
+    filters = load_filters(args.batch)
+    written, found = asyncio.run(crawl_batch(args, filters))
+    save_filters(args.output, filters, found)
+    logging.info(f"Saved {written} resumes of {len(filters)} filters")
+
+
+async def crawl_batch(
+    args: argparse.Namespace, filters: list[ResumeFilter]
+) -> tuple[int, list[list[str]]]:
+    """Crawl the batch of filters into ``args.output``.
+
+    Returns the number of resumes written and, for every filter, the
+    ``cv_link`` of the resumes it matched.
+    """
+    found: list[list[str]] = [[] for _ in filters]
+    async with CustomSession.from_settings(settings, metrics=CrawlMetrics()) as session:
+        search = BatchSearch(
+            filters,
+            settings,
+            session,
+            PARSERS.values() if args.source == "all" else [PARSERS[args.source]],
+        )
+        with open_sink(args.output, settings) as sink:
+            async for resume, matched in search.iter_resumes():
+                sink.write(resume)
+                for n in matched:
+                    found[n].append(resume.cv_link)
+    return sink.written, found
+
+
+async def skip_links(
+    resumes: AsyncIterator[BaseResumeModel | bytes], links: set[str]
+) -> AsyncIterator[BaseResumeModel | bytes]:
+    """Leave out the resumes whose ``cv_link`` is in ``links``."""
+    async for resume in resumes:
+        link = (
+            json.loads(resume)["cv_link"]
+            if isinstance(resume, bytes)
+            else resume.cv_link
+        )
+        if link not in links:
+            yield resume
+
+
+async def main(args: argparse.Namespace) -> None:
+    checkpoint = CrawlCheckpoint.from_settings(settings)
+    resuming = args.resume
+    if resuming:
+        saved = checkpoint.load()
+        if saved is None:
+            logging.info("No unfinished crawl to resume")
+            return
+        args = argparse.Namespace(**saved)
+        if args.output.endswith(".parquet"):
+            raise ValueError("Parquet output can not be appended to, start over")
+        logging.info(f"Resuming the crawl of {args.speciality} to {args.output}")
+    else:
+        checkpoint.start({k: v for k, v in vars(args).items() if k != "resume"})
+
+    filter_obj = ResumeFilter(
+        speciality=args.speciality,
+        main_skills=args.main_skills,
+        keywords=args.keywords,
+    )
+    ranker = KeywordRanker(filter_obj.keywords, n=args.top)
+    index = ResumeIndex.from_settings(settings)
+    async with CustomSession.from_settings(settings, metrics=CrawlMetrics()) as session:
+        crawl = CrawlOrchestrator(
+            filter_obj,
+            settings,
+            session,
+            PARSERS.values() if args.source == "all" else [PARSERS[args.source]],
+            checkpoint=checkpoint,
+        )
+        # without ranking, merging or indexing the resumes go to the file as
+        # the workers serialized them
+        raw = not args.dedup and not filter_obj.keywords and index is None
+        resumes = crawl.iter_resumes(raw=raw)
+        if resuming:
+            # resumes written before a crash but after the last commit
+            in_output = read_links(args.output)
+            logging.info(f"{len(in_output)} resumes already in {args.output}")
+            resumes = skip_links(resumes, in_output)
+        if not raw:
+            resumes = ranker.track(resumes)
+        if index is not None:
+            resumes = index.track(resumes, settings.output_buffer_size)
+        with open_sink(args.output, settings, append=resuming) as sink:
+            # saved progress never runs ahead of the output file
+            sink.on_flush = checkpoint.commit
+            if args.dedup:
+                dedup = DedupIndex.from_settings(settings)
+                async for resume in resumes:
+                    dedup.add(resume)
+                for resume in dedup.unique():
+                    sink.write(resume)
+                sink.flush()
+                written = sink.written
+                logging.info(f"Collapsed {len(dedup.resumes) - written} duplicates")
+            else:
+                written = await sink.consume(resumes)
+    checkpoint.finish()
+    checkpoint.close()
+    if index is not None:
+        logging.info(f"{len(index)} resumes in the local index")
+        index.close()
+    logging.info(f"Saved {written} resumes to {args.output}")
+    if filter_obj.keywords:
+        for score, resume in ranker.top():
+            logging.info(f"{score:.1f} {resume.cv_link} {resume.speciality}")
+
+
 if __name__ == "__main__":
-    ...
+    args = parse_args()
+    if args.offline and args.batch:
+        search_offline_batch(args)
+    elif args.offline:
+        search_offline(args)
+    elif args.batch:
+        search_batch(args)
+    else:
+        asyncio.run(main(args))
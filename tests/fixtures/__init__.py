@@ -0,0 +1,88 @@
+"""Saved pages of the sites and markup generated for the tests.
+
+The pages are copies kept apart from ``benchmarks/fixtures``, so editing a
+benchmark input does not change what the tests check.
+"""
+
+import json
+import random
+import re
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent
+# pieces the random fragments are made of: tags, entities, comments and text
+HTML_TOKENS = (
+    "<p>", "</p>", "<b>", "</b>", "<br>", "<br/>", "<ul>", "</ul>", "<li>",
+    "</li>", "<pre>", "</pre>", "<script>x</script>", "<style>y</style>",
+    "<template>", "</template>", "<!-- c -->", "<![CDATA[z]]>", "&amp;",
+    "&nbsp;", "&#39;", "&#150;", "&copy", "&lt;", "text ", "Текст ", "\n",
+    " ", "\t",
+)  # fmt: skip
+
+
+def robota_resume_fields() -> list[str]:
+    """HTML fields of the saved robota.ua resumes."""
+    fields = []
+    for file in sorted((FIXTURES / "robota_ua").glob("resume_*.json")):
+        resume = json.loads(file.read_text(encoding="utf-8"))
+        fields.extend(skill["description"] for skill in resume.get("skills", []))
+        fields.extend(ed["comment"] for ed in resume.get("educations", []))
+        fields.extend(ex["description"] for ex in resume.get("experiences", []))
+    return fields
+
+
+def random_fragments(count: int, seed: int = 0) -> list[str]:
+    """Seeded random sequences of ``HTML_TOKENS``."""
+    rnd = random.Random(seed)
+    return [
+        "".join(rnd.choice(HTML_TOKENS) for _ in range(rnd.randint(0, 30)))
+        for _ in range(count)
+    ]
+
+
+_WRAPPABLE = re.compile(r'(<dt>|<dd>|<h2 class="mt-xl">)([^<]+)(</)')
+# markup around the text of a wrappable element, which bs4 ``.string`` and
+# the lxml lookups must treat alike
+WRAPPERS = (
+    "<span>{}</span>",
+    "<b><span>{}</span></b>",
+    "<span>{}</span> ",
+    "{}<!-- note -->",
+)
+
+
+def work_resume_pages() -> list[tuple[Path, str]]:
+    """Saved work.ua resume pages with their paths."""
+    return [
+        (path, path.read_text(encoding="utf-8"))
+        for path in sorted((FIXTURES / "work_ua").glob("resume_*.html"))
+    ]
+
+
+def wrapped_variants(pages: list[tuple[Path, str]]) -> list[tuple[Path, str]]:
+    """The pages with the text of terms, definitions and headers wrapped in
+    each of ``WRAPPERS``."""
+    return [
+        (
+            path.with_name(f"{path.stem}.wrapped{n}.html"),
+            _WRAPPABLE.sub(
+                lambda match, wrapper=wrapper: (
+                    match[1] + wrapper.format(match[2]) + match[3]
+                ),
+                html,
+            ),
+        )
+        for path, html in pages
+        for n, wrapper in enumerate(WRAPPERS)
+    ]
+
+
+def work_listing_page(cards: int, total: str = "1234") -> str:
+    """A work.ua search page with ``cards`` resume cards."""
+    card = (FIXTURES / "work_ua" / "card.html").read_text(encoding="utf-8")
+    return (
+        (FIXTURES / "work_ua" / "listing.html")
+        .read_text(encoding="utf-8")
+        .replace("{total}", total)
+        .replace("{cards}", "".join(card.replace("{id}", str(n)) for n in range(cards)))
+    )
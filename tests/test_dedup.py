@@ -0,0 +1,28 @@
+from app.helpers.dedup import DedupIndex
+from app.helpers.resume_python_object import BaseResumeModel
+
+
+def resume(site: str, n: int, speciality: str, skills: str = "") -> BaseResumeModel:
+    return BaseResumeModel(
+        cv_link=f"https://{site}/resumes/{n}",
+        first_name="Олена",
+        city="Київ",
+        age=30,
+        speciality=speciality,
+        skills=skills,
+        resume_filling=50,
+    )
+
+
+def test_same_candidate_on_two_sites_is_collapsed():
+    index = DedupIndex()
+    index.add(resume("www.work.ua", 1, "Python developer", "Django, SQL"))
+    index.add(resume("robota.ua", 2, "python developer", "django sql"))
+    assert [len(group) for group in index.cluster_ids()] == [2]
+
+
+def test_resumes_without_words_are_unique():
+    index = DedupIndex()
+    index.add(resume("www.work.ua", 1, ""))
+    index.add(resume("robota.ua", 2, "", "—"))
+    assert [len(group) for group in index.cluster_ids()] == [1, 1]
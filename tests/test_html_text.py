@@ -0,0 +1,38 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from app.helpers.html_text import html_to_text
+from tests.fixtures import random_fragments, robota_resume_fields
+
+
+def bs4_text(markup: str) -> str:
+    return BeautifulSoup(markup, "html.parser").text
+
+
+@pytest.mark.parametrize("markup", robota_resume_fields())
+def test_resume_fields(markup: str):
+    assert html_to_text(markup) == bs4_text(markup)
+
+
+@pytest.mark.parametrize(
+    "markup",
+    [
+        "",
+        "plain text",
+        "<p>a</p><p>b</p>",
+        "a<br>b<br/>c",
+        "<script>x</script>y<style>z</style>",
+        "<!-- comment -->text<![CDATA[data]]>",
+        "&amp;&nbsp;&#39;&#150;&copy&lt;",
+        "<ul><li>one<li>two</ul>",
+        "unclosed <b>bold",
+    ],
+)
+def test_markup(markup: str):
+    assert html_to_text(markup) == bs4_text(markup)
+
+
+def test_random_fragments():
+    # seeded, so any difference is a regression
+    for markup in random_fragments(5000):
+        assert html_to_text(markup) == bs4_text(markup), markup
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from app.helpers.checkpoint import CrawlCheckpoint
+from app.helpers.custom_session import CustomSession
+from app.helpers.orchestrator import CrawlOrchestrator
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_parser import ResumeParser
+from app.helpers.seen_index import SeenIndex
+from app.settings import Settings
+
+PAGES = 3
+PER_PAGE = 10
+
+
+async def fetch_resume(url: str, session: CustomSession, settings: Settings) -> bytes:
+    return json.dumps({"cv_link": url}).encode()
+
+
+class SiteA(ResumeParser):
+    """A site with fixed listing pages whose resumes are never requested."""
+
+    SOURCE = "a"
+    fetch_func = fetch_resume
+
+    def __init__(self, filter_obj, settings, session, limiter=None):
+        super().__init__(settings, session, limiter)
+        self.url = f"https://{self.SOURCE}.test/search"
+
+    async def get_page_nums(self) -> range:
+        return range(1, PAGES + 1)
+
+    async def get_resumes_links(self, page_num: int) -> list[tuple[str, str]]:
+        return [
+            (f"https://{self.SOURCE}.test/{page_num}/{n}", "fingerprint")
+            for n in range(PER_PAGE)
+        ]
+
+
+class SiteB(SiteA):
+    SOURCE = "b"
+
+
+async def crawl(settings: Settings, checkpoint: CrawlCheckpoint) -> tuple[int, list]:
+    async with CustomSession.from_settings(settings) as session:
+        orchestrator = CrawlOrchestrator(
+            ResumeFilter(speciality="python developer"),
+            settings,
+            session,
+            [SiteA, SiteB],
+            checkpoint=checkpoint,
+        )
+        resumes = 0
+        async for _ in orchestrator.iter_resumes(raw=True):
+            resumes += 1
+    return resumes, orchestrator.failed
+
+
+def test_two_sites_share_the_seen_index(tmp_path):
+    settings = Settings(
+        processes_count=1,
+        worker_chunk_size=2,
+        incremental=True,
+        seen_index_path=str(tmp_path / "seen.sqlite3"),
+        checkpoint_path=str(tmp_path / "checkpoint.sqlite3"),
+        retry_queue_path="",
+        cache_path="",
+        metrics_path="",
+        host_rate_limit=0,
+    )
+    checkpoint = CrawlCheckpoint.from_settings(settings)
+    checkpoint.start({})
+    # no output flush commits the checkpoint during the crawl, so both sites
+    # record their hashes in one open transaction
+    resumes, failed = asyncio.run(crawl(settings, checkpoint))
+    checkpoint.finish()
+    checkpoint.close()
+
+    assert failed == []
+    assert resumes == 2 * PAGES * PER_PAGE
+    seen = SeenIndex(settings.seen_index_path, settings.seen_max_age)
+    assert seen.conn.execute("SELECT count(*) FROM seen").fetchone()[0] == resumes
+    seen.close()
@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+from app.helpers.keyword_ranker import KeywordRanker
+
+KEYWORDS = ["machine learning", "learning", "machine", "big data", "data science"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Machine Learning engineer",
+        "big data science",
+        "machines, e-learning and relearning",
+        "data-science for big   data",
+        "",
+    ],
+)
+def test_overlapping_keywords_all_count(text: str):
+    expected = {
+        keyword
+        for keyword in KEYWORDS
+        if re.search(rf"(?<!\w){re.escape(keyword)}(?!\w)", text, re.IGNORECASE)
+    }
+    assert KeywordRanker(KEYWORDS).matches(text) == expected
+
+
+def test_separate_keywords_use_the_plain_pattern():
+    ranker = KeywordRanker(["python", "sql"])
+    assert "?=" not in ranker.pattern.pattern
+    assert ranker.matches("Python, SQL and NoSQL") == {"python", "sql"}
+
+
+@pytest.mark.parametrize("n", [0, -1])
+def test_keeping_no_resumes_is_refused(n: int):
+    with pytest.raises(ValueError):
+        KeywordRanker(KEYWORDS, n=n)
@@ -0,0 +1,80 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.sinks import CsvSink, JsonlSink, read_links
+
+
+def resume(n: int) -> bytes:
+    return (
+        BaseResumeModel(
+            cv_link=f"https://site.test/resumes/{n}",
+            first_name="Ivan",
+            speciality="python developer",
+            resume_filling=80,
+            skills="Python,\nSQL",
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def write(sink_class, path, links: range, append: bool = False) -> None:
+    with sink_class(path, buffer_size=2, append=append) as sink:
+        for n in links:
+            sink.write(resume(n))
+
+
+def read_jsonl(path) -> list[str]:
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        data = gzip.decompress(data)
+    elif path.suffix == ".zst":
+        zstandard = pytest.importorskip("zstandard")
+        data = zstandard.ZstdDecompressor().stream_reader(data).read()
+    return [json.loads(line)["cv_link"] for line in data.splitlines()]
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz", ".jsonl.zst"])
+def test_resume_after_a_cut_off_batch(tmp_path, suffix):
+    if suffix.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    path = tmp_path / f"out{suffix}"
+    write(JsonlSink, path, range(4))
+    complete = path.read_bytes()
+    write(JsonlSink, path, range(4, 6), append=True)
+    # a crash in the middle of the third batch
+    path.write_bytes(path.read_bytes()[: len(complete) + 7])
+
+    assert read_links(path) == {f"https://site.test/resumes/{n}" for n in range(4)}
+    write(JsonlSink, path, range(4, 6), append=True)
+    assert read_jsonl(path) == [f"https://site.test/resumes/{n}" for n in range(6)]
+
+
+def test_resume_after_a_cut_off_csv_row(tmp_path):
+    path = tmp_path / "out.csv"
+    write(CsvSink, path, range(2))
+    # a crash right after the line break inside the skills field
+    path.write_bytes(
+        path.read_bytes() + b'https://site.test/resumes/2,,,,0,x,,,0,,0,"Python,\r\n'
+    )
+
+    assert read_links(path) == {f"https://site.test/resumes/{n}" for n in range(2)}
+    write(CsvSink, path, range(2, 4), append=True)
+    with open(path, newline="", encoding="utf-8") as file:
+        links = [row["cv_link"] for row in csv.DictReader(file)]
+    assert links == [f"https://site.test/resumes/{n}" for n in range(4)]
+
+
+def test_corrupt_output_is_not_resumed(tmp_path):
+    path = tmp_path / "out.jsonl.gz"
+    write(JsonlSink, path, range(4))
+    data = bytearray(path.read_bytes())
+    data[20:30] = b"x" * 10
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="corrupt"):
+        write(JsonlSink, path, range(4, 6), append=True)
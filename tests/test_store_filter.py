@@ -0,0 +1,95 @@
+import pytest
+
+from app.helpers.enums import (
+    CityType,
+    ExperienceType,
+    LangLevelType,
+    LangNameType,
+    ScheduleType,
+)
+from app.helpers.resume_filter import ResumeFilter
+from app.helpers.resume_index import ResumeIndex
+from app.helpers.resume_python_object import BaseResumeModel
+from app.helpers.resume_store import ResumeStore
+from app.helpers.store_filter import StoreFilter
+
+RESUMES = [
+    BaseResumeModel(
+        cv_link="https://www.work.ua/resumes/1",
+        first_name="Ivan",
+        speciality="Python developer",
+        skills="Django, PostgreSQL",
+        city="Київ",
+        schedule="Повна зайнятість, дистанційна робота",
+        age=28,
+        salary_expectation=40000,
+        experiences=[{"position": "Backend developer", "period": 3.5}],
+        languages=[{"Англійська": "Вище середнього"}],
+        resume_filling=70,
+    ),
+    BaseResumeModel(
+        cv_link="https://robota.ua/candidates/2",
+        first_name="Ivan",
+        speciality="Python-розробник",
+        skills="FastAPI",
+        city="Lviv",
+        schedule="remote",
+        age=35,
+        experiences=[{"position": "Developer", "company": "Django Software"}],
+        languages=[{"english": "intermediate"}, {"Польська": "рідна"}],
+        resume_filling=60,
+    ),
+    BaseResumeModel(
+        cv_link="https://www.work.ua/resumes/3",
+        first_name="Ivan",
+        speciality="Data analyst",
+        skills="SQL, Python",
+        city="Київ",
+        schedule="Неповна зайнятість",
+        salary_expectation=25000,
+        experiences=[{"position": "Analyst", "period": 0.5}],
+        resume_filling=40,
+    ),
+    BaseResumeModel(
+        cv_link="https://www.work.ua/resumes/4",
+        first_name="Ivan",
+        speciality="",
+        skills="",
+        resume_filling=0,
+    ),
+]
+FILTERS = [
+    ResumeFilter(speciality=""),
+    ResumeFilter(speciality="python"),
+    ResumeFilter(speciality="develop", main_skills=["djang"]),
+    ResumeFilter(speciality="", city=CityType.KYIV.value),
+    ResumeFilter(speciality="", schedule=ScheduleType.REMOTE.value),
+    ResumeFilter(speciality="", age_from=30),
+    ResumeFilter(speciality="", salary_from=20000, salary_to=30000),
+    ResumeFilter(speciality="", experience=ExperienceType.FROM_2_TO_5.value),
+    ResumeFilter(speciality="", experience=ExperienceType.NO_EXPERIENCE.value),
+    ResumeFilter(
+        speciality="",
+        languages={LangNameType.ENGLISH.value: LangLevelType.UPPER_INTERMEDIATE.value},
+    ),
+    ResumeFilter(
+        speciality="",
+        languages={LangNameType.ENGLISH.value: LangLevelType.INTERMEDIATE.value},
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    index = ResumeIndex(tmp_path_factory.mktemp("index") / "resumes.sqlite3")
+    index.add(RESUMES)
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize("filter_obj", FILTERS)
+def test_store_filter_agrees_with_the_index(index, filter_obj):
+    store = ResumeStore.from_models(RESUMES)
+    links = store.column("cv_link")
+    found = [links[i] for i in StoreFilter(store).select(filter_obj)]
+    assert found == [resume.cv_link for resume in index.search(filter_obj)]
@@ -0,0 +1,56 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from app.parse_work_ua.work_ua_parser import parse_listing
+from tests.fixtures import work_listing_page
+
+# the selectors of the search page the parser used before parse_listing
+TOTAL = (
+    "#pjax > div > div.row > div.col-md-8 > "
+    "div.flex.flex-justify-between.flex-align-flex-start > div.mt-8.text-default-7 > h1"
+)
+LINKS = "h2.mt-0 > a"
+
+
+def parse_listing_bs4(html: str) -> tuple[str | None, list[str]]:
+    soup = BeautifulSoup(html, "lxml")
+    total = soup.select_one(TOTAL)
+    return (total.text if total is not None else None), [
+        a["href"] for a in soup.select(LINKS)
+    ]
+
+
+# markup next to the cards that only looks like the selected elements
+DECOYS = {
+    "header count outside the path": '<div class="mt-8 text-default-7"><h1>9 резюме</h1></div>',
+    "link below a span": '<h2 class="mt-0"><span><a href="/resumes/x/">x</a></span></h2>',
+    "link of another header": '<h2 class="mt-1"><a href="/resumes/y/">y</a></h2>',
+    "second count": '<div class="flex"><div class="mt-8 text-default-7"><h1>7</h1></div></div>',
+}
+
+
+@pytest.mark.parametrize("cards", [0, 1, 14])
+def test_saved_page(cards: int):
+    html = work_listing_page(cards)
+    assert parse_listing(html) == parse_listing_bs4(html)
+    assert len(parse_listing(html)[1]) == cards
+
+
+@pytest.mark.parametrize("decoy", DECOYS.values(), ids=DECOYS.keys())
+def test_decoys(decoy: str):
+    page = work_listing_page(3)
+    for html in (
+        page.replace('<div id="pjax">', decoy + '<div id="pjax">'),
+        page.replace("</body>", decoy + "</body>"),
+        page.replace('<div class="card', decoy + '<div class="card', 1),
+    ):
+        assert parse_listing(html) == parse_listing_bs4(html)
+
+
+def test_page_without_count():
+    html = work_listing_page(2).replace("<h1>", "<h2>").replace("</h1>", "</h2>")
+    assert (
+        parse_listing(html)
+        == parse_listing_bs4(html)
+        == (None, ["/resumes/0/", "/resumes/1/"])
+    )
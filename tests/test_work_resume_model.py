@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+from app.parse_work_ua.work_resume_model import WorkResumeModel
+from tests.fixtures import work_resume_pages, wrapped_variants
+
+PAGES = work_resume_pages()
+CASES = PAGES + wrapped_variants(PAGES)
+
+
+def extract(from_html, html: str) -> dict:
+    """Fields of the model, or the error a page without them raises."""
+    try:
+        return from_html(html).model_dump()
+    except Exception as e:  # noqa: BLE001 - both extractors must fail alike
+        return {"error": type(e).__name__}
+
+
+@pytest.mark.parametrize(("path", "html"), CASES, ids=[path.name for path, _ in CASES])
+def test_lxml_extractor_matches_bs4(path: Path, html: str):
+    assert extract(WorkResumeModel.from_html_lxml, html) == extract(
+        WorkResumeModel.from_html, html
+    )
+
+
+def test_saved_pages_parse():
+    for path, html in PAGES:
+        assert "error" not in extract(WorkResumeModel.from_html_lxml, html), path